@@ -36,6 +36,7 @@
 
 # python standard libraries
 import sys
+import multiprocessing
 
 
 # PyQt stuff
@@ -49,95 +50,100 @@ import libs.data_utilities as du
 import libs.func_utilities as fu
 
 
-#######################    COMMAND LINE ARGUMENTS    #########################
-
-arg_len = len(sys.argv)
-arg1 = ''
-skip_dialog = False
-
-if arg_len == 2:
-    arg1 = sys.argv[1]
-    match arg1:
-        case 'test':
-            import tests.all_test as at
-            at.run_all()
+# worker processes (parallel file conversion) import this module again,
+# only the main process may start the app
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+
+    #####################    COMMAND LINE ARGUMENTS    #######################
+
+    arg_len = len(sys.argv)
+    arg1 = ''
+    skip_dialog = False
+
+    if arg_len == 2:
+        arg1 = sys.argv[1]
+        match arg1:
+            case 'test':
+                import tests.all_test as at
+                at.run_all()
+                exit()
+            case 'local':
+                du.PRH_url = f"http://{du.PRH_url}"
+                du.ROBTcp.ip = 'localhost'
+                du.PRH_url = f"http://{du.PRH_url}"
+                dev_avail = True<<4
+                skip_dialog = True
+            case 'overwrite':
+                du.PRH_url = f"http://{du.PRH_url}"
+                du.ROBTcp.ip = '192.168.125.1'
+                du.ROBTcp.port = '10001'
+                du.PRH_url = f"http://{du.PRH_url}"
+                dev_avail = True<<4
+                skip_dialog = True
+            case _: 
+                raise KeyError(f"{arg1} is not a valid argument for PRINT.py!")
+
+    elif arg_len > 2:
+        raise KeyError(
+            f"PRINT.py got too many arguments! "
+            f"Expected less than 3, got {arg_len}"
+        )
+
+
+    ##############################    SETUP    ###############################
+
+    if not skip_dialog:
+        # ask user if default TCP (or USB) connection parameters are to be
+        # used, otherwise set new ones
+        ret, dev_avail, rob_set, p_port, prh_url, db_url = conn_dialog(
+            title="Welcome to PRINT_py  --  Connection setup",
+            standalone=True,
+        )
+        if not ret:
+            print(f"User choose to abort setup! Exiting..")
+            exit()
+        else:
+            du.ROBTcp.set_params(rob_set)
+            du.PMP_port = p_port
+            du.PRH_url = prh_url
+            du.DB_url = db_url
+
+
+        # get the go from user
+        welc_text = (
+            f"STARTING PRINT APP...\n\nYou're about to establish "
+            f"a TCP connection with the robot at {du.ROBTcp.ip}.\n"
+            f"This can take up to {du.ROBTcp.c_tout} s. You may begin.\n\n"
+        )
+        ret = strd_dialog(
+            welc_text,
+            "Welcome to PRINT_py",
+            standalone=True
+        )
+        if not ret:
+            print(f"User choose to abort setup! Exiting..")
             exit()
-        case 'local':
-            du.PRH_url = f"http://{du.PRH_url}"
-            du.ROBTcp.ip = 'localhost'
-            du.PRH_url = f"http://{du.PRH_url}"
-            dev_avail = True<<4
-            skip_dialog = True
-        case 'overwrite':
-            du.PRH_url = f"http://{du.PRH_url}"
-            du.ROBTcp.ip = '192.168.125.1'
-            du.ROBTcp.port = '10001'
-            du.PRH_url = f"http://{du.PRH_url}"
-            dev_avail = True<<4
-            skip_dialog = True
-        case _: 
-            raise KeyError(f"{arg1} is not a valid argument for PRINT.py!")
-
-elif arg_len > 2:
-    raise KeyError(
-        f"PRINT.py got too many arguments! "
-        f"Expected less than 3, got {arg_len}"
-    )
 
 
-################################    SETUP    #################################
+    ############################    MAINFRAME    #############################
 
-if not skip_dialog:
-    # ask user if default TCP (or USB) connection parameters are to be used,
-    # otherwise set new ones
-    ret, dev_avail, rob_set, p_port, prh_url, db_url = conn_dialog(
-        title="Welcome to PRINT_py  --  Connection setup",
-        standalone=True,
+    # create logfile and get path
+    logpath = fu.create_logfile()
+    print(
+        f"\n"
+        f"-------------- PRINT_py --------------.\n"
+        f"starting with arguments: {sys.argv}\n"
+        f"Writing log at {logpath}.\n"
     )
-    if not ret:
-        print(f"User choose to abort setup! Exiting..")
-        exit()
-    else:
-        du.ROBTcp.set_params(rob_set)
-        du.PMP_port = p_port
-        du.PRH_url = prh_url
-        du.DB_url = db_url
-
-
-    # get the go from user
-    welc_text = (
-        f"STARTING PRINT APP...\n\nYou're about to establish "
-        f"a TCP connection with the robot at {du.ROBTcp.ip}.\n"
-        f"This can take up to {du.ROBTcp.c_tout} s. You may begin.\n\n"
-    )
-    ret = strd_dialog(
-        welc_text,
-        "Welcome to PRINT_py",
-        standalone=True
-    )
-    if not ret:
-        print(f"User choose to abort setup! Exiting..")
-        exit()
-
-
-##############################    MAINFRAME    ###############################
-
-# create logfile and get path
-logpath = fu.create_logfile()
-print(
-    f"\n"
-    f"-------------- PRINT_py --------------.\n"
-    f"starting with arguments: {sys.argv}\n"
-    f"Writing log at {logpath}.\n"
-)
-
-# start the UI and show the window to user
-# leave following 2 lines here so app doesnt include the remnant of a
-# previous QApplication instance
-app = 0  
-win = 0
-app = QApplication(sys.argv)
-win = Mainframe(logpath, dev_avail)
-win.show()
-app.exec()
-# sys.exit(app.exec())
+
+    # start the UI and show the window to user
+    # leave following 2 lines here so app doesnt include the remnant of a
+    # previous QApplication instance
+    app = 0  
+    win = 0
+    app = QApplication(sys.argv)
+    win = Mainframe(logpath, dev_avail)
+    win.show()
+    app.exec()
+    # sys.exit(app.exec())
@@ -41,7 +41,7 @@ esp_err_t init_uri()
 }
 
 // return server_handle with registered URI handlers;
-// registered handles are: '/data' and '/ping'
+// registered handles are: '/data', '/batch' and '/ping'
 httpd_handle_t start_daqs()
 {
     httpd_handle_t server = NULL;
@@ -56,6 +56,7 @@ httpd_handle_t start_daqs()
         
         // set URIs
         httpd_register_uri_handler(server, &data_req);
+        httpd_register_uri_handler(server, &batch_req);
         httpd_register_uri_handler(server, &ping_req);
 
         // set error handlers
@@ -122,26 +123,7 @@ esp_err_t data_request(httpd_req_t *req)
             strlcpy(data_str, "DL=false&", sizeof(data_str));
         }
 
-        // calc current uptime to get the age of each value in daq2str
-        TickType_t curr_uptime_ticks = xTaskGetTickCount() - g_ticks_last_req;
-        u64_t curr_uptime = (u64_t)(curr_uptime_ticks * portTICK_PERIOD_MS);
-        u16_t curr_uptime_s = (u16_t)(curr_uptime / 1000);
-
-        // build ans str
-        for (int idx=0; idx < g_backlog_idx; idx++) 
-        {
-            static char daqb_str[DAQB_STR_SIZE];
-            memset(daqb_str, '\0', sizeof(daqb_str));
-            daq2str(
-                &g_measure_buff[idx],
-                daqb_str,
-                DAQB_STR_SIZE,
-                curr_uptime_s
-            );
-            strlcat(data_str, daqb_str, sizeof(data_str));
-            g_measure_buff[idx] = g_EMPTY_DAQ_BLOCK;
-        }
-        g_backlog_idx = 0;
+        backlog2str(data_str, sizeof(data_str));
         g_data_lost = false;
     }
     g_ticks_last_req = xTaskGetTickCount();
@@ -154,6 +136,65 @@ esp_err_t data_request(httpd_req_t *req)
     return ESP_OK;
 }
 
+// returns all requested channels in one answer, so a client needs one
+// request per cycle instead of one per channel; channels are given as
+// '/batch?ch=temp,rpm' (all channels if not), answer looks like
+// 'DL=false&temp:T23.40/U3;T23.50/U1;&rpm:T1200.00/U0;&', a channel without
+// new data is sent empty ('temp:&'), unknown channels are left out
+esp_err_t batch_request(httpd_req_t *req)
+{
+    // get requested channels
+    char query[BATCH_CH_SIZE];
+    char channels[BATCH_CH_SIZE] = BATCH_DEF_CH;
+    if (httpd_req_get_url_query_str(req, query, sizeof(query)) == ESP_OK) {
+        if (httpd_query_key_value(query, "ch", channels, sizeof(channels))
+            != ESP_OK
+        ) {
+            strlcpy(channels, BATCH_DEF_CH, sizeof(channels));
+        }
+    }
+    ESP_LOGI(g_URI_TAG, "batch request for: %s", channels);
+
+    // set answering header
+    httpd_resp_set_hdr(req, "Allow", "GET");
+
+    // get mutex
+    xSemaphoreTake(g_MUTEX, portMAX_DELAY);
+
+    static char data_str[BACKLOG_SIZE * DAQB_STR_SIZE + BATCH_CH_SIZE];
+    if (g_data_lost) {
+        strlcpy(data_str, "DL=true&", sizeof(data_str));
+    } else {
+        strlcpy(data_str, "DL=false&", sizeof(data_str));
+    }
+
+    char *save_ptr = NULL;
+    char *channel = strtok_r(channels, ",", &save_ptr);
+    while (channel != NULL)
+    {
+        if (strcmp(channel, "temp") == 0) {
+            strlcat(data_str, "temp:", sizeof(data_str));
+            backlog2str(data_str, sizeof(data_str));
+            strlcat(data_str, "&", sizeof(data_str));
+            g_data_lost = false;
+            g_ticks_last_req = xTaskGetTickCount();
+        } else if (strcmp(channel, "rpm") == 0) {
+            // no backlog, always the current value
+            static char rpm_str[DAQB_STR_SIZE];
+            snprintf(rpm_str, sizeof(rpm_str), "rpm:T%.2f/U0;&", g_motor_rpm);
+            strlcat(data_str, rpm_str, sizeof(data_str));
+        }
+        channel = strtok_r(NULL, ",", &save_ptr);
+    }
+
+    // release mutex handle
+    xSemaphoreGive(g_MUTEX);
+
+    ESP_LOGI(g_URI_TAG, "returning: %s", data_str);
+    httpd_resp_send(req, data_str, HTTPD_RESP_USE_STRLEN);
+    return ESP_OK;
+}
+
 // returns 'ack' to ping request from IP client
 esp_err_t ping_request(httpd_req_t *req)
 {
@@ -199,6 +240,31 @@ esp_err_t http_405_handler(httpd_req_t *req, httpd_err_code_t err)
 
 /* -------------------------------- FUNCTIONS ----------------------------- */
 
+// appends all backlogged entries to sz_ret and empties the backlog, g_MUTEX
+// has to be taken beforehand
+void backlog2str(char *sz_ret, int buff_len)
+{
+    // calc current uptime to get the age of each value in daq2str
+    TickType_t curr_uptime_ticks = xTaskGetTickCount() - g_ticks_last_req;
+    u64_t curr_uptime = (u64_t)(curr_uptime_ticks * portTICK_PERIOD_MS);
+    u16_t curr_uptime_s = (u16_t)(curr_uptime / 1000);
+
+    for (int idx=0; idx < g_backlog_idx; idx++) 
+    {
+        static char daqb_str[DAQB_STR_SIZE];
+        memset(daqb_str, '\0', sizeof(daqb_str));
+        daq2str(
+            &g_measure_buff[idx],
+            daqb_str,
+            DAQB_STR_SIZE,
+            curr_uptime_s
+        );
+        strlcat(sz_ret, daqb_str, buff_len);
+        g_measure_buff[idx] = g_EMPTY_DAQ_BLOCK;
+    }
+    g_backlog_idx = 0;
+}
+
 // short-hand function to construct string from daq_block list entry
 // sz_ret for string-zero ('\0' terminated) return
 void daq2str(
@@ -23,6 +23,8 @@
 
 #define BACKLOG_SIZE        1000
 #define DAQB_STR_SIZE       25
+#define BATCH_CH_SIZE       64  // room for channel names & separators
+#define BATCH_DEF_CH        "temp,rpm"
 
 #ifdef __cplusplus
 extern "C" {
@@ -59,7 +61,9 @@ void daq2str(
         int buff_len,
         u16_t curr_upt_s
 );
+void backlog2str(char *sz_ret, int buff_len);
 esp_err_t data_request(httpd_req_t *req);
+esp_err_t batch_request(httpd_req_t *req);
 esp_err_t ping_request(httpd_req_t *req);
 esp_err_t http_400_handler(httpd_req_t *req, httpd_err_code_t err);
 esp_err_t http_404_handler(httpd_req_t *req, httpd_err_code_t err);
@@ -76,6 +80,13 @@ static const httpd_uri_t data_req = {
     .user_ctx  = NULL,
 };
 
+static const httpd_uri_t batch_req = {
+    .uri       = "/batch",
+    .method    = HTTP_GET,
+    .handler   = batch_request,
+    .user_ctx  = NULL,
+};
+
 static const httpd_uri_t ping_req = {
     .uri       = "/ping",
     .method    = HTTP_GET,
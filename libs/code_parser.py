@@ -0,0 +1,1651 @@
+#   This work is licensed under Creativ Commons Attribution-ShareAlike 4.0
+#   International (CC BY-SA 4.0).
+#   (https://creativecommons.org/licenses/by-sa/4.0/)
+#   Feel free to use, modify or distribute this code as far as you like, so
+#   long as you make anything based on it publicly avialable under the same
+#   license.
+
+# streaming GCode/RAPID parser: all words of a line are extracted in a single
+# scan with precompiled patterns, files are consumed line by line; produces
+# the same QEntries as gcode_to_qentry/rapid_to_qentry in func_utilities,
+# which stay in place for single commands typed in by the user; files are
+# memory-mapped (MappedFile) and indexed by line once; load_file converts,
+# counts and checks a whole file in a single pass and caches the result,
+# optionally also as a compiled job file (.pjob) beside the loaded file
+
+
+############################     IMPORTS      ################################
+
+import re
+import gc
+import os
+import json
+import mmap
+import struct
+import multiprocessing
+import locale
+import math as m
+import numpy as np
+
+from array import array
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Generator, Iterable, Iterator
+
+import libs.data_utilities as du
+from libs.func_utilities import (
+    domain_clip,
+    range_check_all,
+    base_dist_check_all,
+    path_range_check_all,
+    path_base_dist_check_all,
+)
+
+
+
+#############################     PATTERNS      ##############################
+
+# every word as used by re_short(find_coor=...), longer keys first so 'XR'
+# is not read as 'X'; no key is a suffix of another one, so the first match
+# per key is the same as a separate search for that key
+# (XR|YR|ZR|EXT|PMP|PIN|PR|TRL|TCL|TCU|TPS|TLS|X|Y|Z|F), factored and with
+# a lookahead on the first letter, which saves ~20 % per line
+WORDS = re.compile(
+    r'(?=[EFPTXYZ])([XYZ]R?|EXT|P(?:MP|IN|R)|T(?:RL|C[LU]|PS|LS)|F)'
+    r'(-?\d+[,\.]?[\d+]?)'
+)
+G_COMMAND = re.compile(r'G\d+')
+G_COMMENT = re.compile(r'^\s*;')
+
+RAPID_MOVE = re.compile(r'Move([J,L,C])')
+RAPID_NUM = r'-?\d+\.?[\d+]*'
+RAPID_DECIMALS = re.compile(r'[\[,](' + RAPID_NUM + r')')
+RAPID_SPEED = re.compile(
+    f"{RAPID_NUM},{RAPID_NUM},{RAPID_NUM},{RAPID_NUM}" + r'\],z'
+)
+RAPID_NUMS = re.compile(RAPID_NUM)
+RAPID_ZONE = re.compile(r'z\d+')
+RAPID_COMMENT = re.compile(r'^\s*!')
+RAPID_DIGITS = re.compile(r'(-?\d+[,\.]?[\d+]?)')
+
+# compiled job files: header (magic, version, length of the JSON header),
+# JSON header (load_file key & statistics), one record per entry, starting
+# at the next multiple of 8; floats are kept as float64 instead of the
+# float32 of the robot protocol, so loaded entries are exactly the same as
+# converted ones
+JOB_SUFFIX = '.pjob'
+JOB_MAGIC = b'PJOB'
+JOB_VERSION = 1
+JOB_HEADER = struct.Struct('<4sIQ')
+JOB_RECORD = np.dtype([
+    ('coor1', '<f8', (8,)),
+    ('coor2', '<f8', (8,)),
+    ('p_ratio', '<f8'),
+    ('speed', '<i4', (4,)),
+    ('sbt', '<i4'),
+    ('z', '<i4'),
+    ('p_mode', '<i4'),
+    ('trolley_steps', '<i4'),
+    ('wait', '<i4'),
+    ('row', '<u4'),
+    ('mt', 'S1'),
+    ('pt', 'S1'),
+    ('sc', 'S1'),
+    ('clamp', '?'),
+    ('cut', '?'),
+    ('place_spring', '?'),
+    ('load_spring', '?'),
+    ('pinch', '?'),
+])
+
+# defaults for new entries, copying is cheaper than the casting __init__
+_NO_COOR = du.Coordinate()
+_NO_TOOL = du.ToolCommand()
+
+
+
+############################     CLASSES      ################################
+
+class MappedFile:
+    """read-only, memory-mapped text file with a line-offset index; lines()
+    yields the lines like iterating over open(path) would, so it can be
+    handed to all parse & pre-check functions; the index is built on the
+    first open and reused as long as the file is not changed
+
+    ATTRIBUTES:
+        path:
+            path of the mapped file
+        encoding:
+            used to decode lines, same default as open()
+        mtime, size:
+            modification time [ns] and size [bytes] when mapped
+        offsets:
+            byte offset of every line start, plus the file size at the end
+
+    METHODS:
+        lines:
+            yields lines from a given line number on
+        close:
+            unmaps the file
+    """
+
+    # path: (mtime, size, offsets) of the last indexed files
+    _index_cache = {}
+    _INDEX_CACHE_SIZE = 4
+
+
+    def __init__(self, path:Path | str, encoding:str | None = None) -> None:
+        self.path = Path(path)
+        self.encoding = (
+            locale.getpreferredencoding(False)
+            if encoding is None
+            else encoding
+        )
+
+        with open(self.path, 'rb') as file:
+            stat = os.fstat(file.fileno())
+            # zero-length files can not be mapped
+            self._map = (
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                if stat.st_size
+                else b''
+            )
+        self.mtime = stat.st_mtime_ns
+        self.size = stat.st_size
+        self.offsets = self._index(self.mtime, self.size)
+
+
+    def __len__(self) -> int:
+        """number of lines, the line after a trailing line break counts
+        like in txt.split('\\n')
+        """
+
+        return len(self.offsets) - 1
+
+
+    def __iter__(self) -> Iterator[str]:
+        return self.lines()
+
+
+    def __enter__(self) -> 'MappedFile':
+        return self
+
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+    def _index(self, mtime:int, size:int) -> array:
+        """returns the line offsets, from cache if the file is unchanged"""
+
+        key = str(self.path.resolve())
+        cached = self._index_cache.get(key)
+        if cached is not None and cached[:2] == (mtime, size):
+            return cached[2]
+
+        offsets = array('Q', [0])
+        find = self._map.find
+        pos = find(b'\n')
+        while pos >= 0:
+            offsets.append(pos + 1)
+            pos = find(b'\n', pos + 1)
+        offsets.append(size)
+
+        if len(self._index_cache) >= self._INDEX_CACHE_SIZE:
+            del self._index_cache[next(iter(self._index_cache))]
+        self._index_cache[key] = (mtime, size, offsets)
+        return offsets
+
+
+    def lines(self, start=0, stop=None) -> Iterator[str]:
+        """yields lines start to stop (excl.), incl. their line breaks;
+        '\\r\\n' is read as '\\n' like open() does
+        """
+
+        data = self._map
+        offsets = self.offsets
+        encoding = self.encoding
+        count = len(offsets) - 1
+        stop = count if stop is None else min(stop, count)
+
+        for i in range(max(start, 0), stop):
+            line = data[offsets[i]:offsets[i + 1]]
+            if not line:
+                # empty row after a trailing line break, not a line
+                return
+            if line.endswith(b'\r\n'):
+                line = line[:-2] + b'\n'
+            yield line.decode(encoding)
+
+
+    def close(self) -> None:
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+
+
+
+class LoadResult:
+    """everything a single pass over a file gives: the converted entries,
+    the pre-check statistics and the entries failing the range & base
+    distance checks; entries are shared via the load cache, hand out
+    copies only; results of parallel loads & job files keep the entries
+    as JOB_RECORD array, the QEntries are built on first use
+
+    ATTRIBUTES:
+        entries:
+            converted QEntries, IDs not set
+        rows:
+            file row (0-based) every entry was converted from
+        row_num:
+            number of rows read
+        error:
+            conversion error as reported by LoadFileWorker, '' if none
+        comm_num, skips, fil_length, res:
+            same as returned by pre_check_gcode/pre_check_rapid, comm_num
+            holds the exception if the file could not be read
+        coors:
+            CoordinateArray of the Coor1 of all entries, set by finish
+        bounds:
+            (min, max) Coordinate of x, y, z & ext over all entries, None
+            if there are no entries
+        out_of_range, base_dist:
+            indices of the entries failing range_check/base_dist_check
+        range_summary, base_summary:
+            summaries of the failed checks, '' if all entries passed
+        path_range, path_base_dist:
+            indices of the entries whose path from the entry before leaves
+            the range/base distance, while both entries pass the check
+        path_range_summary, path_base_summary:
+            summaries of the failed path checks, '' if all paths passed
+        zero:
+            DCCurrZero after the file (G92 commands)
+
+    METHODS:
+        add:
+            adds an entry converted from the given row
+        extend:
+            adds several entries
+        set_records:
+            takes the entries as JOB_RECORD array
+        copies:
+            new QEntries to hand out
+        finish:
+            checks all entries at once, sets the bounding box
+        pre_check:
+            returns the statistics like pre_check_gcode does
+        conv_skips:
+            rows skipped by the conversion
+    """
+
+    def __init__(self) -> None:
+        self._entries = []
+        self._records = None
+        self.rows = array('L')
+        self.row_num = 0
+        self.error = ''
+        self.comm_num = 0
+        self.skips = 0
+        self.fil_length = 0.0
+        self.res = ''
+        self.coors = None
+        self.bounds = None
+        self.out_of_range = array('L')
+        self.base_dist = array('L')
+        self.range_summary = ''
+        self.base_summary = ''
+        self.path_range = array('L')
+        self.path_base_dist = array('L')
+        self.path_range_summary = ''
+        self.path_base_summary = ''
+        self.zero = None
+
+        # Coor1 of all entries, 8 values per entry, see finish
+        self._points = array('d')
+
+
+    @property
+    def entries(self) -> list:
+        if self._entries is None:
+            self._entries = _record_entries(self._records)
+            self._records = None
+        return self._entries
+
+
+    def add(self, entry:du.QEntry, row:int) -> None:
+        """adds an entry converted from the given row"""
+
+        self.entries.append(entry)
+        self.rows.append(row)
+        Coor = entry.Coor1
+        self._points.extend((
+            Coor.x, Coor.y, Coor.z, Coor.rx, Coor.ry, Coor.rz, Coor.q,
+            Coor.ext,
+        ))
+
+
+    def extend(
+            self,
+            entries:list,
+            rows:Iterable[int],
+            Coors:du.CoordinateArray,
+    ) -> None:
+        """same as add for several entries, Coors holds their Coor1"""
+
+        if not entries:
+            return
+        self.entries.extend(entries)
+        self.rows.extend(rows)
+        self._points.frombytes(
+            np.ascontiguousarray(Coors.data, dtype=np.float64).tobytes()
+        )
+
+
+    def set_records(self, records:np.ndarray) -> None:
+        """takes the entries as JOB_RECORD array (incl. their rows), to be
+        called instead of add/extend
+        """
+
+        self._entries = None
+        self._records = records
+        self.rows = array('L', records['row'].tolist())
+        self._points.frombytes(
+            np.ascontiguousarray(records['coor1']).tobytes()
+        )
+
+
+    def copies(self) -> list:
+        """new QEntries to hand out, built from the records right away if
+        the entries were not needed so far
+        """
+
+        if self._entries is None:
+            return _record_entries(self._records)
+        return [entry.copy() for entry in self._entries]
+
+
+    def finish(self) -> 'LoadResult':
+        """runs the range & base distance checks for all entries at once
+        and sets the bounding box, to be called after the last add
+        """
+
+        self.coors = du.CoordinateArray(
+            np.array(self._points, dtype=np.float64).reshape((-1, 8))
+        )
+        self._points = array('d')
+        if not len(self.coors):
+            return self
+
+        point = self.coors.data[:, [0, 1, 2, 7]]
+        self.bounds = tuple(
+            du.Coordinate(x=x, y=y, z=z, ext=ext)
+            for x, y, z, ext in (
+                point.min(axis=0).tolist(), point.max(axis=0).tolist()
+            )
+        )
+        failed, self.range_summary = range_check_all(self.coors)
+        self.out_of_range = array('L', failed.tolist())
+        failed, self.base_summary = base_dist_check_all(self.coors)
+        self.base_dist = array('L', failed.tolist())
+
+        # paths (MoveC through Coor2) between entries passing the checks
+        Vias = du.CoordinateArray(len(self.rows))
+        if self._entries is None:
+            circular = self._records['mt'] == b'C'
+            Vias.data[circular] = self._records['coor2'][circular]
+        else:
+            circular = np.array(
+                [entry.mt == 'C' for entry in self._entries], dtype=bool
+            )
+            for i in np.flatnonzero(circular).tolist():
+                Vias[i] = self._entries[i].Coor2
+        self.path_range, self.path_range_summary = self._path_check(
+            path_range_check_all, Vias, circular, self.out_of_range
+        )
+        self.path_base_dist, self.path_base_summary = self._path_check(
+            path_base_dist_check_all, Vias, circular, self.base_dist
+        )
+        return self
+
+
+    def _path_check(
+            self,
+            check,
+            Vias:du.CoordinateArray,
+            circular:np.ndarray,
+            failed:array,
+    ) -> tuple[array, str]:
+        """runs a path check for all paths between entries not in failed"""
+
+        passed = np.ones(len(self.rows), dtype=bool)
+        passed[np.asarray(failed, dtype=np.int64)] = False
+        rows = np.flatnonzero(passed[1:] & passed[:-1]) + 1
+        failed, summary = check(self.coors, Vias, circular, rows)
+        return array('L', failed.tolist()), summary
+
+
+    def pre_check(self) -> tuple[int | Exception, int, float, str]:
+        return self.comm_num, self.skips, self.fil_length, self.res
+
+
+    def conv_skips(self) -> int:
+        return max(self.row_num - len(self.rows), 0)
+
+
+
+###########################     FUNCTIONS      ###############################
+
+def rows(lines:Iterable[str]) -> Iterator[str]:
+    """yields the lines without line breaks, exactly like txt.split('\\n')
+    would (incl. the empty row after a trailing line break), but without
+    holding the file in memory
+
+    accepts:
+        lines:
+            file object or any iterable of lines
+    """
+
+    row = None
+    for row in lines:
+        if row.endswith('\n'):
+            yield row[:-1]
+        else:
+            yield row
+    if row is None or row.endswith('\n'):
+        yield ''
+
+
+def words(txt:str) -> dict[str, str]:
+    """returns the first value found for every word in txt"""
+
+    found = WORDS.findall(txt)
+    found.reverse()
+    return dict(found)
+
+
+def new_entry(
+        Coor:du.Coordinate,
+        Speed:du.SpeedVector,
+        zone:int,
+) -> du.QEntry:
+    """same as QEntry(id=0, Coor1=Coor, Speed=Speed, z=zone), without the
+    type casts of __init__
+    """
+
+    entry = du.QEntry.__new__(du.QEntry)
+    entry.id = 0
+    entry.mt = 'L'
+    entry.pt = 'E'
+    entry.sbt = 0
+    entry.sc = 'V'
+    entry.z = zone
+    entry.p_mode = -1001
+    entry.p_ratio = 1.0
+    entry.pinch = False
+    entry.Coor1 = Coor
+    entry.Coor2 = _NO_COOR.copy()
+    entry.Speed = Speed
+    entry.Tool = _NO_TOOL.copy()
+    return entry
+
+
+def pump_tool(entry:du.QEntry, found:dict) -> du.QEntry:
+    """pump & tool settings from the words of a line, see re_pump_tool;
+    expects a fresh entry, words not given keep their defaults
+    """
+
+    if 'PMP' in found:
+        p_mode = int(float(found['PMP']))
+        if -100 <= p_mode <= 100 or p_mode in du.DEF_PUMP_VALID_COMMANDS:
+            entry.p_mode = p_mode
+    if 'PR' in found:
+        entry.p_ratio = domain_clip(float(found['PR']), 0.0, 1.0)
+    if 'PIN' in found:
+        entry.pinch = bool(int(found['PIN']))
+
+    Tool = entry.Tool
+    if 'TRL' in found:
+        troll_steps = float(found['TRL'])
+        Tool.trolley_steps = int(troll_steps * du.TOOL_trol_ratio)
+    if 'TCL' in found:
+        Tool.clamp = bool(int(found['TCL']))
+    if 'TCU' in found:
+        Tool.cut = bool(int(found['TCU']))
+    if 'TPS' in found:
+        Tool.place_spring = bool(int(found['TPS']))
+    if 'TLS' in found:
+        Tool.load_spring = bool(int(found['TLS']))
+
+    return entry
+
+
+def gcode_line(
+        pos:du.Coordinate,
+        speed:du.SpeedVector,
+        zone:int,
+        txt:str,
+        ext_trail=True,
+        rounded=False,
+) -> tuple[du.QEntry | None, str]:
+    """converts a single GCode line, see gcode_to_qentry; pos and speed
+    are not changed, set rounded if all values of pos are rounded floats
+    already (e.g. pos is the Coor1 of the last G1 entry)
+    """
+
+    command = G_COMMAND.search(txt)
+    if command is None:
+        return None, (';' if txt.startswith(';') else '')
+    command = command.group()
+    found = words(txt) if command == 'G1' or command == 'G28' else None
+    return _gcode_entry(
+        pos, speed, zone, txt, command, found, ext_trail, rounded
+    )
+
+
+def _gcode_entry(
+        pos:du.Coordinate,
+        speed:du.SpeedVector,
+        zone:int,
+        txt:str,
+        command:str,
+        found:dict | None,
+        ext_trail:bool,
+        rounded:bool,
+        zero:du.Coordinate | None = None,
+) -> tuple[du.QEntry | None, str]:
+    """gcode_line for a known command & words (found, needed for G1 and
+    G28 only); zero is DCCurrZero if not given, G92 changes it in place
+    """
+
+    if zero is None:
+        zero = du.DCCurrZero
+
+    match command:
+
+        case 'G1':
+            Coor = pos.copy()
+            entry = new_entry(Coor, speed.copy(), zone)
+            if not rounded:
+                # same as round(Coor, 2), without creating a new Coordinate
+                Coor.x = float(round(Coor.x, 2))
+                Coor.y = float(round(Coor.y, 2))
+                Coor.z = float(round(Coor.z, 2))
+                Coor.rx = float(round(Coor.rx, 2))
+                Coor.ry = float(round(Coor.ry, 2))
+                Coor.rz = float(round(Coor.rz, 2))
+                Coor.q = float(round(Coor.q, 2))
+                Coor.ext = float(round(Coor.ext, 2))
+
+            # only values that changed need rounding from here on
+            if 'X' in found:
+                x = float(found['X'].replace(',', '.')) + zero.x
+                Coor.x = round(x, 2)
+                if ext_trail:
+                    # calculate following position of external axis
+                    if x > 0:
+                        ext = int(x / du.SC_ext_trail[0]) * du.SC_ext_trail[1]
+                        Coor.ext = float(round(ext + zero.ext, 2))
+                    else:
+                        Coor.ext = float(round(zero.ext, 2))
+            if 'Y' in found:
+                y = float(found['Y'].replace(',', '.')) + zero.y
+                Coor.y = round(y, 2)
+            if 'Z' in found:
+                z = float(found['Z'].replace(',', '.')) + zero.z
+                Coor.z = round(z, 2)
+            if 'XR' in found:
+                rx = float(found['XR'].replace(',', '.')) + zero.rx
+                Coor.rx = round(rx, 2)
+            if 'YR' in found:
+                ry = float(found['YR'].replace(',', '.')) + zero.ry
+                Coor.ry = round(ry, 2)
+            if 'ZR' in found:
+                rz = float(found['ZR'].replace(',', '.')) + zero.rz
+                Coor.rz = round(rz, 2)
+            if 'F' in found:
+                fr = float(found['F'].replace(',', '.'))
+                entry.Speed.ts = int(fr * du.IO_fr_to_ts)
+            if 'EXT' in found:
+                ext = float(found['EXT'].replace(',', '.')) + zero.ext
+                Coor.ext = round(ext, 2)
+
+            entry = pump_tool(entry, found)
+
+        case 'G28':
+            entry = new_entry(pos.copy(), speed.copy(), zone)
+            if 'X0' in txt:
+                entry.Coor1.x = zero.x
+            if 'Y0' in txt:
+                entry.Coor1.y = zero.y
+            if 'Z0' in txt:
+                entry.Coor1.z = zero.z
+            if 'EXT0' in txt:
+                entry.Coor1.ext = zero.ext
+
+            entry = pump_tool(entry, found)
+
+        case 'G92':
+            if 'X0' in txt:
+                zero.x = pos.x
+            if 'Y0' in txt:
+                zero.y = pos.y
+            if 'Z0' in txt:
+                zero.z = pos.z
+            if 'EXT0' in txt:
+                zero.ext = pos.ext
+            return None, command
+
+        case _:
+            return None, ''
+
+    return entry, command
+
+
+def rapid_line(txt:str, ext_trail=True) -> du.QEntry | None | Exception:
+    """converts a single RAPID line, see rapid_to_qentry"""
+
+    move = RAPID_MOVE.search(txt)
+    if move is None:
+        return None
+    decimals = RAPID_DECIMALS.findall(txt)
+    if not decimals:
+        return None
+
+    entry = new_entry(_NO_COOR.copy(), du.SpeedVector(), 10)
+    entry.mt = move.group(1)
+    try:
+        zero = du.DCCurrZero
+        Coor = entry.Coor1
+        # look for relative coordinates
+        if 'Offs' in txt:
+            Coor.x = zero.x + float(decimals[0])
+            Coor.y = zero.y + float(decimals[1])
+            Coor.z = zero.z + float(decimals[2])
+            Coor.rx = zero.rx
+            Coor.ry = zero.ry
+            Coor.rz = zero.rz
+            Coor.q = zero.q
+            ext = zero.ext
+
+        # or standard robtarget
+        else:
+            ext = 0.0
+            entry.pt = 'Q'
+            res_coor = [float(decimals[i]) for i in range(7)]
+            Coor.x, Coor.y, Coor.z, Coor.rx, Coor.ry, Coor.rz, Coor.q = (
+                res_coor
+            )
+
+        res_speed = RAPID_SPEED.search(txt)
+        if res_speed is None:
+            raise IndexError('list index out of range')
+        res_speed = RAPID_NUMS.findall(res_speed.group())
+
+        found = words(txt)
+        ext_from_file = found.get('EXT')
+        if ext_from_file is None:
+            if ext_trail:
+                ext_from_file = (
+                    int(Coor.x / du.SC_ext_trail[0]) * du.SC_ext_trail[1]
+                )
+        else:
+            ext_from_file = float(ext_from_file)
+        Coor.ext = ext + ext_from_file
+
+        # converting '1.2'-like strings to int throws an error
+        # convert to float first
+        entry.Speed.ts = int(float(res_speed[0]))
+        entry.Speed.ors = int(float(res_speed[1]))
+        entry.Speed.acr = int(float(res_speed[2]))
+        entry.Speed.dcr = int(float(res_speed[3]))
+        zone = RAPID_ZONE.search(txt)
+        zone = du.IO_zone if zone is None else zone.group()
+        entry.z = int(zone[1:])
+
+        entry = pump_tool(entry, found)
+
+    except Exception as err:
+        return err
+
+    return entry
+
+
+def parse_gcode(
+        lines:Iterable[str],
+        ext_trail=True,
+) -> Iterator[tuple[du.QEntry | None, str]]:
+    """yields (entry, command) for every row of a GCode file, starting from
+    DCCurrZero with PRINSpeed, every entry starts from the last one
+
+    accepts:
+        lines:
+            file object or any iterable of lines
+        ext_trail:
+            toggle for external trailing (fllwBhvr), True to turn on
+    """
+
+    Speed = du.PRINSpeed.copy()
+    # file import always starts from home, regardless of current pos:
+    LastPos = du.DCCurrZero
+    zone = du.IO_zone
+    rounded = False
+
+    for row in rows(lines):
+        Entry, command = gcode_line(
+            LastPos, Speed, zone, row, ext_trail, rounded
+        )
+        if Entry is not None:
+            LastPos = Entry.Coor1
+            rounded = command == 'G1'
+        yield Entry, command
+
+
+def parse_rapid(
+        lines:Iterable[str],
+        ext_trail=True,
+) -> Iterator[du.QEntry | None | Exception]:
+    """yields the result of rapid_line for every row of a RAPID file
+
+    accepts:
+        lines:
+            file object or any iterable of lines
+        ext_trail:
+            toggle for external trailing (fllwBhvr), True to turn on
+    """
+
+    for row in rows(lines):
+        yield rapid_line(row, ext_trail)
+
+
+def stream_file(
+        path:Path | str,
+        ext_trail=True,
+) -> Generator[
+        tuple[du.QEntry | None, str], None, du.Coordinate | None
+]:
+    """yields (entry, '') for every row of a .mod (RAPID) or any other
+    (GCode) file, entry is None for skipped rows; stops after yielding
+    (None, error) for the first invalid row, the errors are the same as
+    in LoadResult.error; nothing is kept or cached; G92 commands change a
+    copy of DCCurrZero, which is returned once the file is done (see
+    LoadResult.zero), None for RAPID files or after an error
+    """
+
+    with MappedFile(path) as file:
+        if Path(path).suffix == '.mod':
+            for Entry in parse_rapid(file, ext_trail):
+                if isinstance(Entry, Exception):
+                    yield None, f"ERROR: {Entry}"
+                    return
+                yield Entry, ''
+            return
+
+        Speed = du.PRINSpeed.copy()
+        # file import always starts from home, regardless of current pos; G92
+        # changes this copy, DCCurrZero is left alone
+        zero = du.DCCurrZero.copy()
+        LastPos = zero
+        zone = du.IO_zone
+        rounded = False
+        for row in rows(file):
+            command = G_COMMAND.search(row)
+            if command is None:
+                yield None, ''
+                continue
+            command = command.group()
+            found = words(row) if command in ('G1', 'G28') else None
+            try:
+                Entry, command = _gcode_entry(
+                    LastPos, Speed, zone, row, command, found, ext_trail,
+                    rounded, zero,
+                )
+            except ValueError:
+                yield None, f"VALUE ERROR: {command}!"
+                return
+            if Entry is None:
+                if command != 'G92' and command != '':
+                    yield None, f"{command}, ABORTED!"
+                    return
+                yield None, ''
+                continue
+            LastPos = Entry.Coor1
+            rounded = command == 'G1'
+            yield Entry, ''
+        return zero
+
+
+def pre_check_gcode(
+        lines:Iterable[str],
+) -> tuple[int | Exception, int, float, str]:
+    """streaming version of pre_check_gcode_file, same results
+
+    accepts:
+        lines:
+            file object or any iterable of lines
+    """
+
+    try:
+        x = y = z = 0.0
+        comm_num = 0
+        skips = 0
+        row_num = 0
+        filament_length = 0.0
+        last_row = ''
+
+        for row in rows(lines):
+            row_num += 1
+            last_row = row
+            # skip comments (starting with ';', regex ignores whitespace)
+            if G_COMMENT.match(row):
+                skips += 1
+                continue
+            # look for valid command lines (ignores M-commands)
+            if G_COMMAND.search(row):
+                comm_num += 1
+                found = words(row)
+                x_new = float(found.get('X', x))
+                y_new = float(found.get('Y', y))
+                z_new = float(found.get('Z', z))
+
+                # do the Pythagoras for me, baby
+                filament_length += m.sqrt(
+                    m.pow(x_new - x, 2)
+                    + m.pow(y_new - y, 2)
+                    + m.pow(z_new - z, 2)
+                )
+                x, y, z = x_new, y_new, z_new
+            else:
+                skips += 1
+
+        if row_num == 1 and last_row == '':
+            return 0, 0, 0.0, 'empty'
+
+        # convert filamentLength to meters and round
+        filament_length /= 1000.0
+        filament_length = round(filament_length, 2)
+
+    except Exception as err:
+        return err, 0, 0.0, ''
+
+    return comm_num, skips, filament_length, ''
+
+
+def pre_check_rapid(
+        lines:Iterable[str],
+) -> tuple[int | Exception, int, float, str]:
+    """streaming version of pre_check_rapid_file, same results
+
+    accepts:
+        lines:
+            file object or any iterable of lines
+    """
+
+    try:
+        x = y = z = 0.0
+        comm_num = 0
+        skips = 0
+        row_num = 0
+        filament_length = 0.0
+        last_row = ''
+
+        for row in rows(lines):
+            row_num += 1
+            last_row = row
+            # skip comments (starting with '!', regex ignores whitespace)
+            if RAPID_COMMENT.match(row):
+                skips += 1
+                continue
+            # ' p' (notice the whitespace) expression to differ between
+            # 'MoveJ pHome,[...]' and 'MoveJ Offs(pHome [...]'
+            if ('Move' in row) and (' p' not in row):
+                comm_num += 1
+                digits = RAPID_DIGITS.findall(row)
+                x_new = float(digits[0])
+                y_new = float(digits[1])
+                z_new = float(digits[2])
+
+                # do the Pythagoras for me, baby
+                filament_length += m.sqrt(
+                    m.pow(x_new - x, 2)
+                    + m.pow(y_new - y, 2)
+                    + m.pow(z_new - z, 2)
+                )
+                x, y, z = x_new, y_new, z_new
+            else:
+                skips += 1
+
+        if row_num == 1 and last_row == '':
+            return 0, 0, 0.0, 'empty'
+
+        # convert filamentLength to meters and round
+        filament_length /= 1000
+        filament_length = round(filament_length, 2)
+
+    except Exception as err:
+        return err, 0, 0.0, ''
+
+    return comm_num, skips, filament_length, ''
+
+
+def in_range(Coor:du.Coordinate, RangeMin:tuple, RangeMax:tuple) -> bool:
+    """same result as range_check, without changing Coor (range_check
+    moves a negative rx by 360°)
+    """
+
+    rx = Coor.rx + 360.0 if Coor.rx < 0.0 else Coor.rx
+    return (
+        RangeMin[0] <= Coor.x <= RangeMax[0]
+        and RangeMin[1] <= Coor.y <= RangeMax[1]
+        and RangeMin[2] <= Coor.z <= RangeMax[2]
+        and RangeMin[3] <= rx <= RangeMax[3]
+        and RangeMin[4] <= Coor.ry <= RangeMax[4]
+        and RangeMin[5] <= Coor.rz <= RangeMax[5]
+        and RangeMin[6] <= Coor.q <= RangeMax[6]
+        and RangeMin[7] <= Coor.ext <= RangeMax[7]
+    )
+
+
+def in_base_dist(Coor:du.Coordinate) -> bool:
+    """same result as base_dist_check"""
+
+    x_dist = Coor.x - Coor.ext
+    y_dist = du.RC_y_base_pos - Coor.y
+    dist = m.sqrt(m.pow(x_dist, 2) + m.pow(y_dist, 2))
+    return dist <= du.RC_max_base_dist
+
+
+def load_gcode(lines:Iterable[str], ext_trail=True) -> LoadResult:
+    """single pass over a GCode file: converts like parse_gcode, counts
+    like pre_check_gcode and checks every entry, see LoadResult
+
+    accepts:
+        lines:
+            file object or any iterable of lines
+        ext_trail:
+            toggle for external trailing (fllwBhvr), True to turn on
+    """
+
+    Result = LoadResult()
+    Speed = du.PRINSpeed.copy()
+    # file import always starts from home, regardless of current pos; G92
+    # changes this copy, DCCurrZero is left alone
+    zero = du.DCCurrZero.copy()
+    LastPos = zero
+    zone = du.IO_zone
+    rounded = False
+
+    x = y = z = 0.0
+    comm_num = 0
+    skips = 0
+    row_num = 0
+    filament_length = 0.0
+    last_row = ''
+    try:
+        for row in rows(lines):
+            row_num += 1
+            last_row = row
+            command = G_COMMAND.search(row)
+            found = None
+            if command is not None:
+                command = command.group()
+                found = words(row)
+
+            # statistics, comments are skipped even if they hold a command
+            if command is None or G_COMMENT.match(row):
+                skips += 1
+            elif not isinstance(comm_num, Exception):
+                comm_num += 1
+                try:
+                    x_new = float(found.get('X', x))
+                    y_new = float(found.get('Y', y))
+                    z_new = float(found.get('Z', z))
+                except ValueError as err:
+                    comm_num = err
+                else:
+                    filament_length += m.sqrt(
+                        m.pow(x_new - x, 2)
+                        + m.pow(y_new - y, 2)
+                        + m.pow(z_new - z, 2)
+                    )
+                    x, y, z = x_new, y_new, z_new
+
+            # conversion, stops at the first invalid command
+            if Result.error or command is None:
+                continue
+            try:
+                Entry, command = _gcode_entry(
+                    LastPos, Speed, zone, row, command, found, ext_trail,
+                    rounded, zero,
+                )
+            except ValueError:
+                Result.error = f"VALUE ERROR: {command}!"
+                continue
+            if Entry is not None:
+                Result.add(Entry, row_num - 1)
+                LastPos = Entry.Coor1
+                rounded = command == 'G1'
+            elif command != 'G92' and command != '':
+                Result.error = f"{command}, ABORTED!"
+
+    except Exception as err:
+        comm_num = err
+        Result.error = Result.error or f"ERROR: {err}"
+
+    Result.row_num = row_num
+    if isinstance(comm_num, Exception):
+        Result.comm_num = comm_num
+    elif row_num == 1 and last_row == '':
+        Result.res = 'empty'
+    else:
+        # convert filamentLength to meters and round
+        Result.comm_num = comm_num
+        Result.skips = skips
+        Result.fil_length = round(filament_length / 1000.0, 2)
+    Result.zero = zero
+    return Result.finish()
+
+
+def load_rapid(lines:Iterable[str], ext_trail=True) -> LoadResult:
+    """single pass over a RAPID file: converts like parse_rapid, counts
+    like pre_check_rapid and checks every entry, see LoadResult
+
+    accepts:
+        lines:
+            file object or any iterable of lines
+        ext_trail:
+            toggle for external trailing (fllwBhvr), True to turn on
+    """
+
+    Result = LoadResult()
+    x = y = z = 0.0
+    comm_num = 0
+    skips = 0
+    row_num = 0
+    filament_length = 0.0
+    last_row = ''
+    try:
+        for row in rows(lines):
+            row_num += 1
+            last_row = row
+
+            # statistics, see pre_check_rapid
+            if RAPID_COMMENT.match(row):
+                skips += 1
+            elif ('Move' in row) and (' p' not in row):
+                if not isinstance(comm_num, Exception):
+                    comm_num += 1
+                    try:
+                        digits = RAPID_DIGITS.findall(row)
+                        x_new = float(digits[0])
+                        y_new = float(digits[1])
+                        z_new = float(digits[2])
+                    except (ValueError, IndexError) as err:
+                        comm_num = err
+                    else:
+                        filament_length += m.sqrt(
+                            m.pow(x_new - x, 2)
+                            + m.pow(y_new - y, 2)
+                            + m.pow(z_new - z, 2)
+                        )
+                        x, y, z = x_new, y_new, z_new
+            else:
+                skips += 1
+
+            # conversion, stops at the first error
+            if Result.error:
+                continue
+            Entry = rapid_line(row, ext_trail)
+            if isinstance(Entry, Exception):
+                Result.error = f"ERROR: {Entry}"
+            elif Entry is not None:
+                Result.add(Entry, row_num - 1)
+
+    except Exception as err:
+        comm_num = err
+        Result.error = Result.error or f"ERROR: {err}"
+
+    Result.row_num = row_num
+    if isinstance(comm_num, Exception):
+        Result.comm_num = comm_num
+    elif row_num == 1 and last_row == '':
+        Result.res = 'empty'
+    else:
+        # convert filamentLength to meters and round
+        Result.comm_num = comm_num
+        Result.skips = skips
+        Result.fil_length = round(filament_length / 1000, 2)
+    return Result.finish()
+
+
+def _load_settings() -> tuple:
+    """everything a load depends on besides the file"""
+
+    Speed = du.PRINSpeed
+    return (
+        tuple(du.DCCurrZero),
+        (Speed.acr, Speed.dcr, Speed.ts, Speed.ors),
+        du.IO_zone,
+        tuple(du.SC_ext_trail),
+        du.IO_fr_to_ts,
+        du.TOOL_trol_ratio,
+        tuple(du.RC_area[0]),
+        tuple(du.RC_area[1]),
+        du.RC_y_base_pos,
+        du.RC_max_base_dist,
+    )
+
+
+def _apply_settings(settings:tuple) -> None:
+    """takes over the conversion settings of _load_settings, used in the
+    worker processes of load_gcode_parallel
+    """
+
+    zero, speed, zone, ext_trail, fr_to_ts, trol_ratio = settings[:6]
+    du.DCCurrZero = du.Coordinate(*zero)
+    du.PRINSpeed = du.SpeedVector(
+        acr=speed[0], dcr=speed[1], ts=speed[2], ors=speed[3]
+    )
+    du.IO_zone = zone
+    du.SC_ext_trail = ext_trail
+    du.IO_fr_to_ts = fr_to_ts
+    du.TOOL_trol_ratio = trol_ratio
+
+
+def _gcode_chunk(
+        path:str,
+        start:int,
+        stop:int,
+        ext_trail:bool,
+        settings:tuple,
+) -> dict:
+    """converts & counts rows start to stop (excl.) of a GCode file in a
+    worker process, see load_gcode; unless the chunk starts the file, the
+    last position is not known: it is set to NaN and the NaNs are filled
+    in by load_gcode_parallel; everything is returned as arrays, which
+    are a lot cheaper to send back than QEntries
+    """
+
+    _apply_settings(settings)
+    nan = float('nan')
+    if start == 0:
+        LastPos = du.DCCurrZero
+        x = y = z = 0.0
+    else:
+        LastPos = du.Coordinate(nan, nan, nan, nan, nan, nan, nan, nan)
+        x = y = z = nan
+    Speed = du.PRINSpeed.copy()
+    zone = du.IO_zone
+    rounded = False
+
+    entries = []
+    rows = []
+    g1 = array('b')
+    # (x, y, z) after every command counted by the statistics
+    points = array('d')
+    error = ''
+    stat_error = None
+    comm_num = 0
+    skips = 0
+    seen = 0
+
+    with MappedFile(path) as file:
+        for line in file.lines(start, stop):
+            row = line[:-1] if line.endswith('\n') else line
+            seen += 1
+            command = G_COMMAND.search(row)
+            found = None
+            if command is not None:
+                command = command.group()
+                found = words(row)
+
+            # statistics, see load_gcode
+            if command is None or G_COMMENT.match(row):
+                skips += 1
+            elif stat_error is None:
+                comm_num += 1
+                try:
+                    x = float(found.get('X', x))
+                    y = float(found.get('Y', y))
+                    z = float(found.get('Z', z))
+                except ValueError as err:
+                    stat_error = err
+                else:
+                    points.extend((x, y, z))
+
+            # conversion, stops at the first invalid command
+            if error or command is None:
+                continue
+            try:
+                Entry, command = _gcode_entry(
+                    LastPos, Speed, zone, row, command, found, ext_trail,
+                    rounded,
+                )
+            except ValueError:
+                error = f"VALUE ERROR: {command}!"
+                continue
+            if Entry is None:
+                if command != 'G92' and command != '':
+                    error = f"{command}, ABORTED!"
+                continue
+
+            entries.append(Entry)
+            rows.append(start + seen - 1)
+            g1.append(command == 'G1')
+            LastPos = Entry.Coor1
+            rounded = command == 'G1'
+
+    records = np.zeros(len(entries), dtype=JOB_RECORD)
+    _job_records(records, entries, rows)
+    return {
+        'records': records,
+        'g1': np.frombuffer(g1, dtype=np.int8).astype(bool),
+        'points': np.frombuffer(points, dtype=np.float64).reshape(-1, 3),
+        'error': error,
+        'stat_error': stat_error,
+        'comm_num': comm_num,
+        # the empty row after a trailing line break is not a line
+        'skips': skips + (stop - start - seen),
+    }
+
+
+def _fill_unknown(values:np.ndarray, g1:np.ndarray, first:tuple) -> None:
+    """fills the NaNs of values (one row per entry) in place with the value
+    before, like the serial conversion carries the last position on; G1
+    rounds the values it takes over, so a value is rounded if a G1 came
+    in between; first holds the values before the first row
+    """
+
+    g1_num = np.cumsum(g1)
+    index = np.arange(len(values))
+    for j in range(values.shape[1]):
+        column = values[:, j]
+        unknown = np.isnan(column)
+        if not unknown.any():
+            continue
+        # source: last known row before, -1 for first
+        source = np.where(unknown, -1, index)
+        np.maximum.accumulate(source, out=source)
+        rows = np.flatnonzero(unknown)
+        source = source[rows]
+        g1_before = np.where(source < 0, 0, g1_num[np.maximum(source, 0)])
+        rounded = g1_num[rows] > g1_before
+        # a handful of sources (one per chunk), Python's round is exact
+        for src in np.unique(source).tolist():
+            value = first[j] if src < 0 else float(column[src])
+            taken = source == src
+            column[rows[taken & ~rounded]] = value
+            column[rows[taken & rounded]] = float(round(value, 2))
+
+
+def load_gcode_parallel(
+        file:MappedFile,
+        ext_trail=True,
+        processes=2,
+        progress=None,
+        chunks=None,
+) -> LoadResult:
+    """same result as load_gcode, but the file is converted in chunks by
+    several processes; the chunks are stitched together afterwards with
+    numpy (positions carried over the chunk starts, filament length);
+    files with G92 commands can not be split, as the zero depends on the
+    position before, use load_gcode for those; the entries are kept as
+    records, see LoadResult
+
+    accepts:
+        file:
+            mapped GCode file
+        ext_trail:
+            toggle for external trailing (fllwBhvr), True to turn on
+        processes:
+            number of worker processes
+        progress:
+            callable, gets (chunks done, chunks) after every chunk
+        chunks:
+            number of chunks, by default 4 per process of at least 10000
+            rows each
+    """
+
+    row_num = len(file)
+    chunk_num = (
+        max(min(processes * 4, row_num // 10000), 1)
+        if chunks is None
+        else max(min(chunks, row_num), 1)
+    )
+    bounds = [row_num * i // chunk_num for i in range(chunk_num + 1)]
+    settings = _load_settings()
+
+    results = [None] * chunk_num
+    # spawned, as forking a process with running (Qt) threads is unsafe
+    with ProcessPoolExecutor(
+            processes, mp_context=multiprocessing.get_context('spawn')
+    ) as pool:
+        futures = {
+            pool.submit(
+                _gcode_chunk, str(file.path), bounds[i], bounds[i + 1],
+                ext_trail, settings,
+            ): i
+            for i in range(chunk_num)
+        }
+        for done, fut in enumerate(as_completed(futures), start=1):
+            results[futures[fut]] = fut.result()
+            if progress is not None:
+                progress(done, chunk_num)
+
+    Result = LoadResult()
+    Result.row_num = row_num
+
+    # statistics up to the first unreadable command, see load_gcode
+    comm_num = 0
+    for chunk in results:
+        comm_num += chunk['comm_num']
+        if chunk['stat_error'] is not None:
+            comm_num = chunk['stat_error']
+            break
+    if isinstance(comm_num, Exception):
+        Result.comm_num = comm_num
+    else:
+        points = np.concatenate([chunk['points'] for chunk in results])
+        _fill_unknown(points, np.zeros(len(points), dtype=bool), (0.0,) * 3)
+        steps = np.diff(points, axis=0, prepend=np.zeros((1, 3)))
+        lengths = np.sqrt(
+            steps[:, 0] ** 2 + steps[:, 1] ** 2 + steps[:, 2] ** 2
+        )
+        # summed up one after another, as load_gcode does
+        filament_length = (
+            float(np.cumsum(lengths)[-1]) if len(lengths) else 0.0
+        )
+        # convert filamentLength to meters and round
+        Result.comm_num = comm_num
+        Result.skips = sum(chunk['skips'] for chunk in results)
+        Result.fil_length = round(filament_length / 1000.0, 2)
+
+    # entries up to the first conversion error
+    used = []
+    for chunk in results:
+        used.append(chunk)
+        if chunk['error']:
+            Result.error = chunk['error']
+            break
+    records = np.concatenate([chunk['records'] for chunk in used])
+    _fill_unknown(
+        records['coor1'],
+        np.concatenate([chunk['g1'] for chunk in used]),
+        tuple(du.DCCurrZero),
+    )
+    Result.set_records(records)
+    return Result.finish()
+
+
+def job_path(path:Path | str) -> Path:
+    """compiled job file belonging to path, e.g. part.gcode.pjob"""
+
+    path = Path(path)
+    return path.with_name(path.name + JOB_SUFFIX)
+
+
+def _job_key(key:tuple) -> list:
+    """key as it reads back from the JSON header (lists for tuples)"""
+
+    return json.loads(json.dumps(key))
+
+
+def write_job(path:Path | str, Result:LoadResult, key:tuple) -> bool:
+    """writes the entries & statistics of Result as compiled job file,
+    key is the load_file key of the file Result was loaded from; written
+    to a temporary file first, so a job file is always complete; returns
+    False if Result holds an exception or the file could not be written
+    """
+
+    if isinstance(Result.comm_num, Exception) or Result.zero is None:
+        return False
+
+    records = Result._records
+    if records is None:
+        records = np.zeros(len(Result.rows), dtype=JOB_RECORD)
+        # see load_file, the columns are built from a lot of small tuples
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            _job_records(records, Result.entries, Result.rows)
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    header = json.dumps({
+        'key': key,
+        'entries': len(records),
+        'row_num': Result.row_num,
+        'error': Result.error,
+        'comm_num': Result.comm_num,
+        'skips': Result.skips,
+        'fil_length': Result.fil_length,
+        'res': Result.res,
+        'zero': list(Result.zero),
+    }).encode()
+    start = JOB_HEADER.size + len(header)
+    padding = b'\0' * (-start % 8)
+
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    try:
+        with open(tmp_path, 'wb') as file:
+            file.write(JOB_HEADER.pack(JOB_MAGIC, JOB_VERSION, len(header)))
+            file.write(header + padding)
+            file.write(records.tobytes())
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+    return True
+
+
+def _job_records(
+        records:np.ndarray,
+        entries:list,
+        rows:Iterable[int],
+) -> None:
+    """fills the job file records with the entries & their rows"""
+
+    if not entries:
+        return
+    records['coor1'] = [tuple(entry.Coor1) for entry in entries]
+    records['coor2'] = [tuple(entry.Coor2) for entry in entries]
+    records['speed'] = [
+        (entry.Speed.acr, entry.Speed.dcr, entry.Speed.ts, entry.Speed.ors)
+        for entry in entries
+    ]
+    for field in ['mt', 'pt', 'sc']:
+        records[field] = [getattr(entry, field).encode() for entry in entries]
+    for field in ['sbt', 'z', 'p_mode', 'p_ratio', 'pinch']:
+        records[field] = [getattr(entry, field) for entry in entries]
+    for field in [
+            'trolley_steps', 'wait', 'clamp', 'cut', 'place_spring',
+            'load_spring',
+    ]:
+        records[field] = [getattr(entry.Tool, field) for entry in entries]
+    records['row'] = rows
+
+
+def read_job(path:Path | str, key:tuple) -> LoadResult | None:
+    """returns the LoadResult stored in a compiled job file, the records
+    are read from the mapped file without any parsing; None if there is
+    no such file, it is broken or it was written for another key (source
+    file changed or other settings)
+    """
+
+    try:
+        with open(path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size < JOB_HEADER.size:
+                return None
+            Map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except OSError:
+        return None
+
+    records = None
+    try:
+        magic, version, length = JOB_HEADER.unpack_from(Map)
+        if magic != JOB_MAGIC or version != JOB_VERSION:
+            return None
+        start = JOB_HEADER.size + length
+        header = json.loads(Map[JOB_HEADER.size:start])
+        if header['key'] != _job_key(key):
+            return None
+        records = np.frombuffer(
+            Map,
+            dtype=JOB_RECORD,
+            count=header['entries'],
+            offset=start + (-start % 8),
+        )
+        return _job_result(records, header)
+    except (ValueError, KeyError, TypeError, struct.error):
+        return None
+    finally:
+        # the records point into the map, drop them before unmapping
+        del records
+        Map.close()
+
+
+def _job_result(records:np.ndarray, header:dict) -> LoadResult:
+    """builds the LoadResult from the records & header of a job file"""
+
+    Result = LoadResult()
+    Result.row_num = header['row_num']
+    Result.error = header['error']
+    Result.comm_num = header['comm_num']
+    Result.skips = header['skips']
+    Result.fil_length = header['fil_length']
+    Result.res = header['res']
+    Result.zero = du.Coordinate(*header['zero'])
+    # copied out of the map, see read_job
+    Result.set_records(np.array(records))
+    return Result.finish()
+
+
+def _record_entries(records:np.ndarray) -> list:
+    """builds the QEntries of JOB_RECORD records, IDs not set"""
+
+    columns = [records[field].tolist() for field in [
+        'coor1', 'coor2', 'speed', 'sbt', 'z', 'p_mode', 'p_ratio', 'pinch',
+        'trolley_steps', 'clamp', 'cut', 'place_spring', 'load_spring',
+        'wait',
+    ]]
+    columns += [records[field].astype('U1').tolist() for field in [
+        'mt', 'pt', 'sc'
+    ]]
+
+    new_coor = du.Coordinate.__new__
+    new_speed = du.SpeedVector.__new__
+    new_tool = du.ToolCommand.__new__
+    new_qentry = du.QEntry.__new__
+    entries = []
+    for (
+            coor1, coor2, speed, sbt, z, p_mode, p_ratio, pinch, trolley,
+            clamp, cut, place_spring, load_spring, wait, mt, pt, sc,
+    ) in zip(*columns):
+        entry = new_qentry(du.QEntry)
+        entry.id = 0
+        entry.mt = mt
+        entry.pt = pt
+        entry.sbt = sbt
+        entry.sc = sc
+        entry.z = z
+        entry.p_mode = p_mode
+        entry.p_ratio = p_ratio
+        entry.pinch = pinch
+        for attr, values in (('Coor1', coor1), ('Coor2', coor2)):
+            Coor = new_coor(du.Coordinate)
+            (
+                Coor.x, Coor.y, Coor.z, Coor.rx, Coor.ry, Coor.rz, Coor.q,
+                Coor.ext,
+            ) = values
+            setattr(entry, attr, Coor)
+        Speed = new_speed(du.SpeedVector)
+        Speed.acr, Speed.dcr, Speed.ts, Speed.ors = speed
+        entry.Speed = Speed
+        Tool = new_tool(du.ToolCommand)
+        Tool.trolley_steps = trolley
+        Tool.clamp = clamp
+        Tool.cut = cut
+        Tool.place_spring = place_spring
+        Tool.load_spring = load_spring
+        Tool.wait = wait
+        entry.Tool = Tool
+        entries.append(entry)
+    return entries
+
+
+# (path, key, LoadResult) of the last file loaded
+_last_load = None
+
+
+def load_file(
+        path:Path | str,
+        ext_trail=True,
+        processes=None,
+        progress=None,
+        job=None,
+) -> LoadResult:
+    """loads a .mod (RAPID) or any other (GCode) file in a single pass, see
+    load_gcode/load_rapid; the result of the last file is cached against
+    its path, mtime, size, ext_trail & the settings used, so loading the
+    same file again costs nothing; DCCurrZero is not changed, the zero
+    after G92 commands is given as LoadResult.zero; GCode files with at
+    least IO_parallel_rows rows and no G92 are converted by several
+    processes (IO_load_processes if not given), progress gets
+    (chunks done, chunks) then, see load_gcode_parallel; with job
+    (IO_job_files if not given) the result is read from the compiled job
+    file beside the file if it has the same key, else it is (re)written
+    after the conversion
+    """
+
+    global _last_load
+
+    path = Path(path)
+    stat = path.stat()
+    key = (stat.st_mtime_ns, stat.st_size, ext_trail, _load_settings())
+    path_key = str(path.resolve())
+    if _last_load is not None and _last_load[:2] == (path_key, key):
+        return _last_load[2]
+
+    if job is None:
+        job = du.IO_job_files
+    if job:
+        Result = read_job(job_path(path), key)
+        if Result is not None:
+            _last_load = (path_key, key, Result)
+            return Result
+
+    with MappedFile(path) as file:
+        zero = du.DCCurrZero.copy()
+        # every entry makes a handful of new objects, pause the cyclic
+        # garbage collector so it does not rescan all of them over and over
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            if processes is None:
+                processes = du.IO_load_processes
+            if path.suffix == '.mod':
+                Result = load_rapid(file, ext_trail)
+            elif (
+                    processes > 1
+                    and len(file) >= du.IO_parallel_rows
+                    and file._map.find(b'G92') < 0
+            ):
+                Result = load_gcode_parallel(
+                    file, ext_trail, processes, progress
+                )
+            else:
+                Result = load_gcode(file, ext_trail)
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    # only GCode with G92 moves the zero
+    if Result.zero is None:
+        Result.zero = zero
+    if job:
+        write_job(job_path(path), Result, key)
+    _last_load = (path_key, key, Result)
+    return Result
@@ -11,10 +11,14 @@
 import re
 import os
 import sys
+import time
+import bisect
 import serial
 import socket
-import struct
+import select
+import operator
 import math as m
+import numpy as np
 from pathlib import Path
 from datetime import datetime, timedelta
 from copy import deepcopy as dcpy
@@ -25,12 +29,61 @@ parent_dir = os.path.dirname(current_dir)
 sys.path.append(parent_dir)
 
 # import interface for Toshiba frequency modulator by M-TEC
-from mtec.mtec_mod import MtecMod
+from mtec.mtec_mod import MtecMod, MtecScheduler
+
+# import robot protocol layout
+import libs.rob_codec as rc
 
 
 
 ############################     CLASSES      ################################
 
+def _slots_copy(*nested:str):
+    """class decorator for the __slots__ value classes below, adds copy &
+    _replace; copy is put together once from __slots__ (as namedtuple
+    does), so it assigns attribute by attribute like a handwritten one;
+    the slots given in nested hold objects that are copied as well, all
+    other attributes are immutable and shared
+    """
+
+    def decorate(cls:type) -> type:
+        body = [
+            f"    new.{attr} = self.{attr}.copy()" if attr in nested
+            else f"    new.{attr} = self.{attr}"
+            for attr in cls.__slots__
+        ]
+        namespace = {'cls': cls}
+        exec(
+            "def copy(self):\n"
+            "    new = cls.__new__(cls)\n"
+            + "\n".join(body)
+            + "\n    return new\n",
+            namespace,
+        )
+        copy = namespace['copy']
+
+        def _replace(self, **changes):
+            new = self.copy()
+            for attr, val in changes.items():
+                if attr not in cls.__slots__:
+                    raise ValueError(
+                        f"{attr} is not an attribute of {cls.__name__}!"
+                    )
+                setattr(new, attr, val)
+            return new
+
+        copy.__doc__ = "fast replacement for deepcopy"
+        _replace.__doc__ = "returns a copy with the given attributes changed"
+        for method in [copy, _replace]:
+            method.__qualname__ = f"{cls.__name__}.{method.__name__}"
+            setattr(cls, method.__name__, method)
+        return cls
+
+    return decorate
+
+
+
+@_slots_copy()
 class Coordinate:
     """standard 7-axis coordinate block (8 attributes, as quaterion
     positioning is possible); initialization by value list is also possible
@@ -47,10 +100,16 @@ class Coordinate:
             external axis position
 
     METHODS:
-        __init__, __str__, __add__, __sub__, __round__, __eq__, __ne__, distance
+        __init__, __str__, __add__, __iter__, __sub__, __round__, __eq__,
+        __ne__, distance
+
+        copy:
+            fast replacement for deepcopy
+        _replace:
+            returns a copy with the given attributes changed
     """
 
-    _iter_value = 0
+    __slots__ = ('x', 'y', 'z', 'rx', 'ry', 'rz', 'q', 'ext')
     _attr_names = ['x', 'y', 'z', 'rx', 'ry', 'rz', 'q', 'ext']
 
     def __init__(
@@ -70,7 +129,7 @@ class Coordinate:
                 raise ValueError(f"length of {x} does not fit attribute list")
             else:
                 ext, q, rz, ry, rx = x[7], x[6], x[5], x[4], x[3]
-                y, z = x[2], x[1]
+                y, z = x[1], x[2]
                 x = x[0]
 
         self.x = float(x)
@@ -124,21 +183,14 @@ class Coordinate:
             return round(res, 2)
 
 
-    def __iter__(self) -> 'Coordinate':
-        
-        self._iter_val = 0
-        return self
-    
-
-    def __next__(self) -> float:
-        
-        val = self._iter_value
+    def __iter__(self):
+        """yields the values in attr_names order, each call creates its own
+        generator, so nested loops over the same Coordinate are fine
+        """
 
-        if val >= len(self._attr_names):
-            raise StopIteration
-        
-        self._iter_value = val + 1
-        return getattr(self, self._attr_names[val])
+        yield from (
+            self.x, self.y, self.z, self.rx, self.ry, self.rz, self.q, self.ext
+        )
     
     
     def __sub__(self, subtrahend) -> 'Coordinate':
@@ -234,7 +286,7 @@ class Coordinate:
             )
 
         return False
-    
+
 
     def distance(self, other:'Coordinate') -> float:
         """returns distance from self to other coordinate"""
@@ -247,7 +299,286 @@ class Coordinate:
                 + m.pow(other.y - self.y, 2)
                 + m.pow(other.z - self.z, 2)
             )
-    
+
+
+    @property
+    def attr_names(self):
+        return self._attr_names
+
+
+
+class CoordinateView(Coordinate):
+    """zero-copy single-entry access to a CoordinateArray row, acts like a
+    Coordinate, but reads and writes go directly to the array it came from
+
+    ATTRIBUTES:
+        x, y, z, rx, ry, rz, q, ext:
+            same as Coordinate, mapped onto the array row
+
+    METHODS:
+        __init__ (and everything inherited from Coordinate)
+    """
+
+    __slots__ = ('_row',)
+
+    def __init__(self, row:np.ndarray) -> None:
+
+        # skip Coordinate.__init__, values live in the array row
+        self._row = row
+
+
+    def _column(col:int) -> property:
+        """creates a property mapped onto column 'col' of the row"""
+
+        def fget(self) -> float:
+            return float(self._row[col])
+
+        def fset(self, value) -> None:
+            self._row[col] = float(value)
+
+        return property(fget, fset)
+
+
+    x = _column(0)
+    y = _column(1)
+    z = _column(2)
+    rx = _column(3)
+    ry = _column(4)
+    rz = _column(5)
+    q = _column(6)
+    ext = _column(7)
+    del _column
+
+
+
+class CoordinateArray:
+    """columnar store for the coordinates of a whole print job; every row
+    holds one Coordinate (columns in the order of Coordinate.attr_names),
+    all rows are kept in a single (n, 8) float64 array, so arithmetic is
+    done for the whole job at once; initialization by a list of Coordinates,
+    a number of rows or an (n, 8) array is possible
+
+    ATTRIBUTES:
+        data:
+            the underlying (n, 8) numpy array
+        x, y, z, rx, ry, rz, q, ext:
+            column views (numpy, zero-copy) of the corresponding axis
+
+    METHODS:
+        __init__, __str__, __len__, __getitem__, __setitem__, __iter__,
+        __add__, __sub__, __round__, __eq__, __ne__
+
+        from_queue:
+            collects Coor1 (or Coor2) of all entries in a Queue
+        distance:
+            row-wise cartesian distance to a Coordinate or CoordinateArray
+        segment_lengths:
+            cartesian distances between consecutive rows
+        to_list:
+            returns the rows as a list of (independent) Coordinates
+    """
+
+    _attr_names = Coordinate._attr_names
+
+
+    def __init__(self, data=None) -> None:
+
+        if data is None:
+            data = np.zeros((0, 8), dtype=np.float64)
+        elif isinstance(data, int):
+            data = np.zeros((data, 8), dtype=np.float64)
+        elif isinstance(data, np.ndarray):
+            if data.ndim != 2 or data.shape[1] != 8:
+                raise ValueError(f"array of shape {data.shape} is not (n, 8)")
+            # keeps views of float64 arrays, anything else is converted
+            data = np.asarray(data, dtype=np.float64)
+        else:
+            data = np.array(
+                [self._values(Coor) for Coor in data], dtype=np.float64
+            ).reshape((-1, 8))
+
+        self._data = data
+
+
+    def __str__(self) -> str:
+
+        if len(self) == 0:
+            return 'CoordinateArray is empty!'
+        return '\n'.join(str(self[i]) for i in range(len(self)))
+
+
+    def __len__(self) -> int:
+
+        return self._data.shape[0]
+
+
+    def __getitem__(self, i) -> 'CoordinateView | CoordinateArray':
+        """returns a CoordinateView for single indices and a CoordinateArray
+        view for slices, neither copies any data
+        """
+
+        if isinstance(i, slice):
+            return CoordinateArray(self._data[i])
+        return CoordinateView(self._data[i])
+
+
+    def __setitem__(self, i, value) -> None:
+
+        if isinstance(value, CoordinateArray):
+            self._data[i] = value._data
+        elif isinstance(value, Coordinate):
+            self._data[i] = self._values(value)
+        else:
+            self._data[i] = value
+
+
+    def __iter__(self):
+
+        for row in self._data:
+            yield CoordinateView(row)
+
+
+    def __add__(self, summand) -> 'CoordinateArray':
+        """round everything to 2 digits, same as Coordinate.__add__"""
+
+        return round(CoordinateArray(self._data + self._operand(summand)), 2)
+
+
+    def __sub__(self, subtrahend) -> 'CoordinateArray':
+        """round everything to 2 digits, same as Coordinate.__sub__"""
+
+        return round(
+            CoordinateArray(self._data - self._operand(subtrahend)), 2
+        )
+
+
+    def __round__(self, digits) -> 'CoordinateArray':
+
+        return CoordinateArray(np.round(self._data, digits))
+
+
+    def __eq__(self, other) -> bool:
+
+        if isinstance(other, CoordinateArray):
+            return bool(np.array_equal(self._data, other._data))
+
+        elif other is not None:
+            raise TypeError(
+                f"{other} is not None or an instance of 'CoordinateArray'!"
+            )
+
+        return False
+
+
+    def __ne__(self, other) -> bool:
+
+        return not self.__eq__(other)
+
+
+    def _operand(self, other) -> np.ndarray | float:
+        """converts the other operand of an arithmetic operation to
+        something numpy can broadcast against self._data
+        """
+
+        if isinstance(other, CoordinateArray):
+            if len(other) != len(self):
+                raise ValueError(
+                    f"length mismatch: {len(self)} vs. {len(other)} rows!"
+                )
+            return other._data
+        if isinstance(other, Coordinate):
+            return np.array(self._values(other), dtype=np.float64)
+        return float(other)
+
+
+    @staticmethod
+    def _values(Coor:Coordinate) -> list[float]:
+        """returns the axis values of Coor in column order"""
+
+        return [
+            Coor.x, Coor.y, Coor.z, Coor.rx, Coor.ry, Coor.rz, Coor.q, Coor.ext
+        ]
+
+
+    @classmethod
+    def from_queue(cls, queue, attr='Coor1') -> 'CoordinateArray':
+        """collects the Coordinate 'attr' (Coor1 or Coor2) of every entry of
+        queue into a new CoordinateArray
+        """
+
+        if attr not in ('Coor1', 'Coor2'):
+            raise ValueError(f"{attr} is not a coordinate of 'QEntry'!")
+
+        data = np.empty((len(queue), 8), dtype=np.float64)
+        for i, entry in enumerate(queue):
+            data[i] = cls._values(getattr(entry, attr))
+        return cls(data)
+
+
+    def distance(self, other) -> np.ndarray:
+        """returns the cartesian distance of every row to other, which can be
+        a Coordinate or a CoordinateArray of the same length
+        """
+
+        if not isinstance(other, (Coordinate, CoordinateArray)):
+            raise TypeError(
+                f"{other} is not an instance of 'Coordinate' or "
+                f"'CoordinateArray'!"
+            )
+        diff = self._data[:, :3] - self._operand(other)[..., :3]
+        return np.sqrt(np.einsum('ij,ij->i', diff, diff))
+
+
+    def segment_lengths(self) -> np.ndarray:
+        """returns the cartesian distances between consecutive rows, so
+        result[i] is the length of the path from row i to row i+1
+        """
+
+        diff = np.diff(self._data[:, :3], axis=0)
+        return np.sqrt(np.einsum('ij,ij->i', diff, diff))
+
+
+    def to_list(self) -> list[Coordinate]:
+        """returns the rows as a list of independent Coordinates"""
+
+        return [Coordinate(row) for row in self._data.tolist()]
+
+
+    @property
+    def data(self) -> np.ndarray:
+        return self._data
+
+    @property
+    def x(self) -> np.ndarray:
+        return self._data[:, 0]
+
+    @property
+    def y(self) -> np.ndarray:
+        return self._data[:, 1]
+
+    @property
+    def z(self) -> np.ndarray:
+        return self._data[:, 2]
+
+    @property
+    def rx(self) -> np.ndarray:
+        return self._data[:, 3]
+
+    @property
+    def ry(self) -> np.ndarray:
+        return self._data[:, 4]
+
+    @property
+    def rz(self) -> np.ndarray:
+        return self._data[:, 5]
+
+    @property
+    def q(self) -> np.ndarray:
+        return self._data[:, 6]
+
+    @property
+    def ext(self) -> np.ndarray:
+        return self._data[:, 7]
 
     @property
     def attr_names(self):
@@ -255,6 +586,7 @@ class Coordinate:
 
 
 
+@_slots_copy()
 class SpeedVector:
     """standard speed vector (4 attributes).
 
@@ -270,8 +602,15 @@ class SpeedVector:
 
     METHODS:
         __init__, __str__, __mul__, __rmul__, __eq__, __ne__
+
+        copy:
+            fast replacement for deepcopy
+        _replace:
+            returns a copy with the given attributes changed
     """
 
+    __slots__ = ('acr', 'dcr', 'ts', 'ors')
+
 
     def __init__(self, acr=50, dcr=50, ts=200, ors=50) -> None:
 
@@ -350,6 +689,7 @@ class SpeedVector:
 
 
 
+@_slots_copy()
 class ToolCommand:
     """standard tool command according to Jonas' protocol
 
@@ -372,8 +712,16 @@ class ToolCommand:
 
     METHODS:
         __def__, __str__, __eq__, __ne__
+
+        copy:
+            fast replacement for deepcopy
+        _replace:
+            returns a copy with the given attributes changed
     """
 
+    __slots__ = (
+        'trolley_steps', 'clamp', 'cut', 'place_spring', 'load_spring', 'wait'
+    )
 
     def __init__(
         self,
@@ -448,6 +796,7 @@ class ToolCommand:
 
 
 
+@_slots_copy('Coor1', 'Coor2', 'Speed', 'Tool')
 class QEntry:
     """standard 159 byte command queue entry for TCP robot according to the
     protocol running on the robot
@@ -485,10 +834,18 @@ class QEntry:
     METHODS:
         __init__, __str__, __eq__, __ne__
 
+        copy:
+            fast replacement for deepcopy
+        _replace:
+            returns a copy with the given attributes changed
         print_short:
             prints only most important parameters
     """
 
+    __slots__ = (
+        'id', 'mt', 'pt', 'Coor1', 'Coor2', 'Speed', 'sbt', 'sc', 'z', 'Tool',
+        'p_mode', 'p_ratio', 'pinch'
+    )
 
     def __init__(
         self,
@@ -609,7 +966,11 @@ class QEntry:
 
 
 class Queue:
-    """QEntry-based list incl. data handling
+    """QEntry-based list incl. data handling; entries are stored in chunks of
+    up to _chunk_size entries, ID shifts (after inserts, deletes or
+    increments) are stored as pending deltas per chunk and only written to
+    the entries once a chunk is accessed, so shifting the IDs of a long queue
+    does not mean walking every single entry
 
     ATTRIBUTES:
         queue:
@@ -617,8 +978,7 @@ class Queue:
             QEntry.id
 
     METHODS:
-        __add__, __init__, __iter__, __getitem__, __len__, __next__,
-        __str__, __eq__
+        __add__, __init__, __iter__, __getitem__, __len__, __str__, __eq__
 
         last_entry:
             returns last entry
@@ -629,6 +989,8 @@ class Queue:
             returns entry before given ID
         display:
             returns queue as a str list (uses QEntry.print_short())
+        coordinates:
+            returns Coor1/Coor2 of the entries as CoordinateArray
         increment:
             increments all QEntry.ID to handle DC commands send before
             the queue
@@ -648,7 +1010,7 @@ class Queue:
             returns and deletes the QEntry at index 0
     """
 
-    _iter_value = 0
+    _chunk_size = 512
 
 
     def __add__(self, other) -> 'Queue':
@@ -661,66 +1023,65 @@ class Queue:
 
     def __init__(self, queue=None) -> None:
 
-        self._queue = [] if (queue is None) else queue
+        self._reset()
+        if queue is not None:
+            self._insert(0, list(queue))
 
 
     def __getitem__(self, i) -> QEntry | None:
 
-        try:
-            return self._queue[i]
-        except IndexError:
+        i = operator.index(i)
+        if i < 0:
+            i += self._len
+        if i < 0 or i >= self._len:
             return None
-    
 
-    def __iter__(self) -> 'Queue':
+        c, offs = self._locate(i)
+        self._materialize(c)
+        return self._chunks[c][offs]
 
-        self._iter_value = 0
-        return self
 
+    def __iter__(self):
 
-    def __len__(self) -> int:
+        for c in range(len(self._chunks)):
+            # the chunk list can change while the caller holds the iterator
+            if c >= len(self._chunks):
+                return
+            self._materialize(c)
+            yield from self._chunks[c]
 
-        return len(self._queue)
-    
 
-    def __next__(self) -> QEntry:
-        
-        val = self._iter_value
+    def __len__(self) -> int:
 
-        if val >= len(self):
-            raise StopIteration
-        
-        self._iter_value = val + 1
-        return self[val]
+        return self._len
 
 
     def __str__(self) -> str:
 
         if len(self) != 0:
             ans = ''
-            for x in self._queue:
+            for x in self:
                 ans += f'{x}\n'
             return ans
-        
+
         return 'Queue is empty!'
 
 
     def __eq__(self, other) -> bool:
 
         if isinstance(other, Queue):
-            length = len(self)
-            if length != len(other):
+            if len(self) != len(other):
                 return False
 
-            for elem in range(length):
-                if self[elem] != other[elem]:
+            for entry, other_entry in zip(self, other):
+                if entry != other_entry:
                     return False
 
             return True
 
         elif other is not None:
             raise TypeError(f"{other} is not an instance of 'Queue'!")
-        
+
         return False
 
 
@@ -728,14 +1089,13 @@ class Queue:
 
         if other is None:
             return True
-        
+
         elif isinstance(other, Queue):
-            length = len(self)
-            if length != len(other):
+            if len(self) != len(other):
                 return True
 
-            for elem in range(length):
-                if self[elem] != other[elem]:
+            for entry, other_entry in zip(self, other):
+                if entry != other_entry:
                     return True
 
             return False
@@ -753,30 +1113,27 @@ class Queue:
 
         if len(self) == 0:
             return None
-        return self._queue[len(self) - 1]
+        return self[len(self) - 1]
 
 
     def id_pos(self, id:int) -> int | None:
         """return queue entry index(!) at given ID, not the entry itself,
-        returns None if no such entry
+        returns None if no such entry; as long as IDs are consecutive, the
+        index is simply the offset to the first ID, otherwise the queue is
+        searched
         """
 
-        length = len(self)
-        i = 0
-
-        if length <= 0:
+        if len(self) <= 0:
             return None
 
-        for entry in range(length):
-            if self[entry].id == id:
-                break
-            else:
-                i += 1
+        guess = id - self[0].id
+        if 0 <= guess < len(self) and self[guess].id == id:
+            return guess
 
-        if i < 0 or i >= length:
-            return None
-
-        return i
+        for i, entry in enumerate(self):
+            if entry.id == id:
+                return i
+        return None
 
 
     def entry_before_id(self, id:int) -> QEntry:
@@ -784,19 +1141,8 @@ class Queue:
         AttributeError if no such entry
         """
 
-        length = len(self)
-        i = 0
-
-        if length <= 0:
-            raise AttributeError
-
-        for j in range(length):
-            if self[j].id == id:
-                break
-            else:
-                i += 1
-
-        if i < 1 or i >= length:
+        i = self.id_pos(id)
+        if i is None or i < 1:
             raise AttributeError
 
         return self[i - 1]
@@ -819,31 +1165,51 @@ class Queue:
         return ['Queue is empty!']
 
 
+    def coordinates(self, attr='Coor1', num=None) -> CoordinateArray:
+        """returns the Coordinate 'attr' (Coor1 or Coor2) of the first num
+        entries (all by default) as one CoordinateArray, so distances &
+        checks can be done for all of them at once
+        """
+
+        if num is None or num >= len(self):
+            return CoordinateArray.from_queue(self, attr)
+        return CoordinateArray.from_queue(
+            [self[i] for i in range(num)], attr
+        )
+
+
     def increment(self, summand=1) -> None:
         """increments all QEntry.ID to handle DC commands send before the
-        queue or ID overwrites
+        queue or ID overwrites; only the pending shift is changed, the
+        entries are updated once they are accessed
         """
 
-        for i in self:
-            i.id += int(summand)
+        self._base += int(summand)
 
 
-    def add(self, entry:QEntry, thread_call=False) -> None | Exception:
+    def add(
+            self,
+            entry:QEntry,
+            thread_call=False,
+            copy=True
+    ) -> None | Exception:
         """adds a new QEntry to queue, checks if QEntry.ID makes sense, places
         QEntry in queue according to the ID given, threadCall option allows
-        the first ID to be 0
+        the first ID to be 0; with copy=False the queue takes ownership of
+        the entry instead of storing a copy, the caller must not touch it
+        afterwards
         """
 
-        new_entry = dcpy(entry)
-        last_item = len(self) - 1
-        if not isinstance(new_entry, QEntry):
+        if not isinstance(entry, QEntry):
             return ValueError('entry is not an instance of QEntry')
+        new_entry = entry.copy() if copy else entry
+        last_item = len(self) - 1
 
         if last_item < 0:
             global SC_curr_comm_id
             if not thread_call:
                 new_entry.id = SC_curr_comm_id
-            self._queue.append(new_entry)
+            self._insert(0, [new_entry])
             return None
 
         last_id = self[last_item].id
@@ -852,10 +1218,10 @@ class Queue:
         if new_entry.id == 0 or new_entry.id > last_id:
             if thread_call and new_entry.id == 0:
                 self.increment()
-                self._queue.insert(0, new_entry)
+                self._insert(0, [new_entry])
             else:
                 new_entry.id = last_id + 1
-                self._queue.append(new_entry)
+                self._insert(len(self), [new_entry])
 
         elif new_entry.id < 0:
             return ValueError
@@ -865,22 +1231,26 @@ class Queue:
                 new_entry.id = first_id
 
             front_skip = new_entry.id - first_id
-            self._queue.insert(front_skip, new_entry)
-            for i in range(last_item + 1 - front_skip):
-                i += 1
-                self[i + front_skip].id += 1
+            self._shift_ids(front_skip, 1)
+            self._insert(front_skip, [new_entry])
 
         return None
 
 
-    def add_queue(self, add_queue:'Queue') -> None | Exception:
+    def add_queue(self, add_queue:'Queue', copy=True) -> None | Exception:
         """adds another queue, hopefully less time-consuming than a for loop
-        with self.add
+        with self.add; with copy=False the entries of add_queue are taken
+        over as they are (and their IDs adjusted in place), the caller must
+        not use add_queue afterwards
         """
 
-        new_list = dcpy(add_queue)
-        if not isinstance(new_list, Queue):
-            return ValueError(f"{new_list} is not an instance of 'Queue'!")
+        if not isinstance(add_queue, Queue):
+            return ValueError(f"{add_queue} is not an instance of 'Queue'!")
+        if copy:
+            new_list = Queue()
+            new_list._insert(0, [entry.copy() for entry in add_queue])
+        else:
+            new_list = add_queue
         try:
             nl_first_id = new_list[0].id
         except Exception as err:
@@ -892,7 +1262,7 @@ class Queue:
             global SC_curr_comm_id
             if nl_first_id != SC_curr_comm_id:
                 new_list.increment(SC_curr_comm_id - nl_first_id)
-            self._queue.extend(new_list._queue)
+            self._insert(0, list(new_list))
             return
 
         len_new_list = len(new_list)
@@ -902,27 +1272,31 @@ class Queue:
         if (nl_first_id > last_id + 1) or (nl_first_id == 0):
             new_list.increment(last_id + 1 - nl_first_id)
             nl_first_id = last_id + 1
-            
+
         if nl_first_id == (last_id + 1):
-            self._queue.extend(new_list._queue)
-        
+            self._insert(len(self), list(new_list))
+
         else:
             if nl_first_id < first_id:
                 new_list.increment(first_id - nl_first_id)
                 nl_first_id = first_id
             front_skip = nl_first_id - first_id
-            for i in range(len(self) - front_skip):
-                self[i + front_skip].id += len_new_list
-            self._queue[front_skip:front_skip] = new_list._queue
+            self._shift_ids(front_skip, len_new_list)
+            self._insert(front_skip, list(new_list))
 
 
-    def append(self, entry:QEntry) -> None:
+    def append(self, entry:QEntry, copy=True) -> None:
         """other than '.add' this simply appends an entry indifferently
-        to its ID
+        to its ID, see '.add' for copy=False
         """
 
-        new_entry = dcpy(entry)
-        self._queue.append(new_entry)
+        if not copy:
+            new_entry = entry
+        elif isinstance(entry, QEntry):
+            new_entry = entry.copy()
+        else:
+            new_entry = dcpy(entry)
+        self._insert(len(self), [new_entry])
         return None
 
 
@@ -932,7 +1306,7 @@ class Queue:
         """
 
         if all:
-            self._queue = []
+            self._reset()
             return
 
         if len(self) == 0:
@@ -949,17 +1323,11 @@ class Queue:
                 if id1 < first_id or id1 > last_id:
                     return
 
-                i = 0
-                for entry in self:
-                    if entry.id == id1:
-                        break
-                    else:
-                        i += 1
-
-                self._queue.__delitem__(i)
-                while i < len(self):
-                    self[i].id -= 1
-                    i += 1
+                i = self.id_pos(id1)
+                if i is None:
+                    return
+                self._delete(i, 1)
+                self._shift_ids(i, -1)
 
             case 2:
                 id1, id2 = int(ids[0]), int(ids[1])
@@ -972,23 +1340,12 @@ class Queue:
                 ):
                     return
 
-                id_dist = id2 - id1 + 1
-                i = 0
-                for entry in self:
-                    if entry.id == id1:
-                        break
-                    else:
-                        i += 1
-                
-                # dont get confused, I'm iterating for the num of entries to
-                # delete, but I'm always deleting the i-th entry as the stack
-                # moves along
-                for n in range(id_dist):
-                    self._queue.__delitem__(i)
-
-                while i < len(self):
-                    self[i].id -= id_dist
-                    i += 1
+                i = self.id_pos(id1)
+                if i is None:
+                    return
+                id_dist = min(id2 - id1 + 1, len(self) - i)
+                self._delete(i, id_dist)
+                self._shift_ids(i, -id_dist)
 
             case _:
                 return
@@ -1000,12 +1357,137 @@ class Queue:
         if len(self) <= 0:
             return BufferError('Queue empty!')
 
-        entry = self[0]
-        self._queue.__delitem__(0)
+        self._materialize(0)
+        entry = self._chunks[0].pop(0)
+        if len(self._chunks[0]) == 0:
+            self._drop_chunk(0)
+        self._len -= 1
+        self._starts = None
         return entry
 
 
+    def _reset(self) -> None:
+        """empties the queue; _chunks holds the entries, _deltas the pending
+        ID shift of every chunk relative to _base (the pending shift of the
+        whole queue), _starts caches the index of every chunk's first entry
+        """
+
+        self._chunks = []
+        self._deltas = []
+        self._base = 0
+        self._starts = None
+        self._len = 0
+
+
+    def _locate(self, i:int) -> tuple[int, int]:
+        """returns (chunk number, offset in chunk) of queue index i"""
+
+        first_len = len(self._chunks[0])
+        if i < first_len:
+            return 0, i
+
+        if self._starts is None:
+            starts = []
+            curr = 0
+            for chunk in self._chunks:
+                starts.append(curr)
+                curr += len(chunk)
+            self._starts = starts
+
+        c = bisect.bisect_right(self._starts, i) - 1
+        return c, i - self._starts[c]
+
+
+    def _materialize(self, c:int) -> None:
+        """writes the pending ID shift of chunk c to its entries"""
+
+        shift = self._base + self._deltas[c]
+        if shift != 0:
+            for entry in self._chunks[c]:
+                entry.id += shift
+        self._deltas[c] = -self._base
+
+
+    def _shift_ids(self, i:int, summand:int) -> None:
+        """shifts the IDs of all entries from index i to the end by summand,
+        entries in the first affected chunk are shifted right away, all other
+        chunks only get a pending shift
+        """
+
+        if i >= len(self) or summand == 0:
+            return
+
+        c, offs = self._locate(i)
+        self._materialize(c)
+        for entry in self._chunks[c][offs:]:
+            entry.id += summand
+        for n in range(c + 1, len(self._chunks)):
+            self._deltas[n] += summand
+
+
+    def _insert(self, i:int, entries:list) -> None:
+        """inserts entries (as they are) in front of queue index i"""
+
+        if len(entries) == 0:
+            return
+
+        size = self._chunk_size
+        if len(self._chunks) == 0 or i >= len(self):
+            # append: fill up the last chunk, then add new chunks
+            if len(self._chunks) == 0:
+                self._chunks.append([])
+                self._deltas.append(-self._base)
+            c = len(self._chunks) - 1
+            self._materialize(c)
+            space = max(0, size - len(self._chunks[c]))
+            self._chunks[c].extend(entries[:space])
+            new_chunks = [
+                entries[n : n+size] for n in range(space, len(entries), size)
+            ]
+            self._chunks.extend(new_chunks)
+            self._deltas.extend([-self._base] * len(new_chunks))
+
+        else:
+            c, offs = self._locate(i)
+            self._materialize(c)
+            chunk = self._chunks[c]
+            chunk[offs:offs] = entries
+            if len(chunk) > 2 * size:
+                # split oversized chunk, the new pieces carry no pending shift
+                pieces = [
+                    chunk[n : n+size] for n in range(0, len(chunk), size)
+                ]
+                self._chunks[c : c+1] = pieces
+                self._deltas[c : c+1] = [-self._base] * len(pieces)
+
+        self._len += len(entries)
+        self._starts = None
+
+
+    def _delete(self, i:int, num:int) -> None:
+        """deletes num entries starting at queue index i"""
+
+        while num > 0 and i < len(self):
+            c, offs = self._locate(i)
+            chunk = self._chunks[c]
+            cut = min(num, len(chunk) - offs)
+            del chunk[offs : offs+cut]
+            if len(chunk) == 0:
+                self._drop_chunk(c)
+            self._len -= cut
+            self._starts = None
+            num -= cut
+
+
+    def _drop_chunk(self, c:int) -> None:
+        """removes the (empty) chunk c"""
+
+        del self._chunks[c]
+        del self._deltas[c]
 
+
+
+@_slots_copy('Coor')
 class RoboTelemetry:
     """class used to store the standard 36 byte telemetry data comming from
     the robot
@@ -1020,8 +1502,18 @@ class RoboTelemetry:
 
     METHODS:
         __init__, __str__, __round__, __eq__
+
+        copy:
+            fast replacement for deepcopy
+        _replace:
+            returns a copy with the given attributes changed
+
+    telemetry objects are treated as read-only once received, so they can be
+    shared between threads as they are; use _replace to derive new ones
     """
 
+    __slots__ = ('t_speed', 'id', 'Coor')
+
 
     def __init__(self, t_speed=0.0, id=-1, Coor=None) -> None:
 
@@ -1086,6 +1578,7 @@ class RoboTelemetry:
 
 
 
+@_slots_copy()
 class PumpTelemetry:
     """class used to store the standard telemetry data the pump
 
@@ -1101,8 +1594,17 @@ class PumpTelemetry:
 
     METHODS:
         __init__, __str__, __round__, __eq__
+
+        copy:
+            fast replacement for deepcopy
+        _replace:
+            returns a copy with the given attributes changed
+
+    read-only once received, see RoboTelemetry
     """
 
+    __slots__ = ('freq', 'volt', 'amps', 'torq')
+
 
     def __init__(self, freq=0.0, volt=0.0, amps=0.0, torq=0.0) -> None:
 
@@ -1171,44 +1673,235 @@ class PumpTelemetry:
         return False
 
 
+class TimeSeries:
+    """ring buffer of timestamped values for one channel, e.g. a sensor or
+    the robot position; storage is allocated once, appending is O(1) and
+    overwrites the oldest entry once depth is reached; timestamps are
+    time.monotonic() seconds and never go backwards, older ones are moved
+    up to the newest one so windows can be found by bisection
+
+    ATTRIBUTES:
+        fields:
+            names of the values stored per entry, e.g. ('x', 'y', 'z')
+        depth:
+            number of entries kept
+
+    METHODS:
+        __init__, __len__
+
+        append:
+            adds one entry
+        extend:
+            adds several entries at once, e.g. a sensor backlog
+        last:
+            returns the newest entry
+        age:
+            seconds since the newest entry
+        is_stale:
+            checks if the newest entry is older than max_age
+        window:
+            returns the entries of the last seconds
+        stats:
+            returns min, max & mean of the last seconds
+    """
+
+    __slots__ = ('fields', '_cols', '_t', '_v', '_head', '_count')
+
+
+    def __init__(self, fields=('val',), depth=None) -> None:
+        depth = DEF_STT_HISTORY if depth is None else int(depth)
+        if depth < 1:
+            raise ValueError(f"depth has to be at least 1, not {depth}!")
+        self.fields = tuple(fields)
+        self._cols = {field: i for i, field in enumerate(self.fields)}
+        self._t = np.zeros(depth)
+        self._v = np.zeros((depth, len(self.fields)))
+        self._head = 0
+        self._count = 0
+
+
+    def __len__(self) -> int:
+        return self._count
+
+
+    @property
+    def depth(self) -> int:
+        return len(self._t)
+
+
+    def append(self, values, t:float | None = None) -> None:
+        """adds one entry, values as float or sequence in order of fields;
+        t defaults to now
+        """
+
+        t = time.monotonic() if t is None else t
+        head = self._head
+        if self._count and t < self._t[head - 1]:
+            t = self._t[head - 1]
+        self._t[head] = t
+        self._v[head] = values
+        self._head = (head + 1) % len(self._t)
+        if self._count < len(self._t):
+            self._count += 1
+
+
+    def extend(self, t, values) -> None:
+        """adds len(t) entries, values shaped (len(t),) or (len(t), fields)
+        """
+
+        t = np.asarray(t, dtype=float)
+        if not len(t):
+            return
+        values = np.asarray(values, dtype=float).reshape(len(t), -1)
+        depth = len(self._t)
+        if len(t) > depth:
+            t, values = t[-depth :], values[-depth :]
+        if self._count:
+            t = np.maximum.accumulate(
+                np.maximum(t, self._t[self._head - 1])
+            )
+        else:
+            t = np.maximum.accumulate(t)
+
+        # at most two slices, the second one wraps to the start
+        first = min(len(t), depth - self._head)
+        self._t[self._head : self._head + first] = t[: first]
+        self._v[self._head : self._head + first] = values[: first]
+        self._t[: len(t) - first] = t[first :]
+        self._v[: len(t) - first] = values[first :]
+        self._head = (self._head + len(t)) % depth
+        self._count = min(self._count + len(t), depth)
+
+
+    def last(self) -> tuple[float, np.ndarray] | None:
+        """returns (t, values) of the newest entry, None if empty"""
+
+        if not self._count:
+            return None
+        return float(self._t[self._head - 1]), self._v[self._head - 1].copy()
+
+
+    def age(self, now:float | None = None) -> float:
+        """seconds since the newest entry, inf if empty"""
+
+        if not self._count:
+            return float('inf')
+        now = time.monotonic() if now is None else now
+        return now - float(self._t[self._head - 1])
+
+
+    def is_stale(self, max_age:float, now:float | None = None) -> bool:
+        """checks if there is no entry younger than max_age seconds"""
+
+        return self.age(now) > max_age
+
+
+    def window(
+            self,
+            seconds:float,
+            field:str | None = None,
+            now:float | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """returns (t, values) of all entries younger than seconds, oldest
+        first; values of one field or all of them as (n, fields)
+        """
+
+        now = time.monotonic() if now is None else now
+        col = slice(None) if field is None else self._cols[field]
+        start = now - seconds
+        # the ring as (up to) two chronological segments
+        if self._count < len(self._t):
+            segments = [slice(0, self._count)]
+        else:
+            segments = [slice(self._head, None), slice(0, self._head)]
+
+        t_parts, v_parts = [], []
+        for seg in segments:
+            t_seg = self._t[seg]
+            first = int(np.searchsorted(t_seg, start))
+            t_parts.append(t_seg[first :])
+            v_parts.append(self._v[seg][first :, col])
+        return np.concatenate(t_parts), np.concatenate(v_parts)
+
+
+    def stats(
+            self,
+            seconds:float,
+            field:str | None = None,
+            now:float | None = None,
+    ) -> tuple | None:
+        """returns (min, max, mean) of the entries younger than seconds,
+        per field if field is None; None if there are none
+        """
+
+        _, values = self.window(seconds, field, now)
+        if not len(values):
+            return None
+        return values.min(axis=0), values.max(axis=0), values.mean(axis=0)
+
+
+
 class TSData:
     """simple descriptor for timestamped data, will take values but only
     return them if there less old than the valid_time, otherwise returns None.
+    values are kept per instance of the owner class, timestamps are integer
+    time.monotonic_ns(), so reading a value costs one clock read & one
+    integer comparison; the owner either provides _valid_ns (DaqBlock) or a
+    valid_time timedelta
     
     ATTRIBUTES:
         val:
-            the value itself
-        created_at:
-            creation or change time timestamp
-        valid_time:
-            user_defined time, the value remains valid
+            the value itself, if used as a value (e.g. TSData(1.2))
+        stamp:
+            time.monotonic_ns() of creation
+        name:
+            key of the (val, stamp) tuple in the owners __dict__
 
     METHODS:
-        __init__, __get__, __set__, __eq__, __ne__, __str__
+        __init__, __set_name__, __get__, __set__, __eq__, __ne__, __str__
+
+        read:
+            returns the value if younger than valid_ns, for bulk reads
     """
 
     def __init__(self, val=0.0) -> None:
         self.val = float(val)
-        self._created_at = datetime.now()
+        self.stamp = time.monotonic_ns()
+        self.name = None
+
+
+    def __set_name__(self, owner, name) -> None:
+        self.name = f"_ts_{name}"
 
 
     def __get__(self, instance, owner) -> float | None:
-        age = datetime.now() - self._created_at
-        if age < instance.valid_time:
-            return self.val
-        return None
+        if instance is None:
+            return self
+        valid_ns = getattr(instance, '_valid_ns', None)
+        if valid_ns is None:
+            valid_ns = instance.valid_time.total_seconds() * 1e9
+        return self.read(instance, time.monotonic_ns(), valid_ns)
     
 
     def __set__(self, instance, value) -> None:
-        self._created_at = datetime.now()
         if isinstance(value, TSData):
-            self.val = float(value.val)
+            value = float(value.val)
         elif isinstance(value, (float, int)):
-            self.val = float(value)
-        elif value is None:
-            self.val = None
-        else:
+            value = float(value)
+        elif value is not None:
             raise TypeError(f"new value can not be of type {type(value)}!")
+        instance.__dict__[self.name] = (value, time.monotonic_ns())
+
+
+    def read(self, instance, now_ns:int, valid_ns:float) -> float | None:
+        """returns the value stored for instance if it is younger than
+        valid_ns at now_ns, otherwise None
+        """
+
+        val, stamp = instance.__dict__.get(self.name, (self.val, self.stamp))
+        if now_ns - stamp < valid_ns:
+            return val
+        return None
     
     
     def __eq__(self, other):
@@ -1240,7 +1933,7 @@ class TSData:
 
 
     def __str__(self) -> str:
-        return f"{self.__get__(self, None)}"
+        return f"{self.val}"
 
 
 
@@ -1292,6 +1985,13 @@ class DaqBlock:
         phc_edist:
             PHC = print head controller; deposition layer distance behind
             the nozzle
+        series:
+            TimeSeries per channel, every datapoint received: sensors as
+            '<key>_<sub_key>' (e.g. 'amb_temp'), 'robo' & 'pump1'/'pump2'
+            with the fields of ROBO_FIELDS & PUMP_FIELDS; robot & pump
+            telemetry is recorded whenever Robo or Pump1/2 is set
+        depth:
+            entries kept per channel, DEF_STT_HISTORY if not given
 
     METHODS:
         __init__, __str__, __eq__,
@@ -1299,8 +1999,24 @@ class DaqBlock:
         store:
             Stores data according to key and sub_key, mutual exclusion needs to
             be called beforehand, as values are stored in global variables.
+        store_many:
+            store for several channels at once
+        store_backlog:
+            records every datapoint of several channels and stores the
+            newest one of each
+        record:
+            appends to the series of a channel
+        is_stale:
+            checks if a channel has not been updated for max_age seconds
+        snapshot:
+            returns all current values at once, for display & upload
     """
 
+    ROBO_FIELDS = (
+        'id', 't_speed', 'x', 'y', 'z', 'rx', 'ry', 'rz', 'q', 'ext'
+    )
+    PUMP_FIELDS = ('freq', 'volt', 'amps', 'torq')
+
     amb_temp = TSData()
     amb_humidity = TSData()
     rb_temp = TSData()
@@ -1315,6 +2031,12 @@ class DaqBlock:
     phc_aircon = TSData()
     phc_fdist = TSData()
     phc_edist = TSData()
+    TS_FIELDS = (
+        'amb_temp', 'amb_humidity', 'rb_temp', 'msp_temp', 'msp_press',
+        'asp_freq', 'asp_amps', 'imp_temp', 'imp_press', 'imp_freq',
+        'imp_amps', 'phc_aircon', 'phc_fdist', 'phc_edist',
+    )
+    _TS_KEYS = tuple(f"_ts_{name}" for name in TS_FIELDS)
     
     def __init__(
             self,
@@ -1335,6 +2057,7 @@ class DaqBlock:
             phc_aircon=0.0,
             phc_fdist=0.0,
             phc_edist=0.0,
+            depth=None,
     ) -> None:
         global DEF_STT_VALID_TIME
 
@@ -1353,11 +2076,14 @@ class DaqBlock:
         self.phc_fdist = TSData(phc_fdist)
         self.phc_edist = TSData(phc_edist)
         self.valid_time = DEF_STT_VALID_TIME
+        self.depth = DEF_STT_HISTORY if depth is None else depth
+        self.series = {}
 
-        # handle those beasty mutables
-        self.Robo = RoboTelemetry() if (Robo is None) else Robo
-        self.Pump1 = PumpTelemetry() if (Pump1 is None) else Pump1
-        self.Pump2 = PumpTelemetry() if (Pump2 is None) else Pump2
+        # handle those beasty mutables, not recorded as they were not
+        # received
+        self._Robo = RoboTelemetry() if (Robo is None) else Robo
+        self._Pump1 = PumpTelemetry() if (Pump1 is None) else Pump1
+        self._Pump2 = PumpTelemetry() if (Pump2 is None) else Pump2
 
 
     def __str__(self) -> str:
@@ -1459,7 +2185,7 @@ class DaqBlock:
         """
 
         val, val_age = data
-        if val_age > self.valid_time.seconds: 
+        if val_age > self._valid_s: 
             return
         err =  KeyError(f"no storage reserved for {sub_key} in {key}!")
         match key:
@@ -1502,7 +2228,144 @@ class DaqBlock:
             
         return None
     
-    
+
+    def store_many(self, entries:list[tuple[tuple, str, str]]) -> None:
+        """stores the data of several channels at once, e.g. everything one
+        sensor cycle returned, so the mutex only needs to be taken once
+
+        accepts:
+            entries:
+                list of (data, key, sub_key) as taken by store
+        """
+
+        for data, key, sub_key in entries:
+            self.store(data, key, sub_key)
+
+
+
+    def store_backlog(
+            self,
+            entries:list[tuple[list, str, str]],
+            received:float,
+    ) -> None:
+        """records all datapoints a sensor sent since the last request, the
+        newest one is stored as the current value; mutual exclusion needs to
+        be called beforehand, see store
+
+        accepts:
+            entries:
+                list of (points, key, sub_key), points being a list of
+                (value, age) as returned by fu.sensor_decode
+            received:
+                time.monotonic() when the answer arrived, timestamps are
+                received - age
+        """
+
+        for points, key, sub_key in entries:
+            Series = self._series(f"{key}_{sub_key}", ('val',))
+            vals, ages = zip(*points)
+            Series.extend(received - np.asarray(ages, dtype=float), vals)
+            self.store(min(points, key=lambda point: point[1]), key, sub_key)
+
+
+    def record(
+            self,
+            channel:str,
+            values,
+            t:float | None = None,
+            fields=('val',),
+    ) -> None:
+        """appends values to the series of channel, creates it with fields
+        if needed; t defaults to now
+        """
+
+        self._series(channel, fields).append(values, t)
+
+
+    def is_stale(self, channel:str, max_age:float | None = None) -> bool:
+        """checks if channel got no data for max_age seconds (valid_time if
+        not given), also if it never got any
+        """
+
+        Series = self.series.get(channel)
+        if Series is None:
+            return True
+        if max_age is None:
+            max_age = self._valid_s
+        return Series.is_stale(max_age)
+
+
+    def _series(self, channel:str, fields:tuple) -> TimeSeries:
+        Series = self.series.get(channel)
+        if Series is None:
+            Series = self.series[channel] = TimeSeries(fields, self.depth)
+        return Series
+
+
+    @property
+    def Robo(self) -> RoboTelemetry:
+        return self._Robo
+
+
+    @Robo.setter
+    def Robo(self, Telem:RoboTelemetry) -> None:
+        self._Robo = Telem
+        Coor = Telem.Coor
+        self._series('robo', self.ROBO_FIELDS).append((
+            Telem.id, Telem.t_speed, Coor.x, Coor.y, Coor.z,
+            Coor.rx, Coor.ry, Coor.rz, Coor.q, Coor.ext,
+        ))
+
+
+    @property
+    def Pump1(self) -> PumpTelemetry:
+        return self._Pump1
+
+
+    @Pump1.setter
+    def Pump1(self, Telem:PumpTelemetry) -> None:
+        self._Pump1 = Telem
+        self._record_pump('pump1', Telem)
+
+
+    @property
+    def Pump2(self) -> PumpTelemetry:
+        return self._Pump2
+
+
+    @Pump2.setter
+    def Pump2(self, Telem:PumpTelemetry) -> None:
+        self._Pump2 = Telem
+        self._record_pump('pump2', Telem)
+
+
+    def _record_pump(self, channel:str, Telem:PumpTelemetry) -> None:
+        self._series(channel, self.PUMP_FIELDS).append(
+            (Telem.freq, Telem.volt, Telem.amps, Telem.torq)
+        )
+
+
+    def snapshot(self) -> dict:
+        """returns every TSData value (None if no longer valid) by name and
+        the current Robo, Pump1 & Pump2 telemetry in one call, with one
+        clock read for all of them; telemetry is read-only, see
+        RoboTelemetry, so nothing is copied
+        """
+
+        now_ns = time.monotonic_ns()
+        valid_ns = self._valid_ns
+        # straight from the storage of TSData, all of them are set in init
+        stored = map(self.__dict__.__getitem__, self._TS_KEYS)
+        snap = {
+            name: val if now_ns - stamp < valid_ns else None
+            for name, (val, stamp) in zip(self.TS_FIELDS, stored)
+        }
+        snap['Robo'] = self._Robo
+        snap['Pump1'] = self._Pump1
+        snap['Pump2'] = self._Pump2
+        return snap
+
+
     @property
     def valid_time(self):
         return self._valid_time
@@ -1510,9 +2373,11 @@ class DaqBlock:
     
     @valid_time.setter
     def valid_time(self, new_valid_time):
-        # convert to int
+        # convert to int, kept as integers for the checks in TSData & store
         new_valid_time = int(round(new_valid_time, 0))
         self._valid_time = timedelta(seconds=new_valid_time) 
+        self._valid_s = new_valid_time
+        self._valid_ns = new_valid_time * 1_000_000_000
 
 
 
@@ -1533,6 +2398,9 @@ class TCPIP:
             data block length to read
         w_bl:
             data block length to write
+        last_skipped:
+            number of complete, but outdated data blocks dropped during the
+            last receive
 
     METHODS:
         __init__, __str__
@@ -1548,6 +2416,9 @@ class TCPIP:
             close TCP/IP connection
     """
 
+    # receive buffer size in data blocks
+    _r_buff_blocks = 64
+
 
     def __init__(
             self,
@@ -1567,7 +2438,10 @@ class TCPIP:
         self.w_bl = int(w_bl)
 
         self.connected = False
+        self.last_skipped = 0
         self._Socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._r_buff = bytearray()
+        self._r_fill = 0
 
 
     def __str__(self) -> str:
@@ -1637,15 +2511,8 @@ class TCPIP:
     def receive(self) -> tuple[bool, bytes | Exception]:
         """receive according to class attributes"""
 
-        data = ''
-
         try:
-            while len(data) < self.r_bl:
-                data = self._Socket.recv(self.r_bl)
-
-            if len(data) != self.r_bl:
-                raise ValueError('wrong server answer length')
-
+            data = self._recv_block()
         except Exception as err:
             return False, err
 
@@ -1658,10 +2525,66 @@ class TCPIP:
 
         self._Socket.close()
         self.connected = False
+        self._r_fill = 0
         if not end:
             self._Socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
 
 
+    def _recv_block(self) -> bytes:
+        """reads from the socket until at least one complete block of r_bl
+        bytes is buffered, then takes whatever else is already waiting
+        (without blocking); returns the newest complete block, the number of
+        older blocks dropped is stored in last_skipped and an incomplete rest
+        stays in the buffer for the next call
+        """
+
+        bl = self.r_bl
+        if bl <= 0:
+            return b''
+        if len(self._r_buff) < bl * self._r_buff_blocks:
+            self._r_buff = bytearray(bl * self._r_buff_blocks)
+            self._r_fill = 0
+
+        buff = self._r_buff
+        view = memoryview(buff)
+        skipped = 0
+
+        try:
+            while True:
+                if self._r_fill == len(buff):
+                    # full, keep only the newest complete block & the rest
+                    keep = (self._r_fill // bl - 1) * bl
+                    rest = bytes(view[keep : self._r_fill])
+                    buff[: len(rest)] = rest
+                    self._r_fill = len(rest)
+                    skipped += keep // bl
+
+                if self._r_fill >= bl:
+                    ready, _, _ = select.select([self._Socket], [], [], 0)
+                    if not ready:
+                        break
+
+                num = self._Socket.recv_into(view[self._r_fill :])
+                if num == 0:
+                    if self._r_fill >= bl:
+                        break
+                    raise ConnectionError('connection closed by server')
+                self._r_fill += num
+
+            blocks = self._r_fill // bl
+            end = blocks * bl
+            data = bytes(view[end - bl : end])
+            rest = self._r_fill - end
+            buff[:rest] = bytes(view[end : self._r_fill])
+            self._r_fill = rest
+
+        finally:
+            view.release()
+
+        self.last_skipped = skipped + blocks - 1
+        return data
+
+
 
 class RobConnection(TCPIP):
     """sets robot specific send/receive operations, inherits from TCPIP class,
@@ -1674,73 +2597,37 @@ class RobConnection(TCPIP):
         send:
             sends a QEntry object to server, packing according to robots
             protocol
+        send_many:
+            sends a list of QEntry objects as one contiguous block
         receive:
             receives and unpacks data from robot, returns it as RobTelemetry
             object
     """
 
 
+    def __init__(self, *args, **kwargs) -> None:
+
+        super().__init__(*args, **kwargs)
+        # reused for every command, saves allocating a new bytes object
+        self._w_buff = bytearray(rc.COMMAND_SIZE)
+        self._w_many_buff = bytearray()
+
+
     def send(self, entry) -> tuple[bool, int | Exception]:
         """sends QEntry object to robot, packing according to robots protocol
         """
 
-        message = []
+        message = self._w_buff
 
         try:
             if not self.connected:
                 raise ConnectionError
             if not isinstance(entry, QEntry):
                 raise ValueError(f"{entry} is not an instance of 'QEntry'!")
-
-            message = struct.pack(
-                '<iccffffffffffffffffiiiiiciiiiiiiiiiiiiii',
-                entry.id,
-                bytes(entry.mt, 'utf-8'),
-                bytes(entry.pt, 'utf-8'),
-                entry.Coor1.x,
-                entry.Coor1.y,
-                entry.Coor1.z,
-                entry.Coor1.rx,
-                entry.Coor1.ry,
-                entry.Coor1.rz,
-                entry.Coor1.q,
-                entry.Coor1.ext,
-                entry.Coor2.x,
-                entry.Coor2.y,
-                entry.Coor2.z,
-                entry.Coor2.rx,
-                entry.Coor2.ry,
-                entry.Coor2.rz,
-                entry.Coor2.q,
-                entry.Coor2.ext,
-                entry.Speed.acr,
-                entry.Speed.dcr,
-                entry.Speed.ts,
-                entry.Speed.ors,
-                entry.sbt,
-                bytes(entry.sc, 'utf-8'),
-                entry.z,
-                0, # ID int, always 0
-                entry.Tool.trolley_steps,
-                0,
-                # byte for cutter position, but simply coupled to cutting here 
-                # as no other usage makes sense
-                entry.Tool.cut,
-                0,
-                entry.Tool.load_spring,
-                0,
-                entry.Tool.cut,
-                0,
-                entry.Tool.place_spring,
-                0,
-                entry.Tool.clamp,
-                0,
-                entry.Tool.wait,
-            )
-
             if len(message) != self.w_bl:
                 raise ValueError('wrong message length')
 
+            rc.pack_command_into(message, 0, entry)
             self._Socket.sendall(message)
 
         except Exception as err:
@@ -1750,31 +2637,81 @@ class RobConnection(TCPIP):
         return True, len(message)
 
 
+    def send_many(self, entries:list) -> tuple[int, Exception | None]:
+        """packs all entries into one buffer and writes it to the robot in a
+        single go, returns the number of entries completely send and the
+        error that stopped the transfer (None if all went through); entries
+        that can not be packed end the block, everything before them is
+        still send; if an entry was only partly written, the connection is
+        closed, as the robot would read the next entry out of step
+        """
+
+        num = 0
+        err = None
+        size = len(entries) * rc.COMMAND_SIZE
+        if len(self._w_many_buff) < size:
+            self._w_many_buff = bytearray(size)
+        buffer = self._w_many_buff
+
+        try:
+            if not self.connected:
+                raise ConnectionError
+            if rc.COMMAND_SIZE != self.w_bl:
+                raise ValueError('wrong message length')
+            for entry in entries:
+                if not isinstance(entry, QEntry):
+                    raise ValueError(
+                        f"{entry} is not an instance of 'QEntry'!"
+                    )
+                rc.pack_command_into(buffer, num * rc.COMMAND_SIZE, entry)
+                num += 1
+        except Exception as err_pack:
+            err = err_pack
+
+        # count the bytes written to know which entry failed if the
+        # connection breaks halfway
+        view = memoryview(buffer)[: num * rc.COMMAND_SIZE]
+        written = 0
+        try:
+            while written < len(view):
+                written += self._Socket.send(view[written:])
+        except Exception as err_send:
+            err = err_send
+            num = written // rc.COMMAND_SIZE
+            # the robot got part of a command, the stream is out of step
+            if written % rc.COMMAND_SIZE != 0:
+                err = ConnectionError(
+                    f"command {num + 1} partly written, "
+                    f"connection closed: {err_send}"
+                )
+        finally:
+            view.release()
+        if written % rc.COMMAND_SIZE != 0:
+            self.close()
+
+        print(f"SEND:    {num} of {len(entries)} commands, length: {written}")
+        return num, err
+
+
     def receive(self) -> tuple[RoboTelemetry | Exception, bytes]:
-        """receives and unpacks data from robot"""
+        """receives and unpacks the newest telemetry block from robot, see
+        last_skipped for the number of outdated blocks dropped
+        """
 
         data = b''
-        Telem = RoboTelemetry()
 
         try:
-            while len(data) < self.r_bl:
-                data = self._Socket.recv(self.r_bl)
-
-            if len(data) != self.r_bl:
-                raise ValueError
+            data = self._recv_block()
+            if len(data) != rc.TELEMETRY_SIZE:
+                raise ValueError('wrong server answer length')
 
         except Exception as err:
             return err, data
 
-        Telem.t_speed = struct.unpack('<f', data[0:4])[0]
-        Telem.id = struct.unpack('<i', data[4:8])[0]
-        Telem.Coor.x = struct.unpack('<f', data[8:12])[0]
-        Telem.Coor.y = struct.unpack('<f', data[12:16])[0]
-        Telem.Coor.z = struct.unpack('<f', data[16:20])[0]
-        Telem.Coor.rx = struct.unpack('<f', data[20:24])[0]
-        Telem.Coor.ry = struct.unpack('<f', data[24:28])[0]
-        Telem.Coor.rz = struct.unpack('<f', data[28:32])[0]
-        Telem.Coor.ext = struct.unpack('<f', data[32:36])[0]
+        t_speed, id, x, y, z, rx, ry, rz, ext = rc.unpack_telemetry(data)
+        Telem = RoboTelemetry(
+            t_speed, id, Coordinate(x, y, z, rx, ry, rz, 0.0, ext)
+        )
         return Telem, data
 
 
@@ -1787,6 +2724,7 @@ class RobConnection(TCPIP):
 # only if you know what your doing!)
 
 # MTEC P20 DEFAULT SETTINGS
+DEF_PUMP_BUS_BUDGET = 0.2 # [s] bus time per 250 ms cycle
 DEF_PUMP_CHK_RANGE = (-100.0, 100.0)
 DEF_PUMP_CLASS1 = 75.0
 DEF_PUMP_CLASS2 = 50.0
@@ -1833,6 +2771,13 @@ DEF_DC_ZERO = Coordinate(
 )
 DEF_ICQ_MAX_LINES = 200
 DEF_IO_FR_TO_TS = 0.1
+DEF_IO_JOB_FILES = False # keep compiled .pjob files beside loaded files
+DEF_IO_LOAD_PROCESSES = 1 # >1: large GCode files are converted in parallel
+DEF_IO_PARALLEL_ROWS = 100000 # min. rows for a parallel conversion
+DEF_IO_STREAM_BATCH = 500 # entries added to SCQueue at once when streaming
+DEF_IO_STREAM_LOAD = False # stream files into SCQueue while converting
+DEF_IO_STREAM_QUEUE_MAX = 10000 # streaming waits while SCQueue is this long
+DEF_IO_STREAM_TIMEOUT = 600.0 # [s] streaming stops if SCQueue stays full
 DEF_IO_ZONE = 10 # [mm]
 DEF_PRH_CLAMP = False
 DEF_PRH_CUT = False
@@ -1843,6 +2788,7 @@ DEF_PRIN_SPEED = SpeedVector()
 DEF_SC_EXT_TRAIL = (5, 2) # [mm]
 DEF_SC_MAX_LINES = 400
 DEF_SC_VOL_PER_M = 0.4  # [L/m] calculated for 1m of 4cm x 1cm high filament
+DEF_STT_HISTORY = 3600 # datapoints kept per sensor channel
 DEF_STT_VALID_TIME = 60 # [seconds]
 DEF_TERM_MAX_LINES = 300
 DEF_TOOL_TROL_RATIO = 500
@@ -1864,6 +2810,13 @@ CTRL_min_target_dist = 1 # [mm]
 CTRL_max_r_speed = 50.0
 IO_curr_filepath = None
 IO_fr_to_ts = DEF_IO_FR_TO_TS
+IO_job_files = DEF_IO_JOB_FILES
+IO_load_processes = DEF_IO_LOAD_PROCESSES
+IO_parallel_rows = DEF_IO_PARALLEL_ROWS
+IO_stream_batch = DEF_IO_STREAM_BATCH
+IO_stream_load = DEF_IO_STREAM_LOAD
+IO_stream_queue_max = DEF_IO_STREAM_QUEUE_MAX
+IO_stream_timeout = DEF_IO_STREAM_TIMEOUT
 IO_zone = DEF_IO_ZONE
 LOG_safe_path = Path()
 PRINSpeed = dcpy(DEF_PRIN_SPEED)
@@ -1900,6 +2853,7 @@ PRH_url = '192.168.178.58:17'
 PMP_output_ratio = DEF_PUMP_OUTP_RATIO
 PMP_port = DEF_PUMP_SERIAL['port']
 PMP_retract_speed = DEF_PUMP_RETR_SPEED
+PMP_bus_load = 0.0  # share of time the pump bus is busy
 PMPSerialDefBus = None  # is created after user input in win_mainframe
 PMP_speed = 0
 PMP_look_ahead = False
@@ -1913,7 +2867,7 @@ PMP1_modbus_id = '01'
 PMP1_speed = 0
 PMP1_user_speed = DEF_PUMP_NO_USER_SPEED
 PMP1LastTelem = PumpTelemetry()
-PMP1Serial = MtecMod(None, PMP1_modbus_id)
+PMP1Serial = MtecMod(None, PMP1_modbus_id, PumpTelemetry)
 PMP2_liter_per_s = DEF_PUMP_LPS
 PMP2_live_ad = 1.0
 PMP2_modbus_id = '02'
@@ -1921,7 +2875,12 @@ PMP2_speed = 0
 PMP2_user_speed = DEF_PUMP_NO_USER_SPEED
 
 PMP2LastTelem = PumpTelemetry()
-PMP2Serial = MtecMod(None, PMP2_modbus_id)
+PMP2Serial = MtecMod(None, PMP2_modbus_id, PumpTelemetry)
+PMPScheduler = MtecScheduler(
+    budget=DEF_PUMP_BUS_BUDGET,
+    baud=DEF_PUMP_SERIAL['baud'],
+    stop_bits=DEF_PUMP_SERIAL['stop'],
+)
 
 # ROBOT SETTINGS
 ROB_comm_fr = DEF_ROB_COMM_FR
@@ -1944,6 +2903,10 @@ ROBTcp = RobConnection(
 
 # SENSOR ARRAY SETTINGS
 SEN_timeout = 0.5
+SEN_max_workers = 8 # access points polled at the same time
+SEN_breaker_threshold = 3 # failed polls before an AP is left out
+SEN_backoff = 2.0 # first time to leave it out for [s], doubles each retry
+SEN_max_backoff = 60.0
 SEN_dict = { # add available datasources here
     'amb': { # AMBient
         'ip': '192.168.178.36:17',
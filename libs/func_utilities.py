@@ -14,7 +14,7 @@ import sys
 import serial
 import math as m
 import requests
-from copy import deepcopy as dcpy
+import numpy as np
 
 from pathlib import Path
 from datetime import datetime
@@ -28,6 +28,19 @@ sys.path.append(parent_dir)
 import libs.data_utilities as du
 
 
+#############################     PATTERNS      ##############################
+
+# sensor wire format: one 'T<val>/U<age>;' per backlog entry (the letter is
+# the quantity, T for temperature), channels of a '/batch' answer start with
+# '<name>:' and end with '&'; matched in place with finditer & pos/endpos,
+# so the answer is neither sliced nor searched twice
+SEN_ENTRY = re.compile(r'[A-Z](-?\d+(?:\.\d*)?)/U(\d+);')
+SEN_BATCH = re.compile(r'(\w+):|[A-Z](-?\d+(?:\.\d*)?)/U(\d+);|&')
+# some firmware versions end the answer with a line break or NUL, a single
+# channel answer may also end with '&'; both are ignored
+SEN_TRAILING = ' \t\r\n\x00'
+
+
 ###########################     FUNCTIONS      ###############################
 
 def domain_clip(x:float, min_val:float, max_val:float) -> float:
@@ -51,7 +64,8 @@ def range_check(target_entry:du.QEntry) -> tuple[bool, str]:
 
     target = target_entry.Coor1
     names = target.attr_names
-    RangeMin, RangeMax = dcpy(du.RC_area)
+    # only read, no need for a copy
+    RangeMin, RangeMax = du.RC_area
     # axis RX points downwards at 180° or -180° (same effect)
     # to avoid confusion, range_check is defined as 150° - 210°
     # but since -150° is the same as 210°, I adjusted the check to
@@ -91,6 +105,247 @@ def base_dist_check(target_entry:du.QEntry) -> tuple[bool, str]:
     return True, ''
 
 
+def range_check_all(Coors:du.CoordinateArray) -> tuple[np.ndarray, str]:
+    """range_check for a whole job at once, e.g. for
+    CoordinateArray.from_queue; returns the indices of all targets out of
+    range and a summary counting the violations per axis ('' if there are
+    none); negative RX are checked as RX + 360° like in range_check, but
+    Coors is not changed
+    """
+
+    data = Coors.data
+    RangeMin, RangeMax = du.RC_area
+    low = np.array(tuple(RangeMin), dtype=np.float64)
+    high = np.array(tuple(RangeMax), dtype=np.float64)
+
+    inside = (low <= data) & (data <= high)
+    rx = data[:, 3]
+    rx = np.where(rx < 0.0, rx + 360.0, rx)
+    inside[:, 3] = (low[3] <= rx) & (rx <= high[3])
+
+    failed = np.flatnonzero(~inside.all(axis=1))
+    if not len(failed):
+        return failed, ''
+    axes = ', '.join(
+        f"{name.upper()}: {count}"
+        for name, count in zip(
+            Coors.attr_names, (~inside).sum(axis=0).tolist()
+        )
+        if count
+    )
+    msg = f"{len(failed)} of {len(data)} targets out of range ({axes})"
+    return failed, msg
+
+
+def base_dist_check_all(
+        Coors:du.CoordinateArray
+) -> tuple[np.ndarray, str]:
+    """base_dist_check for a whole job at once, see range_check_all;
+    returns the indices of all unreachable targets and a summary with the
+    largest distance found ('' if there are none)
+    """
+
+    x_dist = Coors.x - Coors.ext
+    y_dist = du.RC_y_base_pos - Coors.y
+    dist = np.sqrt(np.square(x_dist) + np.square(y_dist))
+
+    failed = np.flatnonzero(~(dist <= du.RC_max_base_dist))
+    if not len(failed):
+        return failed, ''
+    msg = (
+        f"{len(failed)} of {len(dist)} targets beyond base distance "
+        f"(up to {round(float(np.fmax.reduce(dist[failed])), 2)}mm > "
+        f"{du.RC_max_base_dist}mm)"
+    )
+    return failed, msg
+
+
+def _path_samples(
+        Coors:du.CoordinateArray,
+        Vias:du.CoordinateArray,
+        circular:np.ndarray,
+        rows:np.ndarray,
+        samples:int,
+) -> list[tuple[np.ndarray, ...]]:
+    """samples the paths leading to the given rows of Coors, see
+    path_range_check_all; returns linear paths & arcs as separate groups
+    of (points, ext_lo, ext_hi, margin, rows): x, y & z of the samples of
+    every path as (3, paths, samples) array, the EXT interval of the path,
+    how far it may get beyond its samples and the row it leads to; linear
+    paths are given by both ends, which is exact as all checked areas are
+    convex
+    """
+
+    data = Coors.data
+    start = data[rows - 1]
+    end = data[rows]
+    ext_lo = np.minimum(start[:, 7], end[:, 7])
+    ext_hi = np.maximum(start[:, 7], end[:, 7])
+
+    # circle through start, via & end; collinear ones stay linear
+    arcs = np.flatnonzero(circular[rows])
+    P0 = start[arcs, :3]
+    Via = Vias.data[rows[arcs]]
+    a = Via[:, :3] - P0
+    b = end[arcs, :3] - P0
+    normal = np.cross(a, b)
+    nn = np.einsum('ij,ij->i', normal, normal)
+    aa = np.einsum('ij,ij->i', a, a)
+    bb = np.einsum('ij,ij->i', b, b)
+    valid = nn > 1e-12 * aa * bb
+    arcs, P0, Via, a, b, normal, nn, aa, bb = (
+        arr[valid] for arr in (arcs, P0, Via, a, b, normal, nn, aa, bb)
+    )
+
+    linear = np.ones(len(rows), dtype=bool)
+    linear[arcs] = False
+    groups = [(
+        np.stack((start[linear, :3].T, end[linear, :3].T), axis=2),
+        ext_lo[linear],
+        ext_hi[linear],
+        np.zeros(np.count_nonzero(linear)),
+        rows[linear],
+    )]
+    if not len(arcs):
+        return groups
+
+    center = (
+        aa[:, None] * np.cross(b, normal)
+        + bb[:, None] * np.cross(normal, a)
+    ) / (2.0 * nn[:, None])
+    radius = np.sqrt(np.einsum('ij,ij->i', center, center))
+    u = -center / radius[:, None]
+    w = normal / np.sqrt(nn)[:, None]
+    v = np.cross(w, u)
+
+    # start, via & end are counter-clockwise around the normal, so the arc
+    # runs from angle 0 to the angle of the end point
+    rel = b - center
+    angle = np.arctan2(
+        np.einsum('ij,ij->i', rel, v), np.einsum('ij,ij->i', rel, u)
+    ) % (2.0 * m.pi)
+    t = angle[:, None] * np.linspace(0.0, 1.0, samples + 1)[None, :]
+    cos = np.cos(t)
+    sin = np.sin(t)
+    center += P0
+    u *= radius[:, None]
+    v *= radius[:, None]
+    points = np.empty((3,) + t.shape)
+    for i in range(3):
+        points[i] = (
+            center[:, i, None] + u[:, i, None] * cos + v[:, i, None] * sin
+        )
+
+    # between two samples the arc is at most its sagitta away from their
+    # chord; anything checked is convex, so max over the chord is the max
+    # over its ends
+    groups.append((
+        points,
+        np.minimum(ext_lo[arcs], Via[:, 7]),
+        np.maximum(ext_hi[arcs], Via[:, 7]),
+        radius * (1.0 - np.cos(angle / (2.0 * samples))),
+        rows[arcs],
+    ))
+    return groups
+
+
+def _path_rows(Coors:du.CoordinateArray, rows) -> np.ndarray:
+    """rows with a path leading to them, all but the first by default"""
+
+    if rows is None:
+        return np.arange(1, len(Coors))
+    rows = np.asarray(rows, dtype=np.int64)
+    return rows[rows > 0]
+
+
+def path_range_check_all(
+        Coors:du.CoordinateArray,
+        Vias:du.CoordinateArray,
+        circular:np.ndarray,
+        rows=None,
+        samples=32,
+) -> tuple[np.ndarray, str]:
+    """range check for the paths between consecutive targets, not just
+    the targets; the path to row i starts at row i-1 and is linear, or an
+    arc through the same row of Vias where circular is set (QEntry.Coor2
+    of MoveC); EXT is taken to move independently of the TCP, so it can
+    be anywhere between its values at start, via & end; arcs are checked
+    at samples + 1 points, allowing for the deviation of the arc between
+    them, so no path leaving the range is missed; rows limits the check
+    to the paths leading to these rows; returns the rows whose path leaves
+    the range & a summary like range_check_all, orientations are checked
+    at the targets only
+    """
+
+    rows = _path_rows(Coors, rows)
+    RangeMin, RangeMax = du.RC_area
+    low = np.array(tuple(RangeMin), dtype=np.float64)
+    high = np.array(tuple(RangeMax), dtype=np.float64)
+
+    outside = np.zeros((len(Coors), 4), dtype=bool)
+    for points, ext_lo, ext_hi, margin, owner in _path_samples(
+            Coors, Vias, np.asarray(circular, dtype=bool), rows, samples
+    ):
+        path_min = points.min(axis=2).T - margin[:, None]
+        path_max = points.max(axis=2).T + margin[:, None]
+        outside[owner, :3] = ~(
+            (low[:3] <= path_min) & (path_max <= high[:3])
+        )
+        outside[owner, 3] = ~((low[7] <= ext_lo) & (ext_hi <= high[7]))
+
+    failed = np.flatnonzero(outside.any(axis=1))
+    if not len(failed):
+        return failed, ''
+    axes = ', '.join(
+        f"{name}: {count}"
+        for name, count in zip(
+            ['X', 'Y', 'Z', 'EXT'], outside.sum(axis=0).tolist()
+        )
+        if count
+    )
+    msg = f"{len(failed)} of {len(rows)} paths leave the range ({axes})"
+    return failed, msg
+
+
+def path_base_dist_check_all(
+        Coors:du.CoordinateArray,
+        Vias:du.CoordinateArray,
+        circular:np.ndarray,
+        rows=None,
+        samples=32,
+) -> tuple[np.ndarray, str]:
+    """base distance check for the paths between consecutive targets, see
+    path_range_check_all; with EXT moving independently, the largest
+    distance of a sample is found at one of the ends of its EXT interval;
+    returns the rows whose path gets beyond the base distance & a summary
+    like base_dist_check_all
+    """
+
+    rows = _path_rows(Coors, rows)
+    dist = np.zeros(len(Coors))
+    for points, ext_lo, ext_hi, margin, owner in _path_samples(
+            Coors, Vias, np.asarray(circular, dtype=bool), rows, samples
+    ):
+        x = points[0]
+        x_dist = np.maximum(
+            np.abs(x - ext_lo[:, None]), np.abs(x - ext_hi[:, None])
+        )
+        y_dist = du.RC_y_base_pos - points[1]
+        dist[owner] = margin + np.sqrt(
+            np.square(x_dist) + np.square(y_dist)
+        ).max(axis=1)
+
+    failed = np.flatnonzero(~(dist <= du.RC_max_base_dist))
+    if not len(failed):
+        return failed, ''
+    msg = (
+        f"{len(failed)} of {len(rows)} paths beyond base distance "
+        f"(up to {round(float(np.fmax.reduce(dist[failed])), 2)}mm > "
+        f"{du.RC_max_base_dist}mm)"
+    )
+    return failed, msg
+
+
 def pre_check_gcode_file(
         txt:str
 ) -> (
@@ -306,10 +561,10 @@ def gcode_to_qentry(
     accepts:
         mut_pos: 
             postion immediately prior to planned command execution,
-            is deepcopied inside function to avoid mutuable behavior
+            is copied inside function to avoid mutuable behavior
         mut_speed:
             speed to be used in this movement,
-            is deepcopied inside function to avoid mutuable behavior
+            is copied inside function to avoid mutuable behavior
         zone:
             RAPID-like accuracy zone for the movement
         txt: 
@@ -318,15 +573,15 @@ def gcode_to_qentry(
             toggle for external trailing (fllwBhvr), True to turn on
     """
 
+    if not isinstance(mut_pos, du.Coordinate):
+        raise ValueError(f"{mut_pos} is not an instance of Coordinate!")
+    if not isinstance(mut_speed, du.SpeedVector):
+        raise ValueError(f"{mut_speed} is not an instance of SpeedVector!")
+
     # handle mutuables here
-    pos = dcpy(mut_pos)
-    speed = dcpy(mut_speed)
-    zero = dcpy(du.DCCurrZero)
-
-    if not isinstance(pos, du.Coordinate):
-        raise ValueError(f"{pos} is not an instance of Coordinate!")
-    if not isinstance(speed, du.SpeedVector):
-        raise ValueError(f"{speed} is not an instance of SpeedVector!")
+    pos = mut_pos.copy()
+    speed = mut_speed.copy()
+    zero = du.DCCurrZero.copy()
     
     command = re_short([r'G\d+', '^;'], txt, None)
     if command is None:
@@ -609,7 +864,8 @@ def calc_pump_ratio(p1_speed:int, p2_speed:int) -> tuple[float, float]:
 def sensor_req(
         ip:str,
         key:str,
-        raise_dl_flag=False
+        raise_dl_flag=False,
+        session:requests.Session | None = None,
     ) -> (
         list
         | None
@@ -625,43 +881,91 @@ def sensor_req(
             kind of data to retrieve
         raise_dl_flag:
             check if data was lost, if so raise a flag (not supported yet)
+        session:
+            keep-alive session to send the request with, if given
     """
 
+    get = requests.get if session is None else session.get
     try:
-        ans = requests.get(f"http://{ip}/{key}", timeout=du.SEN_timeout)
+        ans = get(f"http://{ip}/{key}", timeout=du.SEN_timeout)
         ans.raise_for_status()
     except Exception as err:
         return ValueError(f"request failed: {err}!")
 
-    ans_str = ans.text
+    return sensor_decode(ans.text, raise_dl_flag)
+
+
+def sensor_decode(
+        ans_str:str,
+        raise_dl_flag=False
+    ) -> (
+        list
+        | None
+        | Exception
+    ):
+    """decodes the answer of a sensor in one pass, returns None if there is
+    no new data, ValueError if it can not be read, otherwise a list of
+    (val, age) for every backlog entry, oldest first; age is the number of
+    seconds the entry is older than the answer
+    """
+
     if 'no data available' in ans_str:
         return None
     
     data_loss_pos = ans_str.find('&')
-    entry_pos = ans_str.find(';')
-    if (data_loss_pos <= -1 or entry_pos <= -1):
+    if data_loss_pos <= -1:
         return ValueError(f"no readable data retrieved: {ans_str}!")
 
     if raise_dl_flag:
-        data_loss = ans_str[: data_loss_pos-1]
-        if data_loss.find('true') == -1:
+        if not ans_str.startswith('DL=true'):
             #to-do: build a flag for data loss
             pass
 
     val = []
-    remain_str = ans_str[data_loss_pos+1 :]
-    entry_pos -= data_loss_pos+1
-
-    while entry_pos != -1:
-        next_entry = remain_str[: entry_pos]
-        data = next_entry.split('/')
-        datapoint = (float(data[0][1 :]), int(data[1][1 :])) #(val, uptime)
-        try:
-            val.append(datapoint)
-        except:
+    pos = data_loss_pos + 1
+    end = len(ans_str.rstrip(SEN_TRAILING + '&'))
+    for entry in SEN_ENTRY.finditer(ans_str, pos, end):
+        if entry.start() != pos:
             break
-
-        remain_str = remain_str[entry_pos+1 :]
-        entry_pos = remain_str.find(';')
+        val.append((float(entry[1]), int(entry[2]))) #(val, age)
+        pos = entry.end()
+    if not val or pos != end:
+        return ValueError(f"no readable data retrieved: {ans_str}!")
 
     return val
+
+
+def sensor_decode_batch(ans_str:str) -> dict | Exception:
+    """decodes the answer of a '/batch' request in one pass, returns a dict
+    of channel: list of (val, age), or None if the channel has no new
+    data; channels the access point does not serve are left out, returns
+    ValueError if the answer can not be read
+    """
+
+    pos = ans_str.find('&') + 1
+    if not pos or not ans_str.startswith('DL='):
+        return ValueError(f"no readable data retrieved: {ans_str}!")
+
+    # '&' ends a channel, only the rest is trailing here
+    end = len(ans_str.rstrip(SEN_TRAILING))
+    channels = {}
+    val = None
+    for token in SEN_BATCH.finditer(ans_str, pos, end):
+        if token.start() != pos:
+            break
+        pos = token.end()
+        if token[1] is not None:
+            val = channels[token[1]] = []
+        elif token[2] is not None and val is not None:
+            val.append((float(token[2]), int(token[3])))
+        elif token[2] is None:
+            val = None
+        else:
+            break
+    if pos != end or val is not None:
+        return ValueError(f"no readable data retrieved: {ans_str}!")
+
+    for name, val in channels.items():
+        if not val:
+            channels[name] = None
+    return channels
@@ -72,21 +72,26 @@ def look_ahead(p1_speed, p2_speed) -> tuple[float, float]:
     in the queue, retracts current pump"""
     try:
         # get current and next command, if no p_ratio change
-        # check following commands, protocol path length & 
+        # check following commands, protocol path length &
         # break if to many commands with the same p_ratio
+        Coors = du.ROBCommQueue.coordinates(
+            num=du.PMP_look_ahead_max_comms + 2
+        )
+        ratios = [du.ROBCommQueue[i].p_ratio for i in range(len(Coors))]
         num_comm = 1
-        curr_pos = du.ROBTelem.Coor
-        curr_comm = du.ROBCommQueue[0]
-        next_comm = du.ROBCommQueue[1]
-        dist = curr_pos.distance(curr_comm.Coor1)
         while (
-                curr_comm.p_ratio == next_comm.p_ratio
+                num_comm < len(ratios)
+                and ratios[num_comm - 1] == ratios[num_comm]
                 and num_comm <= du.PMP_look_ahead_max_comms
         ):
-            dist += curr_comm.Coor1.distance(next_comm.Coor1)
             num_comm += 1
-            curr_comm = next_comm
-            next_comm = du.ROBCommQueue[num_comm]
+        if num_comm >= len(ratios):
+            return p1_speed, p2_speed
+        next_comm = du.ROBCommQueue[num_comm]
+        # all path lengths in one go
+        dist = du.ROBTelem.Coor.distance(Coors[0]) + float(
+            Coors.segment_lengths()[: num_comm - 1].sum()
+        )
 
         if dist < du.PMP_look_ahead_dist:
             # reverse direction on currently running pump
@@ -0,0 +1,123 @@
+#   This work is licensed under Creativ Commons Attribution-ShareAlike 4.0
+#   International (CC BY-SA 4.0).
+#   (https://creativecommons.org/licenses/by-sa/4.0/)
+#   Feel free to use, modify or distribute this code as far as you like, so
+#   long as you make anything based on it publicly avialable under the same
+#   license.
+
+# binary layout of the robot TCP protocol (151-byte commands, 36-byte
+# telemetry), shared by RobConnection and the simCom test server; kept free
+# of imports from data_utilities, entries are read via their attributes
+
+
+############################     IMPORTS      ################################
+
+import struct
+
+
+
+#############################     LAYOUT      ################################
+
+# id, mt, pt, Coor1 (8), Coor2 (8), Speed (4), sbt, sc, z, 8x tool ID/value
+COMMAND = struct.Struct('<iccffffffffffffffffiiiiiciiiiiiiiiiiiiii')
+COMMAND_SIZE = COMMAND.size
+
+# t_speed, id, x, y, z, rx, ry, rz, ext
+TELEMETRY = struct.Struct('<fifffffff')
+TELEMETRY_SIZE = TELEMETRY.size
+
+
+
+###########################     FUNCTIONS      ###############################
+
+def command_values(entry) -> tuple:
+    """returns the values of a QEntry in protocol order"""
+
+    Coor1 = entry.Coor1
+    Coor2 = entry.Coor2
+    Speed = entry.Speed
+    Tool = entry.Tool
+    return (
+        entry.id,
+        entry.mt.encode(),
+        entry.pt.encode(),
+        Coor1.x, Coor1.y, Coor1.z, Coor1.rx, Coor1.ry, Coor1.rz, Coor1.q,
+        Coor1.ext,
+        Coor2.x, Coor2.y, Coor2.z, Coor2.rx, Coor2.ry, Coor2.rz, Coor2.q,
+        Coor2.ext,
+        Speed.acr, Speed.dcr, Speed.ts, Speed.ors,
+        entry.sbt,
+        entry.sc.encode(),
+        entry.z,
+        0, # ID int, always 0
+        Tool.trolley_steps,
+        0,
+        # byte for cutter position, but simply coupled to cutting here
+        # as no other usage makes sense
+        Tool.cut,
+        0,
+        Tool.load_spring,
+        0,
+        Tool.cut,
+        0,
+        Tool.place_spring,
+        0,
+        Tool.clamp,
+        0,
+        Tool.wait,
+    )
+
+
+def pack_command(entry) -> bytes:
+    """packs a single QEntry according to the robots protocol"""
+
+    return COMMAND.pack(*command_values(entry))
+
+
+def pack_command_into(buffer, offset:int, entry) -> None:
+    """packs a single QEntry into buffer (e.g. a reusable bytearray),
+    starting at offset
+    """
+
+    COMMAND.pack_into(buffer, offset, *command_values(entry))
+
+
+def pack_many(entries, buffer=None) -> bytearray:
+    """packs all entries back to back into one contiguous buffer; buffer
+    is reused if given and large enough, otherwise a new one is created
+    """
+
+    entries = list(entries)
+    size = len(entries) * COMMAND_SIZE
+    if buffer is None or len(buffer) < size:
+        buffer = bytearray(size)
+
+    pack_into = COMMAND.pack_into
+    for i, entry in enumerate(entries):
+        pack_into(buffer, i * COMMAND_SIZE, *command_values(entry))
+    return buffer
+
+
+def unpack_command(buffer, offset=0) -> tuple:
+    """returns the raw command values (protocol order, see command_values)
+    found in buffer at offset, char fields stay bytes
+    """
+
+    return COMMAND.unpack_from(buffer, offset)
+
+
+def pack_telemetry(t_speed:float, id:int, Coor) -> bytes:
+    """packs robot telemetry, as the robot would send it"""
+
+    return TELEMETRY.pack(
+        t_speed, id,
+        Coor.x, Coor.y, Coor.z, Coor.rx, Coor.ry, Coor.rz, Coor.ext,
+    )
+
+
+def unpack_telemetry(buffer, offset=0) -> tuple:
+    """returns (t_speed, id, x, y, z, rx, ry, rz, ext) found in buffer at
+    offset, accepts bytes, bytearray or memoryview without slicing
+    """
+
+    return TELEMETRY.unpack_from(buffer, offset)
@@ -0,0 +1,319 @@
+#   This work is licensed under Creativ Commons Attribution-ShareAlike 4.0
+#   International (CC BY-SA 4.0).
+#   (https://creativecommons.org/licenses/by-sa/4.0/)
+#   Feel free to use, modify or distribute this code as far as you like, so
+#   long as you make anything based on it publicly avialable under the same
+#   license.
+
+# concurrent polling of the sensor access points (ESP32 data APs): one
+# keep-alive HTTP session & one request per access point, all access points
+# are requested at the same time, access points that stopped answering are
+# skipped for a growing time (circuit breaker), so they can not hold up the
+# others
+
+
+############################     IMPORTS      ################################
+
+import os
+import sys
+import time
+import requests
+
+from concurrent.futures import ThreadPoolExecutor
+
+# appending the parent directory path
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+# import my own libs
+import libs.data_utilities as du
+import libs.func_utilities as fu
+
+
+
+############################     CLASSES      ################################
+
+class CircuitBreaker:
+    """tracks the failures of one access point; after threshold failures
+    in a row it opens and the access point is skipped for backoff seconds,
+    then a single trial request is let through (half-open); every failed
+    trial doubles the backoff up to max_backoff, a success closes it again
+
+    ATTRIBUTES:
+        threshold:
+            failures in a row that open the breaker
+        backoff:
+            current time to skip the access point for [s]
+        failures:
+            failures in a row so far
+        open_until:
+            time.monotonic() until which requests are skipped
+
+    METHODS:
+        allow:
+            returns if a request may be sent now
+        success, failure:
+            report the outcome of a request
+    """
+
+    def __init__(self, threshold=3, backoff=2.0, max_backoff=60.0) -> None:
+        self.threshold = threshold
+        self.min_backoff = backoff
+        self.max_backoff = max_backoff
+        self.backoff = backoff
+        self.failures = 0
+        self.open_until = 0.0
+
+
+    @property
+    def is_open(self) -> bool:
+        return self.failures >= self.threshold
+
+
+    def allow(self, now:float | None = None) -> bool:
+        if not self.is_open:
+            return True
+        now = time.monotonic() if now is None else now
+        return now >= self.open_until
+
+
+    def success(self) -> None:
+        self.failures = 0
+        self.backoff = self.min_backoff
+        self.open_until = 0.0
+
+
+    def failure(self, now:float | None = None) -> None:
+        now = time.monotonic() if now is None else now
+        # a failed trial after the breaker opened
+        if self.is_open:
+            self.backoff = min(self.backoff * 2.0, self.max_backoff)
+        self.failures += 1
+        if self.is_open:
+            self.open_until = now + self.backoff
+
+
+
+class SensorPoller:
+    """requests all enabled sensors of a SEN_dict-like dict once per poll;
+    all channels of one access point (IP) are requested at once via
+    '/batch', access points with older firmware are asked channel by
+    channel over the same keep-alive session instead; the access points are
+    requested in parallel by a thread pool; if an access point can not be
+    reached, its remaining sensors are skipped for this poll and its circuit
+    breaker is told, so it is left out until the backoff is over
+
+    ATTRIBUTES:
+        timeout:
+            timeout of every request [s], SEN_timeout if not given
+        sessions:
+            requests.Session per access point
+        breakers:
+            CircuitBreaker per access point
+        batched:
+            False for access points that do not serve '/batch'
+        metrics:
+            cycle_time (duration of the last poll), worst_cycle_time [s],
+            polls, requests (sent in total), failed (requests without a
+            readable answer), skipped (sensors left out by open breakers)
+
+    METHODS:
+        poll:
+            requests all enabled sensors once, returns the answers
+        close:
+            closes the sessions & the thread pool
+    """
+
+    def __init__(
+            self,
+            timeout:float | None = None,
+            max_workers=8,
+            threshold=3,
+            backoff=2.0,
+            max_backoff=60.0,
+    ) -> None:
+        self.timeout = timeout
+        self.sessions = {}
+        self.breakers = {}
+        self.batched = {}
+        self._breaker_args = (threshold, backoff, max_backoff)
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='SensorPoll'
+        )
+        self.metrics = {
+            'cycle_time': 0.0,
+            'worst_cycle_time': 0.0,
+            'polls': 0,
+            'requests': 0,
+            'failed': 0,
+            'skipped': 0,
+        }
+
+
+    def poll(self, sen_dict:dict) -> list[tuple[str, str, object]]:
+        """returns (location key, sensor key, answer) for every sensor
+        requested, answers are the same as from fu.sensor_req; sensors of
+        access points with an open breaker are left out
+        """
+
+        start = time.monotonic()
+        # group the enabled sensors by access point, in dict order
+        access_points = {}
+        for key, loc in sen_dict.items():
+            if not loc.get('ip'):
+                continue
+            for sub_key, enabled in loc.items():
+                if sub_key in ('ip', 'err') or not enabled:
+                    continue
+                access_points.setdefault(loc['ip'], []).append(
+                    (key, sub_key)
+                )
+
+        futures = [
+            self._pool.submit(self._poll_ap, ip, sensors)
+            for ip, sensors in access_points.items()
+        ]
+        # counts are summed up here, the tasks do not share the metrics
+        answers = []
+        for fut in futures:
+            ap_answers, sent, failed, skipped = fut.result()
+            answers.extend(ap_answers)
+            self.metrics['requests'] += sent
+            self.metrics['failed'] += failed
+            self.metrics['skipped'] += skipped
+
+        duration = time.monotonic() - start
+        self.metrics['cycle_time'] = duration
+        self.metrics['worst_cycle_time'] = max(
+            self.metrics['worst_cycle_time'], duration
+        )
+        self.metrics['polls'] += 1
+        return answers
+
+
+    def _poll_ap(
+            self,
+            ip:str,
+            sensors:list[tuple[str, str]],
+    ) -> tuple[list, int, int, int]:
+        """requests the sensors of one access point, runs in the pool; each
+        access point is only ever handled by one task at a time, so its
+        session & breaker are not shared between threads; returns the
+        answers and the number of sent, failed & skipped requests
+        """
+
+        Breaker = self.breakers.get(ip)
+        if Breaker is None:
+            Breaker = self.breakers[ip] = CircuitBreaker(*self._breaker_args)
+        if not Breaker.allow():
+            return [], 0, 0, len(sensors)
+        Session = self.sessions.get(ip)
+        if Session is None:
+            Session = self.sessions[ip] = requests.Session()
+
+        sent = 0
+        if self.batched.get(ip, True):
+            answers = self._poll_batch(ip, sensors, Session, Breaker)
+            if answers is not None:
+                failed = 1 if isinstance(answers[0][2], Exception) else 0
+                return answers, 1, failed, 0
+            # older firmware without '/batch', ask each channel from now on
+            self.batched[ip] = False
+            sent = 1
+
+        answers, single_sent, failed, skipped = self._poll_single(
+            ip, sensors, Session, Breaker
+        )
+        return answers, sent + single_sent, failed, skipped
+
+
+    def _poll_batch(
+            self,
+            ip:str,
+            sensors:list[tuple[str, str]],
+            Session:requests.Session,
+            Breaker:CircuitBreaker,
+    ) -> list | None:
+        """requests all channels of one access point in one '/batch'
+        request, returns None if the access point does not know '/batch'
+        """
+
+        timeout = du.SEN_timeout if self.timeout is None else self.timeout
+        # the firmware reads the query as is, ',' must not be escaped
+        channels = ','.join(dict.fromkeys(sub_key for _, sub_key in sensors))
+        try:
+            ans = Session.get(
+                f"http://{ip}/batch?ch={channels}", timeout=timeout
+            )
+            if ans.status_code == 404:
+                return None
+            ans.raise_for_status()
+        except requests.HTTPError as err:
+            return [
+                (key, sub_key, ValueError(f"request failed: {err}!"))
+                for key, sub_key in sensors
+            ]
+        except Exception as err:
+            Breaker.failure()
+            return [
+                (key, sub_key, ValueError(f"request failed: {err}!"))
+                for key, sub_key in sensors
+            ]
+
+        Breaker.success()
+        data = fu.sensor_decode_batch(ans.text)
+        if isinstance(data, Exception):
+            return [(key, sub_key, data) for key, sub_key in sensors]
+        return [
+            (key, sub_key, data.get(
+                sub_key, ValueError(f"{sub_key} is not served by {ip}!")
+            ))
+            for key, sub_key in sensors
+        ]
+
+
+    def _poll_single(
+            self,
+            ip:str,
+            sensors:list[tuple[str, str]],
+            Session:requests.Session,
+            Breaker:CircuitBreaker,
+    ) -> tuple[list, int, int, int]:
+        """requests the channels of one access point one after another"""
+
+        timeout = du.SEN_timeout if self.timeout is None else self.timeout
+        answers = []
+        failed = 0
+        for i, (key, sub_key) in enumerate(sensors):
+            try:
+                ans = Session.get(f"http://{ip}/{sub_key}", timeout=timeout)
+                ans.raise_for_status()
+            except requests.HTTPError as err:
+                # the access point answers, only this sensor failed
+                failed += 1
+                answers.append(
+                    (key, sub_key, ValueError(f"request failed: {err}!"))
+                )
+                continue
+            except Exception as err:
+                # not reachable, the other sensors would only time out too
+                Breaker.failure()
+                answers.append(
+                    (key, sub_key, ValueError(f"request failed: {err}!"))
+                )
+                return answers, i + 1, failed + 1, len(sensors) - i - 1
+
+            Breaker.success()
+            answer = fu.sensor_decode(ans.text)
+            if isinstance(answer, Exception):
+                failed += 1
+            answers.append((key, sub_key, answer))
+        return answers, len(sensors), failed, 0
+
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True)
+        for Session in self.sessions.values():
+            Session.close()
+        self.sessions.clear()
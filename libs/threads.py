@@ -10,11 +10,12 @@
 
 # python standard libraries
 import os
+import gc
 import cv2
 import sys
+import time
 import math as m
 import requests
-from copy import deepcopy as dcpy
 
 # appending the parent directory path
 current_dir = os.path.dirname(os.path.realpath(__file__))
@@ -23,12 +24,15 @@ sys.path.append(parent_dir)
 
 # PyQt stuff
 from PyQt5.QtCore import QObject, QTimer, pyqtSignal, QMutexLocker
+from PyQt5.QtCore import QSocketNotifier
 from PyQt5.QtGui import QImage, QPixmap
 
 # import my own libs
 import libs.data_utilities as du
+import libs.code_parser as cp
 import libs.func_utilities as fu
 import libs.pump_utilities as pu
+from libs.sensor_comm import SensorPoller
 from libs.win_mainframe_prearrange import GlobalMutex, PmpMutex
 
 
@@ -49,6 +53,14 @@ class PumpCommWorker(QObject):
     logEntry = pyqtSignal(str, str)
 
 
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        # user speed behind the last queued speed & telemetry reads sent
+        # by send, both per MtecMod
+        self._user_speeds = {}
+        self._telem_pending = {}
+
+
     def run(self) -> None:
         """start timer with standard operation on timeout,
         connect to pump via M-Tec Interface"""
@@ -57,6 +69,10 @@ class PumpCommWorker(QObject):
         self.LoopTimer.setInterval(250)
         self.LoopTimer.timeout.connect(self.active_state)
         self.LoopTimer.start()
+        self.BusLoadTimer = QTimer()
+        self.BusLoadTimer.setInterval(60000)
+        self.BusLoadTimer.timeout.connect(self.report_bus_load)
+        self.BusLoadTimer.start()
         self.logEntry.emit('THRT','PumpComm thread running.')
 
 
@@ -65,6 +81,27 @@ class PumpCommWorker(QObject):
 
         self.LoopTimer.stop()
         self.LoopTimer.deleteLater()
+        self.BusLoadTimer.stop()
+        self.BusLoadTimer.deleteLater()
+
+
+    def report_bus_load(self) -> None:
+        """log how busy the shared pump bus was since the last report"""
+
+        Bus = du.PMP1Serial.bus or du.PMP2Serial.bus
+        if Bus is None:
+            return
+        load = Bus.utilisation()
+        with QMutexLocker(GlobalMutex):
+            du.PMP_bus_load = load
+        metrics = du.PMPScheduler.metrics
+        self.logEntry.emit(
+            'PTel',
+            f"pump bus load: {load:.0%}, queued: {metrics['queue_depth']}, "
+            f"merged: {metrics['merged']}, dropped: {metrics['dropped']}, "
+            f"deferred: {metrics['deferred']}, worst latency: "
+            f"{metrics['worst_latency'] * 1000:.0f} ms"
+        )
     
 
     def active_state(self):
@@ -77,15 +114,16 @@ class PumpCommWorker(QObject):
 
 
     def send(self) -> None:
-        """send pump speed to pump, uses modified setter in mtec's script 
-        (changed to function), which recognizes a value change and returns
-        the machines answer and the original command string, uses user-set
-        pump speed if no script is running
+        """queue pump speeds & keepAlives in du.PMPScheduler, which only
+        writes changed speeds, merges keepAlives and sends everything of
+        this cycle (incl. the telemetry reads for receive) in one go; uses
+        user-set pump speed if no script is running
         """
         
         # send to P1 and P2 & keepAlive both
         p1_speed, p2_speed, pinch = pu.get_pmp_speeds()
         min_speed, max_speed = du.DEF_PUMP_CHK_RANGE
+        pumps = {}
         for serial, speed, live_ad, speed_global, p_num in [
                 (du.PMP1Serial, p1_speed, 'PMP1_live_ad', 'PMP1_speed', 'P1'),
                 (du.PMP2Serial, p2_speed, 'PMP2_live_ad', 'PMP2_speed', 'P2'),
@@ -94,14 +132,20 @@ class PumpCommWorker(QObject):
                 new_speed = speed * getattr(du, live_ad)
                 new_speed = fu.domain_clip(new_speed, min_speed, max_speed)
                 new_speed = int(round(new_speed, 0))
-                res = serial.set_speed(new_speed)
-                if res is not None:
-                    with QMutexLocker(GlobalMutex):
-                        setattr(du, speed_global, speed)
-                    print(f"{p_num}: {speed}")
-                    self.dataSend.emit(speed, res[0], res[1], p_num)
+                du.PMPScheduler.set_speed(serial, new_speed)
+                du.PMPScheduler.keep_alive(serial)
+                self._user_speeds[serial] = speed
+            if serial.connected:
+                pumps[serial] = (speed_global, p_num)
 
-                serial.keepAlive()
+        written, self._telem_pending = du.PMPScheduler.run(telemetry=pumps)
+        for serial, res in written.items():
+            speed_global, p_num = pumps[serial]
+            speed = self._user_speeds[serial]
+            with QMutexLocker(GlobalMutex):
+                setattr(du, speed_global, speed)
+            print(f"{p_num}: {speed}")
+            self.dataSend.emit(speed, res[1], res[2], p_num)
         if pinch is not None and du.PRH_connected:
             try:
                 ans = requests.post(f"{du.PRH_url}/pinch", data={'s': str(float(pinch))}, timeout=0.1)
@@ -140,28 +184,22 @@ class PumpCommWorker(QObject):
         #         print(f"P2 freq: {serial.frequency}")
 
         # RECEIVE FROM PUMPS:
+        # the reads for both pumps were queued by du.PMPScheduler in send,
+        # reads skipped for the bus budget are simply left out this cycle
         for serial, last_telem, speed_global, stt_attr, p_num in [
                 (du.PMP1Serial, 'PMP1LastTelem', 'PMP1_speed', 'Pump1', 'P1'),
                 (du.PMP2Serial, 'PMP2LastTelem', 'PMP2_speed', 'Pump2', 'P2'),
         ]:
-            if serial.connected:
-                freq = serial.frequency
-                # override to reduce traffic on shared bus
-                # volt = -1.0
-                # amps = -1.0
-                # torq = -1.0
-                volt = serial.voltage
-                amps = serial.current
-                torq = serial.torque
-
-                if None in [freq, volt, amps, torq]:
+            if serial.connected and serial in self._telem_pending:
+                Telem = serial.collectTelemetry(self._telem_pending[serial])
+
+                if Telem is None:
                     self.logEntry.emit(
                         'PTel',
                         f"{p_num} telemetry package broken or not received, "
                         f"connection probably lost!"
                     )
                 else:
-                    Telem = du.PumpTelemetry(freq, volt, amps, torq)
                     Telem = round(Telem, 3)
                     if p_num == 'P1': self.p1Active.emit()
                     elif p_num == 'P2': self.p2Active.emit()
@@ -191,10 +229,15 @@ class PumpCommWorker(QObject):
 ##########################     ROBO WORKER      ##############################
 
 class RoboCommWorker(QObject):
-    """a worker object that check every 50 ms if the Robot queue has empty 
-    slots (according to ROBO_comm_forerun), emits signal to send data if so,
-    beforehand checks the TCPIP connection every 50 ms and writes the result
-    to global vars
+    """a worker object that wakes up on every telemetry block from the robot
+    and handles it in one pass: receive, check if the robot queue has empty
+    slots (according to ROB_comm_fr) and send the next commands if so; a
+    slow timer and the wake slot cover direct control commands and queue
+    changes while the robot is silent; with event_driven set to False the
+    old timer polling (100 ms receive/send, 200 ms queue check) is used;
+    if the socket fails, the notifier is disabled and the slow timer polls
+    receive instead, until the robot answers again or a new connection is
+    made, which re-arms it
     """
 
     dataReceived = pyqtSignal()
@@ -207,19 +250,32 @@ class RoboCommWorker(QObject):
     # however this will be either int or Exception type
     sendElem = pyqtSignal(du.QEntry, bool, object, bool)
 
+    event_driven = True
+    CommTimer = None
+    SockNotifier = None
+    _notifier_sock = None
+
 
     def run(self) -> None:
-        """start timer, receive and send on timeout"""
+        """start socket notifier & fallback timer, or the polling timers if
+        event_driven is False
+        """
 
-        self.CommTimer = QTimer()
-        self.CommTimer.setInterval(100)
-        self.CommTimer.timeout.connect(self.receive)
-        self.CommTimer.timeout.connect(self.send)
-        self.CommTimer.start()
+        if self.event_driven:
+            self.arm_notifier()
+        else:
+            self.CommTimer = QTimer()
+            self.CommTimer.setInterval(100)
+            self.CommTimer.timeout.connect(self.receive)
+            self.CommTimer.timeout.connect(self.send)
+            self.CommTimer.start()
 
         self.CheckTimer = QTimer()
         self.CheckTimer.setInterval(200)
-        self.CheckTimer.timeout.connect(self.check_queue)
+        if self.event_driven:
+            self.CheckTimer.timeout.connect(self.check_socket)
+        else:
+            self.CheckTimer.timeout.connect(self.check_queue)
         self.CheckTimer.start()
 
         self.logEntry.emit('THRT','RoboComm thread running.')
@@ -228,13 +284,64 @@ class RoboCommWorker(QObject):
     def stop(self) -> None:
         """stop loop"""
 
-        self.CommTimer.stop()
-        self.CommTimer.deleteLater()
+        if self.SockNotifier is not None:
+            self.SockNotifier.setEnabled(False)
+            self.SockNotifier.deleteLater()
+            self.SockNotifier = None
+
+        if self.CommTimer is not None:
+            self.CommTimer.stop()
+            self.CommTimer.deleteLater()
 
         self.CheckTimer.stop()
         self.CheckTimer.deleteLater()
 
 
+    def arm_notifier(self) -> None:
+        """(re)create the socket notifier on the current ROBTcp socket"""
+
+        if self.SockNotifier is not None:
+            self.SockNotifier.setEnabled(False)
+            self.SockNotifier.deleteLater()
+        self._notifier_sock = du.ROBTcp._Socket
+        self.SockNotifier = QSocketNotifier(
+            self._notifier_sock.fileno(), QSocketNotifier.Read
+        )
+        self.SockNotifier.activated.connect(self.receive_cycle)
+
+
+    def check_socket(self) -> None:
+        """fallback timer: while the notifier is disabled, re-arm it on a
+        new connection or poll receive; then wake
+        """
+
+        if self.SockNotifier is not None and not self.SockNotifier.isEnabled():
+            if (
+                    du.ROBTcp.connected
+                    and du.ROBTcp._Socket is not self._notifier_sock
+            ):
+                self.arm_notifier()
+            else:
+                self.receive()
+        self.wake()
+
+
+    def receive_cycle(self) -> None:
+        """telemetry is waiting: receive, refill ROB_send_list, send"""
+
+        self.receive()
+        self.wake()
+
+
+    def wake(self) -> None:
+        """refill ROB_send_list from SCQueue & send, used by the fallback
+        timer and by the mainframe when commands are added
+        """
+
+        self.check_queue()
+        self.send()
+
+
     def receive(self) -> None:
         """receive 36-byte data block, write to ROB vars"""
 
@@ -249,6 +356,13 @@ class RoboCommWorker(QObject):
 
         Telem, raw_data = du.ROBTcp.receive()
         if isinstance(Telem, Exception):
+            # the socket is gone, stop the notifier from firing endlessly
+            if (
+                self.SockNotifier is not None
+                and isinstance(Telem, OSError)
+                and not isinstance(Telem, TimeoutError)
+            ):
+                self.SockNotifier.setEnabled(False)
             # inform user if error occured in websocket connection (ignore timeouts)
             if(
                 not isinstance(Telem, TimeoutError)
@@ -265,6 +379,13 @@ class RoboCommWorker(QObject):
             err_handler(f"given position out of reach! last given pos: {LastPos}")
 
         else:
+            # the robot answers again, hand back to the notifier
+            if (
+                self.SockNotifier is not None
+                and not self.SockNotifier.isEnabled()
+            ):
+                self.SockNotifier.setEnabled(True)
+
             # standard telemetry handler
             Telem = round(Telem, 1)
             self.dataReceived.emit()
@@ -308,16 +429,17 @@ class RoboCommWorker(QObject):
                             and len(du.ROBCommQueue) > 0
                         ):
                         du.ROBMovStartP = du.ROBMovEndP
-                        du.ROBMovEndP = dcpy(du.ROBCommQueue[0].Coor1)
+                        du.ROBMovEndP = du.ROBCommQueue[0].Coor1.copy()
 
-                    # set new values to globals
-                    du.ROBTelem = dcpy(Telem)
-                    du.ROBLastTelem = dcpy(Telem)
+                    # set new values to globals, telemetry is read-only
+                    # once received, so it can be shared without copying
+                    du.ROBTelem = Telem
+                    du.ROBLastTelem = Telem
 
                     # prep database entry
-                    STTEntry = dcpy(Telem)
-                    STTEntry.Coor -= du.DCCurrZero
-                    du.STTDataBlock.Robo = dcpy(STTEntry) 
+                    du.STTDataBlock.Robo = Telem._replace(
+                        Coor=Telem.Coor - du.DCCurrZero
+                    )
                     self.dataUpdated.emit(str(raw_data), Telem)
                     
                     # print
@@ -357,6 +479,10 @@ class RoboCommWorker(QObject):
                     except AttributeError:
                         pass
 
+            # the file is still streamed into SCQueue, wait for more
+            elif lfw_streaming:
+                pass
+
             else:
                 if len_rob == 0:
                     self.endProcessing.emit()
@@ -365,12 +491,15 @@ class RoboCommWorker(QObject):
 
 
     def send(self, testrun=False) -> None:
-        """iterate over ROB_send_list entries and send one by one,
-        check if sending was successful each time
+        """collect all ROB_send_list entries and send them as one block,
+        check which commands were send successfully; if the block breaks
+        off, the first failed command is reported and the rest of the
+        block fails with it (nothing is retried, the robot would see a gap
+        in the IDs otherwise)
         """
 
-        num_send = 0
-        # send commands until send_list is empty
+        Batch = []
+        # collect commands until send_list is empty
         while len(du.ROB_send_list) > 0:
             Comm, direct_ctrl = du.ROB_send_list.pop(0)
 
@@ -397,29 +526,47 @@ class RoboCommWorker(QObject):
                 Comm.Speed.ts = int(Comm.Speed.ts * du.ROB_live_ad)
                 Comm.Speed.ors = int(Comm.Speed.ors * du.ROB_live_ad)
 
-            # if testrun, skip actually sending the message
-            if testrun:
-                res, msg_len = True, 159
-            else:
-                res, msg_len = du.ROBTcp.send(Comm)
+            Batch.append((Comm, direct_ctrl))
 
-            # see if sending was successful
-            if res:
-                with QMutexLocker(GlobalMutex):
-                    num_send += 1
-                    du.ROBCommQueue.append(Comm)
-                    fu.add_to_comm_protocol(f"SEND:    {Comm}")
-                    if direct_ctrl:
-                        du.SCQueue.increment()
+        if len(Batch) == 0:
+            return
 
-                self.logEntry.emit('ROBO', f"send: {Comm}")
-            else:
-                print(f" Message Error: {msg_len}")
-                self.sendElem.emit(Comm, False, msg_len, direct_ctrl)
-        
-            # inform mainframe if command block was send successfully 
-            if len(du.ROB_send_list) == 0:
-                self.sendElem.emit(Comm, True, num_send, direct_ctrl)
+        # if testrun, skip actually sending the message
+        if testrun:
+            num_send, err = len(Batch), None
+        else:
+            num_send, err = du.ROBTcp.send_many(
+                [Comm for Comm, _ in Batch]
+            )
+
+        # book all successfully send commands at once
+        with QMutexLocker(GlobalMutex):
+            dc_num = 0
+            for Comm, direct_ctrl in Batch[:num_send]:
+                du.ROBCommQueue.append(Comm, copy=False)
+                fu.add_to_comm_protocol(f"SEND:    {Comm}")
+                dc_num += int(direct_ctrl)
+            if dc_num > 0:
+                du.SCQueue.increment(dc_num)
+
+        for Comm, _ in Batch[:num_send]:
+            self.logEntry.emit('ROBO', f"send: {Comm}")
+
+        if err is not None:
+            Comm, direct_ctrl = Batch[num_send]
+            print(
+                f" Message Error: {err}, "
+                f"{len(Batch) - num_send} command(s) not send"
+            )
+            self.sendElem.emit(Comm, False, err, direct_ctrl)
+            # send_many closed the socket, see receive
+            if self.SockNotifier is not None and not du.ROBTcp.connected:
+                self.SockNotifier.setEnabled(False)
+
+        # inform mainframe if command block was send successfully
+        if num_send > 0:
+            Comm, direct_ctrl = Batch[num_send - 1]
+            self.sendElem.emit(Comm, True, num_send, direct_ctrl)
 
 
     def _check_target_reached(self) -> bool:
@@ -434,8 +581,8 @@ class RoboCommWorker(QObject):
             return False
         # otherwise calc distance to target
         elif command_num == 1:
-            CurrTarget = dcpy(du.ROBCommQueue[0].Coor1)
-            CurrCoor = dcpy(du.ROBTelem.Coor)
+            CurrTarget = du.ROBCommQueue[0].Coor1
+            CurrCoor = du.ROBTelem.Coor
             target_dist =  m.sqrt(
                 m.pow(CurrTarget.x - CurrCoor.x, 2)
                 + m.pow(CurrTarget.y - CurrCoor.y, 2)
@@ -455,21 +602,33 @@ class RoboCommWorker(QObject):
 #########################     SENSOR WORKER      #############################
 
 class SensorCommWorker(QObject):
-    """cycle through all sensors, collect the data"""
+    """cycle through all sensors, collect the data; the access points are
+    polled concurrently by a SensorPoller, see libs/sensor_comm.py"""
 
     cycleDone = pyqtSignal()
     dataReceived = pyqtSignal(str)
     logEntry = pyqtSignal(str, str)
 
     _conn_error = False
+    Poller = None
 
     def run(self) -> None:
         """start cycling through the sensors"""
 
+        self.Poller = SensorPoller(
+            max_workers=du.SEN_max_workers,
+            threshold=du.SEN_breaker_threshold,
+            backoff=du.SEN_backoff,
+            max_backoff=du.SEN_max_backoff,
+        )
         self.CycleTimer = QTimer()
         self.CycleTimer.setInterval(1000)
         self.CycleTimer.timeout.connect(self.cycle)
         self.CycleTimer.start()
+        self.ReportTimer = QTimer()
+        self.ReportTimer.setInterval(60000)
+        self.ReportTimer.timeout.connect(self.report_cycle_time)
+        self.ReportTimer.start()
 
         self.logEntry.emit('THRT','SensorComm thread running.')
 
@@ -479,52 +638,62 @@ class SensorCommWorker(QObject):
 
         self.CycleTimer.stop()
         self.CycleTimer.deleteLater()
+        self.ReportTimer.stop()
+        self.ReportTimer.deleteLater()
+        self.Poller.close()
 
 
-    def cycle(self) -> None:
-        """check every sensor once"""
+    def report_cycle_time(self) -> None:
+        """log how long polling all sensors took"""
 
-        def loc_request(loc:dict, key:str) -> None:
-            """runs sub-cycle for single location, sends data to
-            fu.store_sensor_data while its at it
-            """
+        metrics = self.Poller.metrics
+        self.logEntry.emit(
+            'SENS',
+            f"sensor cycle: {metrics['cycle_time'] * 1000:.0f} ms, "
+            f"worst: {metrics['worst_cycle_time'] * 1000:.0f} ms, "
+            f"requests: {metrics['requests']}, failed: {metrics['failed']}, "
+            f"skipped: {metrics['skipped']}"
+        )
 
-            for sub_key in loc:
-                if sub_key == 'ip' or sub_key == 'err': 
-                    continue
-                
-                if loc[sub_key]: # only check true-marked sensors
-                    data = fu.sensor_req(loc["ip"], sub_key)
-                    
-                    if isinstance(data, list):
-                        # to-do: write handling for legacy data
-                        self.dataReceived.emit(loc['ip'])
-                        # extract tuple from list: (val, uptime)
-                        # newest entry is at the end of the list
-                        latest_data = data[len(data) - 1]
-                        loc['err'] = False
 
-                        with QMutexLocker(GlobalMutex):
-                            du.STTDataBlock.store(latest_data, key, sub_key)
-
-                    elif data is not None:
-                        # log recurring error from one location only once
-                        if loc['err'] == False:
-                            loc['err'] = True
-                            self.logEntry.emit(
-                                'SENS',
-                                f"request error from {loc['ip']}: {data}"
-                            )
-                            self.logEntry.emit(
-                                'SENS',
-                                f"trying to reconnect to {loc['ip']}.."
-                            )
-            
-            return None
+    def cycle(self) -> None:
+        """check every sensor once, sends data to du.STTDataBlock"""
+
+        if self.Poller is None:
+            self.Poller = SensorPoller(max_workers=du.SEN_max_workers)
+
+        entries = []
+        received = []
+        answers = self.Poller.poll(du.SEN_dict)
+        recv_time = time.monotonic()
+        for key, sub_key, data in answers:
+            loc = du.SEN_dict[key]
+            if isinstance(data, list):
+                # whole backlog as list of (val, age), into the history
+                entries.append((data, key, sub_key))
+                if loc['ip'] not in received:
+                    received.append(loc['ip'])
+                loc['err'] = False
+
+            elif data is not None:
+                # log recurring error from one location only once
+                if loc['err'] == False:
+                    loc['err'] = True
+                    self.logEntry.emit(
+                        'SENS',
+                        f"request error from {loc['ip']}: {data}"
+                    )
+                    self.logEntry.emit(
+                        'SENS',
+                        f"trying to reconnect to {loc['ip']}.."
+                    )
 
-        # main cycle
-        for key in du.SEN_dict:
-            loc_request(du.SEN_dict[key], key)
+        # all channels of the cycle in one go
+        if entries:
+            with QMutexLocker(GlobalMutex):
+                du.STTDataBlock.store_backlog(entries, recv_time)
+        for ip in received:
+            self.dataReceived.emit(ip)
 
         self.cycleDone.emit()
 
@@ -534,10 +703,15 @@ class SensorCommWorker(QObject):
 
 class LoadFileWorker(QObject):
     """worker converts .gcode or .mod into QEntries, outsourced to worker as
-    these files can have more than 50000 lines"""
+    these files can have more than 50000 lines; with lfw_pre_check set, the
+    file is only loaded & checked for open_file, the LoadResult (or the
+    error) is given via preCheckFinished and cached for the actual load"""
 
     convFinished = pyqtSignal(int, int, int)
     convFailed = pyqtSignal(str)
+    convProgress = pyqtSignal(int, int)
+    preCheckFinished = pyqtSignal(object, object)
+    streamProgress = pyqtSignal(int, float)
     rangeChkWarning = pyqtSignal(str)
     _CommList = du.Queue()
 
@@ -546,12 +720,14 @@ class LoadFileWorker(QObject):
         """get data, start conversion loop"""
         global lfw_file_path
         global lfw_line_id
+        global lfw_stream
         global lfw_ext_trail
         global lfw_p_ctrl
         global lfw_range_chk
         global lfw_base_dist_chk
         global lfw_running
         global lfw_pre_run_time
+        global lfw_pre_check
 
         lfw_running = True
         line_id = lfw_line_id
@@ -561,25 +737,71 @@ class LoadFileWorker(QObject):
             lfw_running = False
             return
 
+        # open_file: load & check only, the result is cached by load_file
+        if lfw_pre_check:
+            try:
+                Result = cp.load_file(
+                    file_path, lfw_ext_trail, progress=self.convProgress.emit
+                )
+            except Exception as err:
+                Result = err
+            lfw_pre_check = False
+            lfw_running = False
+            self.preCheckFinished.emit(file_path, Result)
+            return
+
+        # streaming load, entries go to SCQueue while converting
+        if lfw_stream:
+            self.stream(file_path, line_id)
+            lfw_running = False
+            return
+
         # init vars
-        with open(file_path, 'r') as file:
-            txt = file.read()
-        rows = txt.split("\n")
         self._CommList.clear()
         start_id = line_id
 
-        # iterate over file rows
-        if file_path.suffix == ".gcode":
-            result, line_id, skips = self.gcode_conv(line_id, rows)
-        else:
-            result, line_id, skips = self.rapid_conv(line_id, rows)
+        # single pass over the file (conversion, statistics & checks), in
+        # most cases cached already as open_file loaded it with the same
+        # settings; large files are converted in chunks by several
+        # processes, each one reported
+        Result = cp.load_file(
+            file_path, lfw_ext_trail, progress=self.convProgress.emit
+        )
+        if Result.error:
+            self.convFailed.emit(Result.error)
+            lfw_running = False
+            return
+
+        # the cached entries are handed out as copies (or built from the
+        # records of a parallel load); every copy makes a handful of new
+        # objects, pause the cyclic garbage collector so it does not
+        # rescan all of them over and over while the list grows
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for Entry in Result.copies():
+                Entry.id = line_id
+                # range_check moves a negative rx by 360°, as it did when
+                # it was run on every entry
+                if lfw_range_chk and Entry.Coor1.rx < 0.0:
+                    Entry.Coor1.rx += 360.0
+                self._CommList.append(Entry, copy=False)
+                line_id += 1
+        finally:
+            if gc_enabled:
+                gc.enable()
+        skips = Result.conv_skips()
         if len(self._CommList) == 0:
             self.convFailed.emit("No commands found!")
-            result = False
-        if not result:
             lfw_running = False
             return
 
+        # take over the zero set by G92 commands in the file
+        with QMutexLocker(GlobalMutex):
+            Zero = du.DCCurrZero
+            for attr in Zero.attr_names:
+                setattr(Zero, attr, getattr(Result.zero, attr))
+
         # automatic pump control
         if lfw_p_ctrl:
             # set all entries to pmode=default
@@ -588,95 +810,229 @@ class LoadFileWorker(QObject):
 
             # add a startvector with a speed of 1mm/s with pMode=start
             # (so X seconds of approach if length is X mm (lfw_pre_run_time))
-            StartVector = dcpy(self._CommList[0])
+            StartVector = self._CommList[0].copy()
             StartVector.id = start_id
             StartVector.Coor1.x += lfw_pre_run_time
             StartVector.Coor1.y += lfw_pre_run_time
             StartVector.p_mode = "start"
             StartVector.Speed = du.SpeedVector(acr=1, dcr=1, ts=1, ors=1)
-            self._CommList.add(StartVector, thread_call=True)
+            self._CommList.add(StartVector, thread_call=True, copy=False)
 
             # set the last entry to pMode=end
             self._CommList[len(self._CommList) - 1].p_mode = "end"
         
-        # entry checks
+        # entry checks, only the entries that failed while loading (and
+        # the start vector) are checked again for the messages
+        offset = 1 if lfw_p_ctrl else 0
+        if lfw_range_chk:
+            self.check_routine(
+                fu.range_check,
+                self.check_lines(Result.out_of_range, offset),
+                Result.range_summary,
+            )
+        if lfw_base_dist_chk:
+            self.check_routine(
+                fu.base_dist_check,
+                self.check_lines(Result.base_dist, offset),
+                Result.base_summary,
+            )
+
+        # paths to the entries (from the entry before), the paths to the
+        # first entry & the start vector are not known before sending
         if lfw_range_chk:
-            self.check_routine(fu.range_check)
+            self.path_warnings(
+                Result.path_range, offset, "leaves the range",
+                Result.path_range_summary,
+            )
         if lfw_base_dist_chk:
-            self.check_routine(fu.base_dist_check)
+            self.path_warnings(
+                Result.path_base_dist, offset, "gets beyond base distance",
+                Result.path_base_summary,
+            )
 
-        # add to command queue
-        du.SCQueue.add_queue(self._CommList)
+        # add to command queue, entries are handed over without copying
+        du.SCQueue.add_queue(self._CommList, copy=False)
+        self._CommList.clear()
         self.convFinished.emit(line_id, start_id, skips)
         lfw_running = False
 
 
-    def gcode_conv(self, line:int, rows:list) -> tuple[bool, int, int]:
-        """row-wise conversion from GCode"""
+    def stream(self, file_path, line_id:int) -> None:
+        """streaming load: entries are added to SCQueue in batches of
+        IO_stream_batch as they are converted, so queue processing can
+        start while the rest of the file is read; waits as long as SCQueue
+        holds IO_stream_queue_max entries or more (backpressure); the wait
+        ends with convFailed if lfw_cancel is set, queue processing is
+        stopped or SCQueue stays full for IO_stream_timeout; reports
+        entries added and rows/s after every batch via streamProgress;
+        range & base distance warnings are given once the file is done
+        """
+        global lfw_streaming
+        global lfw_cancel
 
+        start_id = line_id
+        added = 0
+        row_num = 0
         skips = 0
-        Speed = dcpy(du.PRINSpeed)
-        # file import always starts from home, regardless of current pos:
-        LastPos = du.DCCurrZero
-
-        for row in rows:
-            Entry, command = fu.gcode_to_qentry(
-                LastPos,
-                Speed,
-                du.IO_zone,
-                row,
-                lfw_ext_trail
-            )
-            # check if valid command
-            if (command == "G1") or (command == "G28"):
-                Entry.id = line
-                res = self._CommList.add(Entry, thread_call=True)
-                if res == ValueError:
-                    self.convFailed.emit(f"COULD NOT ADD: {command}!")
-                    return False, 0, 0
-                line += 1
-                LastPos = Entry.Coor1
-            elif (command == "G92") or (command == ";") or (command == ''):
-                skips += 1
-            else:
-                # if invalid, break conversion
-                if isinstance(Entry, Exception):
-                    self.convFailed.emit(f"VALUE ERROR: {command}!")
-                else:
-                    self.convFailed.emit(f"{command}, ABORTED!")
-                return False, 0, 0
-        return True, line, skips
+        batch = []
+        chk_msg = {'range': '', 'base': ''}
+        warnings = {'range': 0, 'base': 0}
+        Min, Max = (tuple(Coor) for Coor in du.RC_area)
+        start = time.monotonic()
+
+        def check(Entry, position) -> None:
+            """same as check_routine, for a single entry"""
+
+            for key, run, passed, func in [
+                    ('range', lfw_range_chk,
+                     cp.in_range(Entry.Coor1, Min, Max), fu.range_check),
+                    ('base', lfw_base_dist_chk,
+                     cp.in_base_dist(Entry.Coor1), fu.base_dist_check),
+            ]:
+                if not run or warnings[key] >= du.DEF_WARN_MAX_RAISED:
+                    continue
+                if passed:
+                    continue
+                warnings[key] += 1
+                chk_msg[key] += f"Line {position}: {func(Entry)[1]}\n"
+                if warnings[key] >= du.DEF_WARN_MAX_RAISED:
+                    chk_msg[key] += (
+                        f"Maximum number of warnings reached, "
+                        f"stopping check.."
+                    )
+            # range_check moves a negative rx by 360°
+            if lfw_range_chk and Entry.Coor1.rx < 0.0:
+                Entry.Coor1.rx += 360.0
+
+        def enqueue(Entries:list) -> str | None:
+            """returns the reason if streaming has to stop"""
+            nonlocal added
+
+            # backpressure, wait for the robot to work off the queue
+            waited = time.monotonic()
+            processing = du.SC_q_processing
+            while len(du.SCQueue) >= du.IO_stream_queue_max:
+                if lfw_cancel:
+                    return "Streaming cancelled!"
+                # nothing works off the queue anymore
+                if processing and not du.SC_q_processing:
+                    return "Queue processing stopped, streaming cancelled!"
+                processing = processing or du.SC_q_processing
+                if time.monotonic() - waited > du.IO_stream_timeout:
+                    return (
+                        f"SCQueue full for {du.IO_stream_timeout} s, "
+                        f"streaming cancelled!"
+                    )
+                time.sleep(0.05)
 
+            # appended at the end (IDs from 0 are moved behind the last
+            # entry by add_queue) or inserted from the given ID on
+            first_id = start_id + added if start_id else 0
+            for i, Entry in enumerate(Entries):
+                Entry.id = first_id + i
+            with QMutexLocker(GlobalMutex):
+                du.SCQueue.add_queue(du.Queue(Entries), copy=False)
+            added += len(Entries)
+            rate = row_num / max(time.monotonic() - start, 1e-6)
+            self.streamProgress.emit(added, rate)
+            return None
 
-    def rapid_conv(self, line:int, rows:list) -> tuple[bool, int, int]:
-        """single line conversion from RAPID"""
+        def entries():
+            """stream_file, keeps the zero it returns once the file is done"""
+            zero.append((yield from cp.stream_file(file_path, lfw_ext_trail)))
+
+        zero = []
+        lfw_cancel = False
+        lfw_streaming = True
+        try:
+            Last = None
+            for Entry, error in entries():
+                if error:
+                    self.convFailed.emit(error)
+                    return
+                row_num += 1
+                if Entry is None:
+                    skips += 1
+                    continue
 
-        skips = 0
-        for row in rows:
-            Entry = fu.rapid_to_qentry(row, lfw_ext_trail)
-            if Entry is None:
-                skips += 1
-            elif isinstance(Entry, Exception):
-                self.convFailed.emit(f"ERROR: {Entry}")
-                return False, 0, 0
+                if lfw_p_ctrl:
+                    Entry.p_mode = "default"
+                    if Last is None and added == 0 and not batch:
+                        # start vector, see run
+                        StartVector = Entry.copy()
+                        StartVector.Coor1.x += lfw_pre_run_time
+                        StartVector.Coor1.y += lfw_pre_run_time
+                        StartVector.p_mode = "start"
+                        StartVector.Speed = du.SpeedVector(
+                            acr=1, dcr=1, ts=1, ors=1
+                        )
+                        check(StartVector, 1)
+                        batch.append(StartVector)
+                check(Entry, added + len(batch) + (Last is not None) + 1)
+
+                # the last entry is held back to be marked as the end
+                if Last is not None:
+                    batch.append(Last)
+                Last = Entry
+                if len(batch) >= du.IO_stream_batch:
+                    error = enqueue(batch)
+                    if error:
+                        self.convFailed.emit(error)
+                        return
+                    batch = []
+
+            if Last is None:
+                if not batch:
+                    self.convFailed.emit("No commands found!")
+                    return
             else:
-                Entry.id = line
-                res = self._CommList.add(Entry, thread_call=True)
-                if res == ValueError:
-                    return False, 0, 0
-                line += 1
-        return True, line, skips
+                if lfw_p_ctrl:
+                    Last.p_mode = "end"
+                batch.append(Last)
+            error = enqueue(batch)
+            if error:
+                self.convFailed.emit(error)
+                return
+        finally:
+            lfw_streaming = False
+
+        # take over the zero set by G92 commands in the file, see run
+        if zero and zero[0] is not None:
+            with QMutexLocker(GlobalMutex):
+                Zero = du.DCCurrZero
+                for attr in Zero.attr_names:
+                    setattr(Zero, attr, getattr(zero[0], attr))
+
+        for key in ['range', 'base']:
+            if chk_msg[key] != '':
+                self.rangeChkWarning.emit(chk_msg[key])
+        self.convFinished.emit(start_id + added, start_id, skips)
 
 
-    def check_routine(self, func):
+    def check_lines(self, failed, offset:int) -> list[int]:
+        """positions in _CommList of the entries that failed a check while
+        loading (failed, indices in the file), offset is the number of
+        entries placed before the first one, which are checked as well
+        """
+
+        lines = list(range(offset))
+        lines.extend(i + offset for i in failed)
+        return lines
+
+
+    def check_routine(self, func, lines=None, summary=''):
         """preformes a line-wise check, check function to be stated unter 
-        'func', needs to be a callable that returns (bool, str)"""
+        'func', needs to be a callable that returns (bool, str); lines
+        limits the check to these positions in _CommList; summary is added
+        to the warning, if there is one"""
         if not callable(func):
             raise TypeError(f"{func} is not callable!")
-        line = 0
+        if lines is None:
+            lines = range(len(self._CommList))
         warnings = 0
         chk_msg = ''
-        for Entry in self._CommList:
+        for line in lines:
+            Entry = self._CommList[line]
             line += 1
             result, msg = func(Entry)
             if not result:
@@ -689,6 +1045,33 @@ class LoadFileWorker(QObject):
                     )
                     break
         if chk_msg != '':
+            if summary:
+                chk_msg = f"{chk_msg.rstrip()}\nIn total: {summary}"
+            self.rangeChkWarning.emit(chk_msg)
+
+
+    def path_warnings(self, paths, offset:int, msg:str, summary='') -> None:
+        """warns about the paths of a LoadResult (path_range or
+        path_base_dist, index of the entry the path leads to), named by the
+        IDs of their start & end entry in _CommList; offset is the number
+        of entries in front of the loaded ones (start vector), summary is
+        added to the warning
+        """
+
+        chk_msg = ''
+        for warnings, i in enumerate(paths, start=1):
+            Start = self._CommList[i + offset - 1]
+            End = self._CommList[i + offset]
+            chk_msg += f"Path ID {Start.id} to {End.id}: {msg}\n"
+            if warnings >= du.DEF_WARN_MAX_RAISED:
+                chk_msg += (
+                    f"Maximum number of warnings reached, "
+                    f"stopping check.."
+                )
+                break
+        if chk_msg != '':
+            if summary:
+                chk_msg = f"{chk_msg.rstrip()}\nIn total: {summary}"
             self.rangeChkWarning.emit(chk_msg)
 
 
@@ -764,9 +1147,13 @@ class IPCamWorker(QObject):
 # LoadFileWorker:
 lfw_file_path = None
 lfw_line_id = 0
+lfw_stream = False
+lfw_streaming = False
+lfw_cancel = False
 lfw_ext_trail = True
 lfw_p_ctrl = False
 lfw_range_chk = True
 lfw_base_dist_chk = True
 lfw_running = False
+lfw_pre_check = False
 lfw_pre_run_time = 10
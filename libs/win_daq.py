@@ -103,40 +103,42 @@ class DAQWindow(QWidget, Ui_DAQWindow):
     def data_update(self) -> None:
         """data label update, signal from robo_recv"""
 
-        self.BASIC_disp_ambTemp.setText(f"{du.STTDataBlock.amb_temp} °C")
-        self.BASIC_disp_ambHum.setText(f"{du.STTDataBlock.amb_humidity} rH")
-        self.BASIC_disp_delivPumpTemp.setText(
-            f"{du.STTDataBlock.msp_temp} °C"
-        )
-        self.BASIC_disp_delivPumpPress.setText(
-            f"{du.STTDataBlock.msp_press} °C"
-        )
-        self.BASIC_disp_robBaseTemp.setText(f"{du.STTDataBlock.rb_temp} °C")
-        self.BASIC_disp_2kPumpTemp.setText(f"{du.STTDataBlock.imp_temp} °C")
-        self.BASIC_disp_2kPumpPress.setText(f"{du.STTDataBlock.imp_press} °C")
-
-        self.MOT_disp_pump1Freq.setText(f"{du.STTDataBlock.Pump1.freq} Hz")
-        self.MOT_disp_pump2Freq.setText(f"{du.STTDataBlock.Pump2.freq} Hz")
-        self.MOT_disp_pump1Volt.setText(f"{du.STTDataBlock.Pump1.volt} V")
-        self.MOT_disp_pump2Volt.setText(f"{du.STTDataBlock.Pump2.volt} V")
-        self.MOT_disp_pump1Amps.setText(f"{du.STTDataBlock.Pump1.amps} A")
-        self.MOT_disp_pump2Amps.setText(f"{du.STTDataBlock.Pump2.amps} A")
-        self.MOT_disp_pump1Torq.setText(f"{du.STTDataBlock.Pump1.torq} Nm")
-        self.MOT_disp_pump2Torq.setText(f"{du.STTDataBlock.Pump2.torq} Nm")
-        self.MOT_disp_admPumpFreq.setText(f"{du.STTDataBlock.asp_freq} Hz")
-        self.MOT_disp_admPumpAmps.setText(f"{du.STTDataBlock.asp_amps} A")
-        self.MOT_disp_2kPumpFreq.setText(f"{du.STTDataBlock.imp_freq} Hz")
-        self.MOT_disp_2kPumpAmps.setText(f"{du.STTDataBlock.imp_amps} A")
-
-        self.ROB_disp_id.setText(f"{du.STTDataBlock.Robo.id}")
-        self.ROB_disp_tcpSpeed.setText(f"{du.STTDataBlock.Robo.t_speed} mm/s")
-        self.ROB_disp_xPos.setText(f"{du.STTDataBlock.Robo.Coor.x} mm")
-        self.ROB_disp_yPos.setText(f"{du.STTDataBlock.Robo.Coor.y} mm")
-        self.ROB_disp_zPos.setText(f"{du.STTDataBlock.Robo.Coor.z} mm")
-        self.ROB_disp_xOri.setText(f"{du.STTDataBlock.Robo.Coor.rx} mm")
-        self.ROB_disp_yOri.setText(f"{du.STTDataBlock.Robo.Coor.ry} mm")
-        self.ROB_disp_zOri.setText(f"{du.STTDataBlock.Robo.Coor.rz} mm")
-        self.ROB_disp_extPos.setText(f"{du.STTDataBlock.Robo.Coor.ext}  mm")
+        # one snapshot instead of a validity check per label
+        snap = du.STTDataBlock.snapshot()
+        Robo = snap['Robo']
+        Pump1 = snap['Pump1']
+        Pump2 = snap['Pump2']
+
+        self.BASIC_disp_ambTemp.setText(f"{snap['amb_temp']} °C")
+        self.BASIC_disp_ambHum.setText(f"{snap['amb_humidity']} rH")
+        self.BASIC_disp_delivPumpTemp.setText(f"{snap['msp_temp']} °C")
+        self.BASIC_disp_delivPumpPress.setText(f"{snap['msp_press']} °C")
+        self.BASIC_disp_robBaseTemp.setText(f"{snap['rb_temp']} °C")
+        self.BASIC_disp_2kPumpTemp.setText(f"{snap['imp_temp']} °C")
+        self.BASIC_disp_2kPumpPress.setText(f"{snap['imp_press']} °C")
+
+        self.MOT_disp_pump1Freq.setText(f"{Pump1.freq} Hz")
+        self.MOT_disp_pump2Freq.setText(f"{Pump2.freq} Hz")
+        self.MOT_disp_pump1Volt.setText(f"{Pump1.volt} V")
+        self.MOT_disp_pump2Volt.setText(f"{Pump2.volt} V")
+        self.MOT_disp_pump1Amps.setText(f"{Pump1.amps} A")
+        self.MOT_disp_pump2Amps.setText(f"{Pump2.amps} A")
+        self.MOT_disp_pump1Torq.setText(f"{Pump1.torq} Nm")
+        self.MOT_disp_pump2Torq.setText(f"{Pump2.torq} Nm")
+        self.MOT_disp_admPumpFreq.setText(f"{snap['asp_freq']} Hz")
+        self.MOT_disp_admPumpAmps.setText(f"{snap['asp_amps']} A")
+        self.MOT_disp_2kPumpFreq.setText(f"{snap['imp_freq']} Hz")
+        self.MOT_disp_2kPumpAmps.setText(f"{snap['imp_amps']} A")
+
+        self.ROB_disp_id.setText(f"{Robo.id}")
+        self.ROB_disp_tcpSpeed.setText(f"{Robo.t_speed} mm/s")
+        self.ROB_disp_xPos.setText(f"{Robo.Coor.x} mm")
+        self.ROB_disp_yPos.setText(f"{Robo.Coor.y} mm")
+        self.ROB_disp_zPos.setText(f"{Robo.Coor.z} mm")
+        self.ROB_disp_xOri.setText(f"{Robo.Coor.rx} mm")
+        self.ROB_disp_yOri.setText(f"{Robo.Coor.ry} mm")
+        self.ROB_disp_zOri.setText(f"{Robo.Coor.rz} mm")
+        self.ROB_disp_extPos.setText(f"{Robo.Coor.ext}  mm")
 
 
     def new_path(self) -> None:
@@ -208,41 +210,47 @@ class DAQWindow(QWidget, Ui_DAQWindow):
         signal from (robo_recv or sensor_cycle?) 
         """
 
+        # one snapshot instead of a validity check per field
+        snap = du.STTDataBlock.snapshot()
+        Robo = snap['Robo']
+        Pump1 = snap['Pump1']
+        Pump2 = snap['Pump2']
+
         # upload to TCP Influx server
         now = datetime.now().strftime('%Y-%m-%d    %H:%M:%S')
         DBEntry = influxdb_client\
             .Point(now)\
             .tag("session:", du.DB_session)\
-            .field("Amb. temp.", du.STTDataBlock.amb_temp)\
-            .field("Amb. humid.", du.STTDataBlock.amb_humidity)\
-            .field("MSP temp.", du.STTDataBlock.msp_temp)\
-            .field("MSP press.", du.STTDataBlock.msp_press)\
-            .field("ASP freq.", du.STTDataBlock.asp_freq)\
-            .field("ASP amps.", du.STTDataBlock.asp_amps)\
-            .field("RB temp.", du.STTDataBlock.rb_temp)\
-            .field("IMP temp.", du.STTDataBlock.imp_temp)\
-            .field("IMP press.", du.STTDataBlock.imp_press)\
-            .field("IMP freq.", du.STTDataBlock.imp_freq)\
-            .field("IMP amps.", du.STTDataBlock.imp_amps)\
+            .field("Amb. temp.", snap['amb_temp'])\
+            .field("Amb. humid.", snap['amb_humidity'])\
+            .field("MSP temp.", snap['msp_temp'])\
+            .field("MSP press.", snap['msp_press'])\
+            .field("ASP freq.", snap['asp_freq'])\
+            .field("ASP amps.", snap['asp_amps'])\
+            .field("RB temp.", snap['rb_temp'])\
+            .field("IMP temp.", snap['imp_temp'])\
+            .field("IMP press.", snap['imp_press'])\
+            .field("IMP freq.", snap['imp_freq'])\
+            .field("IMP amps.", snap['imp_amps'])\
             \
-            .field("P1 freq.", du.STTDataBlock.Pump1.freq)\
-            .field("P1 volt", du.STTDataBlock.Pump1.volt)\
-            .field("P1 amps.", du.STTDataBlock.Pump1.amps)\
-            .field("P1 torq.", du.STTDataBlock.Pump1.torq)\
-            .field("P2 freq.", du.STTDataBlock.Pump2.freq)\
-            .field("P2 volt", du.STTDataBlock.Pump2.volt)\
-            .field("P2 amps.", du.STTDataBlock.Pump2.amps)\
-            .field("P2 torq.", du.STTDataBlock.Pump2.torq)\
+            .field("P1 freq.", Pump1.freq)\
+            .field("P1 volt", Pump1.volt)\
+            .field("P1 amps.", Pump1.amps)\
+            .field("P1 torq.", Pump1.torq)\
+            .field("P2 freq.", Pump2.freq)\
+            .field("P2 volt", Pump2.volt)\
+            .field("P2 amps.", Pump2.amps)\
+            .field("P2 torq.", Pump2.torq)\
             \
-            .field("ROB ID", du.STTDataBlock.Robo.id)\
-            .field("ROB TCP", du.STTDataBlock.Robo.t_speed)\
-            .field("ROB X", du.STTDataBlock.Robo.Coor.x)\
-            .field("ROB Y", du.STTDataBlock.Robo.Coor.y)\
-            .field("ROB Z", du.STTDataBlock.Robo.Coor.z)\
-            .field("ROB RX", du.STTDataBlock.Robo.Coor.rx)\
-            .field("ROB RY", du.STTDataBlock.Robo.Coor.ry)\
-            .field("ROB RZ", du.STTDataBlock.Robo.Coor.rz)\
-            .field("ROB EXT", du.STTDataBlock.Robo.Coor.ext)
+            .field("ROB ID", Robo.id)\
+            .field("ROB TCP", Robo.t_speed)\
+            .field("ROB X", Robo.Coor.x)\
+            .field("ROB Y", Robo.Coor.y)\
+            .field("ROB Z", Robo.Coor.z)\
+            .field("ROB RX", Robo.Coor.rx)\
+            .field("ROB RY", Robo.Coor.ry)\
+            .field("ROB RZ", Robo.Coor.rz)\
+            .field("ROB EXT", Robo.Coor.ext)
         
         try: #to-do: write a non-blocking entry post routine, this one waits for 500ms timeout
             self.db_connection.write(
@@ -39,6 +39,7 @@ from libs.win_dialogs import strd_dialog, file_dialog
 from libs.pump_utilities import default_mode as PU_def_mode
 import libs.threads as workers
 import libs.data_utilities as du
+import libs.code_parser as cp
 import libs.func_utilities as fu
 
 # import interface for Toshiba frequency modulator by M-TEC
@@ -514,12 +515,16 @@ class Mainframe(PreMainframe):
                 self.CONN_ROB_indi_connected,
                 self.ROB_group
             )
+            # the worker disables & deletes its socket notifier once the
+            # thread has finished (RoboCommWorker.stop), so the socket is
+            # closed after that; a reconnect starts a new worker, which
+            # arms a new notifier on the new socket
             self._RoboCommThread.quit()
+            self._RoboCommThread.wait()
             du.ROBTcp.close()
 
-            # safe data & wait for thread:
+            # safe data
             _save_reset_positions()
-            self._RoboCommThread.wait()
 
         # PUMP DISCONNECT
         def pmp_disconnect(
@@ -607,6 +612,7 @@ class Mainframe(PreMainframe):
             self._RoboCommWorker.dataReceived.connect(self.label_update_on_terminal_change)
             self._RoboCommWorker.endDcMoving.connect(lambda: self.switch_rob_moving(end=True))
             self._RoboCommWorker.queueEmtpy.connect(lambda: self.stop_SCTRL_queue(prep_end=True))
+            self.robWake.connect(self._RoboCommWorker.wake)
 
         def pmp_thread_connector():
             # thread for communication with pumps & inline mixer
@@ -645,7 +651,14 @@ class Mainframe(PreMainframe):
             self._LoadFileThread.destroyed.connect(self._LoadFileWorker.deleteLater)
             self._LoadFileWorker.convFailed.connect(self.load_file_failed)
             self._LoadFileWorker.convFinished.connect(self.load_file_finished)
+            self._LoadFileWorker.convProgress.connect(self.load_file_progress)
+            self._LoadFileWorker.streamProgress.connect(
+                self.load_file_stream_progress
+            )
             self._LoadFileWorker.rangeChkWarning.connect(self.load_file_range_warning)
+            self._LoadFileWorker.preCheckFinished.connect(
+                self.open_file_finished
+            )
 
             # thread for communication with sensor array
             self.log_entry('THRT', 'initializing SensorComm thread..')
@@ -694,8 +707,8 @@ class Mainframe(PreMainframe):
     ##########################################################################
 
     def open_file(self, testrun=False, testpath=None) -> None:
-        """prompts the user with a file dialog and estimates printing
-        parameters in given file
+        """prompts the user with a file dialog, the file is loaded & checked
+        by loadFileWorker, see open_file_finished
         """
 
         # get file path and content
@@ -714,15 +727,43 @@ class Mainframe(PreMainframe):
             self.IO_disp_filename.setText('no file selected')
             du.IO_curr_filepath = None
             return
-        with open(file_path, 'r') as file:
-            txt = file.read()
-        file.close()
+        if workers.lfw_running:
+            self.IO_disp_filename.setText('FILE LOADER BUSY!')
+            return
+
+        # get number of commands and filament length; the file is converted
+        # & checked in the same pass, load_file reuses the cached result
+        self.IO_disp_filename.setText('... checking file ...')
+        with QMutexLocker(GlobalMutex):
+            workers.lfw_file_path = file_path
+            workers.lfw_ext_trail = self.IO_chk_extTrailing.isChecked()
+            workers.lfw_pre_check = True
+
+        if testrun:
+            self._LoadFileWorker.run()
+        else:
+            self._LoadFileThread.start()
+
+
+    def open_file_finished(
+            self,
+            file_path:Path,
+            Result:cp.LoadResult | Exception,
+    ) -> None:
+        """handles preCheckFinished emit from loadFileWorker, displays the
+        estimated printing parameters
+        """
 
-        # get number of commands and filament length
-        if file_path.suffix == '.mod':
-            comm_num, skips, fil_length, res = fu.pre_check_rapid_file(txt)
+        # reset THREADS vars and exit
+        with QMutexLocker(GlobalMutex):
+            workers.lfw_file_path = None
+        if self._LoadFileThread.isRunning():
+            self._LoadFileThread.exit()
+
+        if isinstance(Result, Exception):
+            comm_num, res = Result, ''
         else:
-            comm_num, skips, fil_length, res = fu.pre_check_gcode_file(txt)
+            comm_num, skips, fil_length, res = Result.pre_check()
 
         if isinstance(comm_num, Exception):
             self.IO_disp_filename.setText('UNREADABLE FILE!')
@@ -751,6 +792,24 @@ class Mainframe(PreMainframe):
                 f"{skips} lines skipted, {fil_length}m filament, {fil_vol}L"
             ),
         )
+        if Result.bounds is not None:
+            Min, Max = Result.bounds
+            self.log_entry(
+                'F-IO',
+                (
+                    f"Bounding box: X {Min.x} - {Max.x}, Y {Min.y} - "
+                    f"{Max.y}, Z {Min.z} - {Max.z}, EXT {Min.ext} - "
+                    f"{Max.ext}"
+                ),
+            )
+            for summary in [
+                    Result.range_summary,
+                    Result.base_summary,
+                    Result.path_range_summary,
+                    Result.path_base_summary,
+            ]:
+                if summary:
+                    self.log_entry('F-IO', summary)
         du.IO_curr_filepath = file_path
 
 
@@ -792,6 +851,7 @@ class Mainframe(PreMainframe):
             workers.lfw_p_ctrl = p_ctrl
             workers.lfw_range_chk = range_chk
             workers.lfw_base_dist_chk = xy_ext_chk
+            workers.lfw_stream = du.IO_stream_load
 
         if not testrun:
             self._LoadFileThread.start()
@@ -823,6 +883,23 @@ class Mainframe(PreMainframe):
         self._LoadFileThread.exit()
 
 
+    def load_file_progress(self, done:int, chunks:int) -> None:
+        """handles convProgress emit from loadFileWorker"""
+
+        self.IO_lbl_loadFile.setText(
+            f"... conversion running ({done}/{chunks}) ..."
+        )
+
+
+    def load_file_stream_progress(self, entries:int, rate:float) -> None:
+        """handles streamProgress emit from loadFileWorker"""
+
+        self.IO_lbl_loadFile.setText(
+            f"... streaming: {entries} commands added ({rate:.0f} lines/s)"
+        )
+        self.SCTRL_disp_elemInQ.setText(str(len(du.SCQueue)))
+
+
     def load_file_finished(
             self,
             line_id:int,
@@ -1360,6 +1437,7 @@ class Mainframe(PreMainframe):
         # pass command to sendList
         with QMutexLocker(GlobalMutex):
             du.ROB_send_list.append((command, dc))
+        self.robWake.emit()
 
 
     ##########################################################################
@@ -1617,6 +1695,12 @@ class Mainframe(PreMainframe):
             self._IPCamThread.quit()
             self._IPCamThread.wait()
 
+        # stop a streaming file load waiting for SCQueue
+        if self._LoadFileThread.isRunning():
+            workers.lfw_cancel = True
+            self._LoadFileThread.quit()
+            self._LoadFileThread.wait()
+
         # disconnect everything
         self.disconnect_device('ROB', internal_call=True)
         self.disconnect_device('P1', internal_call=True)
@@ -70,6 +70,9 @@ class PreMainframe(QMainWindow, Ui_MainWindow):
     _P2RecvWd = None
     _PRHRecvWd = None
 
+    # tells RoboCommWorker that there is something new to send
+    robWake = pyqtSignal()
+
     #########################################################################
     #                                  SETUP                                #
     #########################################################################
@@ -825,6 +828,7 @@ class PreMainframe(QMainWindow, Ui_MainWindow):
             du.SC_q_processing = True
             du.SC_q_prep_end = False
         self.switch_rob_moving()
+        self.robWake.emit()
         self.log_entry("ComQ", "queue processing started")
 
         # update GUI
@@ -6,16 +6,273 @@
 
 ############################     IMPORTS     ################################
 
-import serial
-import math
 import time
+import queue
+import serial
+import struct
+import threading
+
+from concurrent.futures import Future
+# the same as the builtin TimeoutError only from Python 3.11 on
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import lru_cache
+
+
+
+###########################     FUNCTIONS     ###############################
+
+def _crc_table() -> tuple:
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            if (crc & 0x0001) != 0:
+                crc = (crc >> 1) ^ 0xA001
+            else:
+                crc >>= 1
+        table.append(crc)
+    return tuple(table)
+
+
+_CRC_TABLE = _crc_table()
+
+# ID, type, address/parameter, value
+_REQUEST = struct.Struct('>BBHH')
+
+
+def crc16(data) -> bytes:
+    """modbus CRC of data, as the 2 bytes sent on the wire (low byte first);
+    a frame with its CRC appended gives two zero bytes
+    """
+
+    crc = 0xFFFF
+    table = _CRC_TABLE
+    for byte in data:
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+
+    return crc.to_bytes(2, 'little')
+
+
+@lru_cache(maxsize=1024)
+def build_frame(inverter_id:int, function:int, address:int, value:int):
+    """returns the complete request frame incl. CRC, cached as the pumps
+    only ever send a few hundred different requests
+    """
+
+    frame = bytearray(_REQUEST.size + 2)
+    _REQUEST.pack_into(frame, 0, inverter_id, function, address, value)
+    frame[-2:] = crc16(memoryview(frame)[:-2])
+    return bytes(frame)
+
+
+@lru_cache(maxsize=1024)
+def hex_frame(data:str) -> tuple[bytes, str]:
+    """returns the frame and its hex string (both incl. CRC) for a request
+    given as hex string without CRC
+    """
+
+    if len(data) == 12:
+        frame = build_frame(*_REQUEST.unpack(bytes.fromhex(data)))
+    else:
+        frame = bytes.fromhex(data)
+        frame += crc16(frame)
+    return frame, frame.hex().upper()
+
+
+@lru_cache(maxsize=1024)
+def command_frame(
+        inverter_id:str,
+        parameter:str,
+        value:int,
+) -> tuple[bytes, str]:
+    """as hex_frame, for inverter ID & parameter (type + address) given as
+    hex strings and an int value
+    """
+
+    frame = build_frame(
+        int(inverter_id, 16),
+        int(parameter[:2], 16),
+        int(parameter[2:], 16),
+        value,
+    )
+    return frame, frame.hex().upper()
 
 
 
 ############################     CLASSES     ################################
 
+class MtecBus:
+    """request queue for one serial port, shared by all inverters on it;
+    a single bus thread writes one request at a time and reads the whole
+    reply frame with the ports timeout (no polling), callers get a Future
+    per request and may queue several before waiting on any of them
+
+    ATTRIBUTES:
+        serial:
+            pyserial port, only touched by the bus thread once started
+        timeout:
+            max time to wait for each part of a reply frame [s]
+        RESP_TIMEOUT:
+            max time a synchronous caller waits for its Future [s]
+
+    METHODS:
+        of:
+            returns the bus of a serial port, creates it if needed
+        submit:
+            queues a request frame, returns a Future resolving to the
+            replies payload bytes, i.e. the register values of a read or
+            the written value of a write (None on timeout, bad CRC or
+            error reply)
+        utilisation:
+            share of time the bus was busy since the last call
+        close:
+            stops the bus thread
+    """
+
+    RESP_TIMEOUT = 2.0
+    _buses = {}
+    _buses_lock = threading.Lock()
+
+    def __init__(self, serial_port, timeout=0.2) -> None:
+        self.serial = serial_port
+        self.timeout = timeout
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._busy = 0.0
+        self._busy_since = time.monotonic()
+        self._busy_lock = threading.Lock()
+
+
+    @classmethod
+    def of(cls, serial_port) -> 'MtecBus':
+        with cls._buses_lock:
+            bus = cls._buses.get(id(serial_port))
+            if bus is None or bus.serial is not serial_port:
+                bus = cls(serial_port)
+                cls._buses[id(serial_port)] = bus
+            return bus
+
+
+    def submit(self, frame:bytes) -> Future:
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name='MtecBus', daemon=True
+                )
+                self._thread.start()
+
+        fut = Future()
+        self._queue.put((frame, fut))
+        return fut
+
+
+    def utilisation(self) -> float:
+        """returns the share of time spent on requests (from write until
+        the reply is read or timed out) since the last call, 1.0 means the
+        bus has no headroom left
+        """
+
+        now = time.monotonic()
+        with self._busy_lock:
+            busy, self._busy = self._busy, 0.0
+            since, self._busy_since = self._busy_since, now
+        if now <= since:
+            return 0.0
+        return min(busy / (now - since), 1.0)
+
+
+    def close(self) -> None:
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                self._queue.put(None)
+                self._thread.join(self.RESP_TIMEOUT)
+            self._thread = None
+
+
+    def _run(self) -> None:
+        self.serial.timeout = self.timeout
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            frame, fut = job
+            if not fut.set_running_or_notify_cancel():
+                continue
+            start = time.monotonic()
+            try:
+                fut.set_result(self._exchange(frame))
+            except Exception as e:
+                fut.set_exception(e)
+            with self._busy_lock:
+                self._busy += time.monotonic() - start
+
+
+    def _exchange(self, frame:bytes) -> bytes | None:
+        """writes frame, reads the reply frame in at most three reads:
+        header (ID, type), length byte for reads, then the rest
+        """
+
+        ser = self.serial
+        # drop leftovers of timed out requests, they would shift every
+        # following reply by one
+        ser.reset_input_buffer()
+        ser.write(frame)
+
+        head = ser.read(2)
+        if len(head) < 2:
+            print("MtecMod: timeout on read")
+            return None
+
+        message_type = head[1]
+        if message_type == 3:  # Type: read
+            length = ser.read(1)
+            if len(length) < 1:
+                print("MtecMod: timeout on read")
+                return None
+            head += length
+            rest_len = length[0] + 2
+        elif message_type == 6:  # Type: send
+            rest_len = 8 - 2
+        elif message_type & 0x80:  # error reply: code, checksum
+            rest_len = 3
+        else:
+            print(f"MtecMod: unknown reply type {message_type}")
+            return None
+
+        rest = ser.read(rest_len)
+        if len(rest) < rest_len:
+            print("MtecMod: timeout on read")
+            return None
+
+        reply = head + rest
+        if crc16(reply) != b'\x00\x00':
+            print("bad crc")
+            return None
+        if head[0] != frame[0] or message_type & 0x80:
+            return None
+
+        if message_type == 3:
+            return reply[3:-2]
+        return reply[4:6]
+
+
+
 class MtecMod:
-    def __init__(self, serial_bus_def=None, inverter_id="01") -> None:
+    # telemetry values and their registers, all scaled by 100
+    TELEMETRY_REGS = {
+        'freq': 0xFD00,
+        'volt': 0xFD05,
+        'amps': 0xFD03,
+        'torq': 0xFD18,
+    }
+
+    def __init__(
+            self,
+            serial_bus_def=None,
+            inverter_id="01",
+            telem_type=None,
+    ) -> None:
         self.settings_inverter_id = inverter_id
         self.settings_keepAlive_command = "03FD000001"
         self.settings_keepAlive_active = True
@@ -27,11 +284,23 @@ class MtecMod:
         self.settings_serial_parity = serial.PARITY_NONE
         self.settings_serial_port = 'COM3'
 
-        self.temp_sendBuffer = []
-        self.temp_valueBuffer = []
-        self.temp_readBuffer = []
-        self.temp_sendReady = False
+        # block reads: registers further apart than max_gap are read in
+        # separate requests (2 bytes per register vs. ~13 bytes framing per
+        # request), max_regs is the most the inverter answers in one read
+        self.settings_block_max_gap = 6
+        self.settings_block_max_regs = 16
+        # values that change slowly are only read every slow_interval [s]
+        self.settings_telem_slow = ('volt', 'torq')
+        self.settings_telem_slow_interval = 2.0
+        # read_telemetry returns telem_type(freq, volt, amps, torq),
+        # or a plain tuple if None
+        self.settings_telem_type = telem_type
+
         self.temp_lastSpeed = 0
+        self.temp_telem = dict.fromkeys(self.TELEMETRY_REGS)
+        self.temp_telemSlowDue = 0.0
+
+        self.bus = None
 
         self.connected = False
 
@@ -49,8 +318,8 @@ class MtecMod:
             else:
                 self.serial = self.serial_default
             
+            self.bus = MtecBus.of(self.serial)
             self.connected = True
-            self.temp_sendReady = True
             try:
                 if self.frequency is None:
                     raise ConnectionError()
@@ -62,149 +331,83 @@ class MtecMod:
 
     def disconnect(self) -> None:
         self.connected = False
-        self.temp_sendReady = False
 
 
 ###########################     SEND COMs     ###############################
 
     def sendCommand(self, parameter, value):
-        return self.sendHexCommand(
-            self.settings_inverter_id + parameter + self.int2hex(value, 4)
-        )
+        return self.waitFor(*self.submitCommand(parameter, value))
 
 
     def sendHexCommand(self, data):
-        crc = self.calcCRC(data)
-        command = data + crc
+        return self.waitFor(*self.submitHexCommand(data))
 
-        self.temp_sendBuffer.append(command)
-        return self.sendHex()
 
+    def submitCommand(self, parameter, value):
+        """queues the command on the bus without waiting for the reply,
+        returns (command, Future), see MtecBus.submit
+        """
 
-    def sendHex(self):
-        if self.temp_sendReady and len(self.temp_sendBuffer) > 0:
-            command = self.temp_sendBuffer.pop()
-            self.send(command)
-            self.temp_sendReady = True
-            if len(self.temp_valueBuffer) > 0:
-                return command, self.temp_valueBuffer.pop()
-            else:
-                return command, None
-        else:
+        if not self.connected:
             return None, None
 
-
-    def keepAlive(self):
-        command = self.settings_keepAlive_command
-        return self.sendHexCommand(self.settings_inverter_id + command)
+        frame, command = command_frame(
+            self.settings_inverter_id, parameter, value
+        )
+        return command, self.bus.submit(frame)
 
 
-    def send(self, command):
+    def submitHexCommand(self, data):
         if not self.connected:
-            return None
-
-        self.temp_sendReady = False
-        self.serial.write(bytes.fromhex(command))
-        self.waitForResponse()
-
+            return None, None
 
-############################     RECEIVE     ################################
+        frame, command = hex_frame(data)
+        return command, self.bus.submit(frame)
 
-    def waitForResponse(self):
-        command = ""
-        timeout = time.time_ns() + (200 * 1000 * 1000)  # 200ms
 
-        while True:
-            if self.connected == False:
-                print("Receive error: serial partner disconnected")
-                return False
-            if self.serial.inWaiting() >= 2:
-                break
-            if time.time_ns() > timeout:
-                print("MtecMod: timeout on read")
-                print(self.serial.read(self.serial.inWaiting()))
-                return False
+    def submitFrame(self, function, address, value):
+        """binary version of submitCommand, returns the Future only"""
 
-        message_fcID = int.from_bytes(self.serial.read(1), "little")
-        command += self.int2hex(message_fcID, 2)
-        message_type = int.from_bytes(self.serial.read(1), "little")
-        command += self.int2hex(message_type, 2)
+        if not self.connected:
+            return None
 
-        completeDataLength = 0
-        if message_type == 3:  # Type: read
-            message_length = int.from_bytes(self.serial.read(1), "little")
-            command += self.int2hex(message_length, 2)
-            completeDataLength = (
-                3 + message_length + 2 - 3
-            )  # ID, Type, Length, <Length>, checksum, checksum - alreadyRead
+        return self.bus.submit(
+            build_frame(
+                int(self.settings_inverter_id, 16), function, address, value
+            )
+        )
 
-        elif message_type == 6:  # Type: send
-            completeDataLength = 8 - 2  # 8 - alreadyRead
 
-        while True:
-            if self.serial.inWaiting() >= completeDataLength:
-                break
-            if time.time_ns() > timeout:
-                print("MtecMod: timeout on read")
-                print(self.serial.read(self.serial.inWaiting()))
-                return False
+    def waitFor(self, command, fut):
+        """waits for the reply to a submitted command, returns (command,
+        value) like sendCommand
+        """
 
-        if message_type == 3:  # Type: read
-            message_value = 0
-            for i in range(message_length):
-                message_value *= 256
-                m = int.from_bytes(self.serial.read(1), "little")
-                message_value += m
-                command += self.int2hex(m, 2)
+        if fut is None:
+            return None, None
+        try:
+            payload = fut.result(MtecBus.RESP_TIMEOUT)
+        except FutureTimeoutError:
+            fut.cancel()
+            return command, None
+        if payload is None:
+            return command, None
+        return command, int.from_bytes(payload, 'big')
 
-        elif message_type == 6:  # Type: send
-            message_param = self.int2hex(
-                int.from_bytes(self.serial.read(1), "little"), 2
-            ) + self.int2hex(int.from_bytes(self.serial.read(1), "little"), 2)
-            command += message_param
-            message_value0 = int.from_bytes(self.serial.read(1), "little")
-            message_value1 = int.from_bytes(self.serial.read(1), "little")
-            message_value = message_value0 * 256 + message_value1
-            command += self.int2hex(message_value, 4)
-
-        message_crc = self.int2hex(
-            int.from_bytes(self.serial.read(1), "little"), 2
-        ) + self.int2hex(int.from_bytes(self.serial.read(1), "little"), 2)
-
-        if self.calcCRC(command) != message_crc:
-            # ToDo: bad CRC
-            print("bad crc")
-            return False
 
-        self.temp_valueBuffer.append(message_value)
-        self.temp_sendReady = True
-        return True
+    def keepAlive(self):
+        command = self.settings_keepAlive_command
+        return self.sendHexCommand(self.settings_inverter_id + command)
 
 
 ########################     COM PREPARATION     ############################
 
     def int2hex(self, value, length):
-        s = hex(value)[2:]
-        while len(s) < length:
-            s = "0" + s
-        return s.upper()
+        return f"{value:0{length}X}"
 
 
     def calcCRC(self, command):
-        buffer = bytearray.fromhex(command)
-        crc = 0xFFFF
-
-        for pos in range(len(buffer)):
-            crc ^= buffer[pos]
-            for k in range(8):
-                i = 8 - k
-                if (crc & 0x0001) != 0:
-                    crc >>= 1
-                    crc ^= 0xA001
-                else:
-                    crc >>= 1
-
-        return self.int2hex((crc % 256) * 256 + math.floor(crc / 256), 4)
+        return crc16(bytes.fromhex(command)).hex().upper()
 
 
 ########################     EASY TO USE FUNC     ############################
@@ -228,22 +431,137 @@ class MtecMod:
     def set_speed(self, value):
 
         ans = None
-        if value != self.temp_lastSpeed:
-
-            if value == 0:
-                ans = self.stop()
-            else:
-                if value < 0 and not self.temp_lastSpeed < 0:
-                    ans = self.start_reverse()
-                elif value > 0 and not self.temp_lastSpeed > 0:
-                    ans = self.start()
-
-            ans = self.sendCommand("06FA01", abs(value) * 100)
+        for data in self.speedCommands(value):
+            ans = self.sendHexCommand(data)
 
         self.temp_lastSpeed = value
         return ans
 
 
+    def speedCommands(self, value):
+        """returns the requests (hex, without CRC) set_speed sends to get
+        from the last speed to value, empty if it did not change
+        """
+
+        if value == self.temp_lastSpeed:
+            return []
+
+        commands = []
+        if value == 0:
+            commands.append(self.settings_inverter_id + "06FA000000")
+        elif value < 0 and not self.temp_lastSpeed < 0:
+            commands.append(self.settings_inverter_id + "06FA00C600")
+        elif value > 0 and not self.temp_lastSpeed > 0:
+            commands.append(self.settings_inverter_id + "06FA00C400")
+
+        freq = self.int2hex(abs(value) * 100, 4)
+        commands.append(self.settings_inverter_id + "06FA01" + freq)
+        return commands
+
+
+    def planBlocks(self, addresses):
+        """groups register addresses into as few (start, count) block reads
+        as the gap and length limits allow
+        """
+
+        blocks = []
+        for addr in sorted(set(addresses)):
+            if blocks:
+                start, count = blocks[-1]
+                gap = addr - (start + count)
+                new_count = addr - start + 1
+                if (
+                        gap <= self.settings_block_max_gap
+                        and new_count <= self.settings_block_max_regs
+                ):
+                    blocks[-1] = (start, new_count)
+                    continue
+            blocks.append((addr, 1))
+        return blocks
+
+
+    def telemetryBlocks(self):
+        """returns the (start, count) block reads the next requestTelemetry
+        will send
+        """
+
+        names = [
+            name for name in self.TELEMETRY_REGS
+            if name not in self.settings_telem_slow
+        ]
+        if time.monotonic() >= self.temp_telemSlowDue:
+            names += self.settings_telem_slow
+
+        return self.planBlocks([self.TELEMETRY_REGS[name] for name in names])
+
+
+    def requestTelemetry(self):
+        """queues the block reads for frequency and current, plus voltage
+        and torque if due, returns the pending reads for collectTelemetry
+        (None if not connected)
+        """
+
+        if not self.connected:
+            return None
+
+        now = time.monotonic()
+        blocks = self.telemetryBlocks()
+        if now >= self.temp_telemSlowDue:
+            self.temp_telemSlowDue = now + self.settings_telem_slow_interval
+
+        return [
+            (start, count, self.submitFrame(3, start, count))
+            for start, count in blocks
+        ]
+
+
+    def collectTelemetry(self, pending):
+        """waits for the reads of requestTelemetry, returns frequency,
+        voltage, current and torque as settings_telem_type; values not
+        read in this cycle are taken from the last one; None if a read
+        failed
+        """
+
+        if pending is None:
+            return None
+
+        failed = False
+        for start, count, fut in pending:
+            try:
+                data = fut.result(MtecBus.RESP_TIMEOUT)
+            except FutureTimeoutError:
+                fut.cancel()
+                data = None
+            if data is None or len(data) != 2 * count:
+                failed = True
+                continue
+
+            for name, addr in self.TELEMETRY_REGS.items():
+                if start <= addr < start + count:
+                    i = 2 * (addr - start)
+                    val = int.from_bytes(data[i : i + 2], 'big')
+                    self.temp_telem[name] = val / 100
+
+        if failed:
+            # read everything again next cycle
+            self.temp_telemSlowDue = 0.0
+            return None
+        values = tuple(self.temp_telem.values())
+        if None in values:
+            return None
+        if self.settings_telem_type is None:
+            return values
+        return self.settings_telem_type(*values)
+
+
+    def read_telemetry(self):
+        """reads the telemetry in as few requests as possible, see
+        requestTelemetry & collectTelemetry
+        """
+
+        return self.collectTelemetry(self.requestTelemetry())
+
+
 ###########################     PROPERTIES     ###############################
 
     @property
@@ -307,3 +625,202 @@ class MtecMod:
     @torque.setter
     def torque(self, value):
         raise Exception("torque not setable")
+
+
+
+class MtecScheduler:
+    """sits in front of the inverters on one bus and decides once per cycle
+    what is sent: stops jump the queue, only the latest speed per inverter
+    is written, keep-alives are dropped for inverters that got any other
+    frame this cycle; everything but stops has to fit into budget, the
+    rest waits for the next cycle
+
+    ATTRIBUTES:
+        budget:
+            bus time per cycle [s]
+        turnaround:
+            time the inverter needs to start its reply [s]
+        char_time:
+            time for one byte on the wire [s]
+        metrics:
+            queue_depth (entries waiting after the last cycle), merged
+            (frames made redundant by newer ones), dropped (speeds
+            overridden by a stop), deferred (frames moved to the next
+            cycle by the budget), sent, worst_latency (request until
+            reply) [s]
+
+    METHODS:
+        set_speed, keep_alive:
+            queue a command for an inverter (MtecMod), speed 0 is a stop
+        run:
+            sends the commands of one cycle (+ telemetry reads)
+        frame_time:
+            estimated bus time of one request/reply pair [s]
+    """
+
+    def __init__(
+            self,
+            budget=0.2,
+            turnaround=0.005,
+            baud=19200,
+            stop_bits=2,
+    ) -> None:
+        self.budget = budget
+        self.turnaround = turnaround
+        self.char_time = (1 + 8 + stop_bits) / baud
+
+        self._stops = []
+        self._speeds = {}
+        self._alive = {}
+        self.metrics = {
+            'queue_depth': 0,
+            'merged': 0,
+            'dropped': 0,
+            'deferred': 0,
+            'sent': 0,
+            'worst_latency': 0.0,
+        }
+
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._stops) + len(self._speeds) + len(self._alive)
+
+
+    def frame_time(self, request_len=8, reply_len=8) -> float:
+        return (request_len + reply_len) * self.char_time + self.turnaround
+
+
+    def set_speed(self, Pump, value) -> None:
+        """speed 0 is queued as stop, a speed equal to the last one sent
+        only cancels pending changes
+        """
+
+        if value == 0:
+            if Pump.temp_lastSpeed != 0 or Pump in self._speeds:
+                self._queue_stop(Pump, Pump.speedCommands(0) or [], value)
+            return
+
+        if Pump in self._speeds:
+            self.metrics['merged'] += 1
+            queued = self._speeds[Pump][1]
+            if value == Pump.temp_lastSpeed:
+                del self._speeds[Pump]
+                return
+        elif value == Pump.temp_lastSpeed:
+            return
+        else:
+            queued = time.monotonic()
+        self._speeds[Pump] = (value, queued)
+
+
+    def keep_alive(self, Pump) -> None:
+        if Pump in self._alive:
+            self.metrics['merged'] += 1
+        else:
+            self._alive[Pump] = time.monotonic()
+
+
+    def _queue_stop(self, Pump, commands, value=None) -> None:
+        if Pump in self._speeds:
+            del self._speeds[Pump]
+            self.metrics['dropped'] += 1
+        for i, (Queued, queued_cmds, _, queued) in enumerate(self._stops):
+            if Queued is Pump and queued_cmds == commands:
+                self.metrics['merged'] += 1
+                self._stops[i] = (Pump, commands, value, queued)
+                return
+        self._stops.append((Pump, commands, value, time.monotonic()))
+
+
+    def run(self, telemetry=()) -> tuple[dict, dict]:
+        """sends stops, speeds, telemetry reads for the inverters given and
+        keep-alives, in that order, as long as the budget allows; waits
+        for the speed replies, not for the telemetry
+
+        returns:
+            {MtecMod: (speed, command, value)} for every speed written
+            (incl. speed 0), {MtecMod: pending reads for collectTelemetry}
+        """
+
+        spent = 0.0
+        write_time = self.frame_time()
+        touched = set()
+        sent = []
+
+        def submit(Pump, commands, value, queued, wait=True) -> None:
+            last = None
+            for data in commands:
+                command, fut = Pump.submitHexCommand(data)
+                if fut is not None:
+                    last = (command, fut)
+                    self.metrics['sent'] += 1
+            if last is None:
+                return
+            touched.add(Pump)
+            if wait:
+                sent.append((Pump, value, queued, *last))
+
+        # stops always go out, whatever the budget says
+        for Pump, commands, value, queued in self._stops:
+            submit(Pump, commands, value, queued)
+            spent += len(commands) * write_time
+            Pump.temp_lastSpeed = 0
+        self._stops = []
+
+        for Pump, (value, queued) in list(self._speeds.items()):
+            commands = Pump.speedCommands(value)
+            cost = len(commands) * write_time
+            if spent + cost > self.budget:
+                self.metrics['deferred'] += 1
+                continue
+            del self._speeds[Pump]
+            submit(Pump, commands, value, queued)
+            spent += cost
+            Pump.temp_lastSpeed = value
+
+        pending = {}
+        for Pump in telemetry:
+            cost = sum(
+                self.frame_time(8, 5 + 2 * count)
+                for _, count in Pump.telemetryBlocks()
+            )
+            if spent + cost > self.budget:
+                self.metrics['deferred'] += 1
+                continue
+            pending[Pump] = Pump.requestTelemetry()
+            if pending[Pump] is not None:
+                touched.add(Pump)
+            spent += cost
+
+        # any frame keeps the inverter alive
+        for Pump, queued in list(self._alive.items()):
+            if Pump in touched:
+                self.metrics['merged'] += 1
+            elif spent + write_time > self.budget:
+                self.metrics['deferred'] += 1
+                continue
+            else:
+                keep_alive = Pump.settings_inverter_id + "03FD000001"
+                submit(Pump, [keep_alive], None, queued, wait=False)
+                spent += write_time
+            del self._alive[Pump]
+
+        results = {}
+        for Pump, value, queued, command, fut in sent:
+            try:
+                payload = fut.result(MtecBus.RESP_TIMEOUT)
+            except FutureTimeoutError:
+                fut.cancel()
+                payload = None
+            latency = time.monotonic() - queued
+            if latency > self.metrics['worst_latency']:
+                self.metrics['worst_latency'] = latency
+            if value is None:
+                continue
+            if payload is not None:
+                payload = int.from_bytes(payload, 'big')
+            results[Pump] = (value, command, payload)
+
+        self.metrics['queue_depth'] = self.queue_depth
+        return results, pending
@@ -0,0 +1,138 @@
+#   This work is licensed under Creativ Commons Attribution-ShareAlike 4.0
+#   International (CC BY-SA 4.0).
+#   (https://creativecommons.org/licenses/by-sa/4.0/)
+#   Feel free to use, modify or distribute this code as far as you like, so
+#   long as you make anything based on it publicly avialable under the same
+#   license.
+
+# fake m-tec inverters on a pseudo terminal, answers modbus read (03) and
+# write (06) requests like the pumps do; used by the MtecMod tests, can also
+# be run directly and connected to via the printed port (posix only)
+
+
+############################     IMPORTS      ################################
+
+import os
+import sys
+import time
+import select
+
+from threading import Thread, Event
+
+# appending the parent directory path
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from mtec.mtec_mod import crc16
+
+
+############################     CLASSES      ################################
+
+class FakeInverter:
+    """serves one or more inverter IDs on the master side of a pty, the
+    slave side (port) can be opened with pyserial
+
+    ATTRIBUTES:
+        port:
+            device name to open, e.g. '/dev/pts/3'
+        registers:
+            dict of inverter ID to its registers (address: value)
+        delay:
+            time to wait before each reply [s]
+        silent:
+            if set, requests are read but never answered
+        requests:
+            number of valid requests received
+    """
+
+    def __init__(self, ids=(1,), delay=0.0) -> None:
+        self._master, self._slave = os.openpty()
+        self.port = os.ttyname(self._slave)
+        self.registers = {
+            id: {0xFD00: 0, 0xFD03: 0, 0xFD05: 23000, 0xFD06: 16, 0xFD18: 0}
+            for id in ids
+        }
+        self.delay = delay
+        self.silent = False
+        self.requests = 0
+        self._stop = Event()
+        self._thread = Thread(target=self._run, daemon=True)
+
+
+    def start(self) -> 'FakeInverter':
+        self._thread.start()
+        return self
+
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(1)
+        os.close(self._master)
+        os.close(self._slave)
+
+
+    def _run(self) -> None:
+        data = b''
+        while not self._stop.is_set():
+            ready, _, _ = select.select([self._master], [], [], 0.05)
+            if not ready:
+                continue
+            try:
+                data += os.read(self._master, 256)
+            except OSError:
+                return
+
+            # all requests are 8 bytes: ID, type, address, value, CRC
+            while len(data) >= 8:
+                request, data = data[:8], data[8:]
+                reply = self.answer(request)
+                if reply is not None and not self.silent:
+                    if self.delay:
+                        time.sleep(self.delay)
+                    os.write(self._master, reply)
+
+
+    def answer(self, request:bytes) -> bytes | None:
+        """returns the reply to one request frame, None if the request
+        is not for one of the served IDs or broken
+        """
+
+        if crc16(request[:6]) != request[6:]:
+            return None
+        regs = self.registers.get(request[0])
+        if regs is None:
+            return None
+
+        self.requests += 1
+        address = int.from_bytes(request[2:4], 'big')
+        value = int.from_bytes(request[4:6], 'big')
+        match request[1]:
+            case 3:
+                data = b''.join(
+                    regs.get(address + i, 0).to_bytes(2, 'big')
+                    for i in range(value)
+                )
+                reply = request[:2] + bytes([len(data)]) + data
+            case 6:
+                regs[address] = value
+                # speed is taken over as output frequency right away
+                if address == 0xFA01:
+                    regs[0xFD00] = value
+                reply = request[:6]
+            case _:
+                reply = bytes([request[0], request[1] | 0x80, 1])
+        return reply + crc16(reply)
+
+
+
+#############################     MAIN      #################################
+
+if __name__ == '__main__':
+    Inverter = FakeInverter(ids=(1, 2)).start()
+    print(f"fake inverters 01 & 02 listening on {Inverter.port}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        Inverter.stop()
@@ -0,0 +1,158 @@
+#   This work is licensed under Creativ Commons Attribution-ShareAlike 4.0
+#   International (CC BY-SA 4.0).
+#   (https://creativecommons.org/licenses/by-sa/4.0/)
+#   Feel free to use, modify or distribute this code as far as you like, so
+#   long as you make anything based on it publicly avialable under the same
+#   license.
+
+# fake sensor access point (ESP32 data AP), answers GET /<channel> with the
+# backlog of that channel like the firmware does ("DL=false&T23.40/U3;...")
+# and GET /batch?ch=<channel>,.. with the backlogs of several channels
+# ("DL=false&temp:T23.40/U3;&humid:&"), keeps connections alive; used by the
+# sensor polling tests, can also be run directly and added to SEN_dict via
+# the printed address
+
+
+############################     IMPORTS      ################################
+
+import time
+
+from urllib.parse import urlsplit, parse_qs
+from threading import Thread, Event
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+############################     CLASSES      ################################
+
+class FakeSensorAP:
+    """serves a dict of channels on localhost, every request returns and
+    clears the backlog of its channel
+
+    ATTRIBUTES:
+        address:
+            'host:port' to use as 'ip' in SEN_dict
+        channels:
+            dict of channel name to its backlog, list of (val, age [s]);
+            unknown channels are answered with 404
+        delay:
+            time to wait before each reply [s]
+        silent:
+            if set, requests are read but never answered
+        batch:
+            if not set, '/batch' is unknown like on older firmware
+        data_lost:
+            DL flag to send
+        requests:
+            number of requests received
+        connections:
+            number of TCP connections accepted
+    """
+
+    def __init__(self, channels:dict | None = None, delay=0.0) -> None:
+        self.channels = {} if channels is None else channels
+        self.delay = delay
+        self.silent = False
+        self.batch = True
+        self.data_lost = False
+        self.requests = 0
+        self.connections = 0
+        self._stop = Event()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+        self.address = f"127.0.0.1:{self._server.server_address[1]}"
+        self._thread = Thread(target=self._server.serve_forever, daemon=True)
+
+
+    def start(self) -> 'FakeSensorAP':
+        self._thread.start()
+        return self
+
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join(1)
+
+
+    def answer(self, path:str) -> str | None:
+        """returns the reply to one request, None if the channel or path is
+        unknown
+        """
+
+        url = urlsplit(path)
+        dl_flag = f"DL={'true' if self.data_lost else 'false'}&"
+        if url.path == '/batch' and self.batch:
+            query = parse_qs(url.query).get('ch')
+            names = query[0].split(',') if query else list(self.channels)
+            return dl_flag + ''.join(
+                f"{name}:{self._entries(name)}&"
+                for name in names if name in self.channels
+            )
+
+        entries = self._entries(url.path.strip('/'))
+        if entries is None:
+            return None
+        if not entries:
+            return 'no data available'
+        return dl_flag + entries
+
+
+    def _entries(self, channel:str) -> str | None:
+        """returns and clears the backlog of channel in wire format"""
+
+        backlog = self.channels.get(channel)
+        if backlog is None:
+            return None
+        entries = ''.join(f"T{val:.2f}/U{age};" for val, age in backlog)
+        backlog.clear()
+        return entries
+
+
+    def _handler(self) -> type:
+        AP = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1' # keep-alive
+
+            def setup(self) -> None:
+                super().setup()
+                AP.connections += 1
+
+            def do_GET(self) -> None:
+                AP.requests += 1
+                if AP.silent:
+                    AP._stop.wait(5)
+                    self.close_connection = True
+                    return
+                if AP.delay:
+                    time.sleep(AP.delay)
+                reply = AP.answer(self.path)
+                if reply is None:
+                    self.send_error(404)
+                    return
+                body = reply.encode()
+                self.send_response(200)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        return Handler
+
+
+
+#############################     MAIN      #################################
+
+if __name__ == '__main__':
+    AP = FakeSensorAP(channels={'temp': [], 'humid': []}).start()
+    print(f"fake sensor AP listening on {AP.address}")
+    try:
+        while True:
+            AP.channels['temp'].append((20.0 + time.time() % 5, 0))
+            AP.channels['humid'].append((50.0, 0))
+            time.sleep(1)
+    except KeyboardInterrupt:
+        AP.stop()
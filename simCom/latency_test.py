@@ -0,0 +1,180 @@
+#   This work is licensed under Creativ Commons Attribution-ShareAlike 4.0
+#   International (CC BY-SA 4.0).
+#   (https://creativecommons.org/licenses/by-sa/4.0/)
+#   Feel free to use, modify or distribute this code as far as you like, so
+#   long as you make anything based on it publicly avialable under the same
+#   license.
+
+# measures how long RoboCommWorker takes to send the next command after the
+# robot reported progress; a simplified robot (same protocol as
+# test_server.py) answers every command with a telemetry block carrying its
+# ID, the time until the following command arrives is collected in a
+# histogram, once with the event-driven worker and once with the old polling
+
+
+############################     IMPORTS      ################################
+
+import io
+import os
+import sys
+import time
+import socket
+import contextlib
+
+from threading import Thread, Event
+
+# appending the parent directory path
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+# PyQt stuff
+from PyQt5.QtCore import QCoreApplication, QThread, QTimer
+
+# import my own libs
+import libs.data_utilities as du
+import libs.rob_codec as rc
+import libs.threads as workers
+
+
+###########################     FUNCTIONS      ###############################
+
+HOST = 'localhost'
+COMMANDS = 200
+BINS = [1, 2, 5, 10, 20, 50, 100, 200]  # upper bin limits [ms]
+
+
+def robot(srv:socket.socket, latencies:list, done:Event) -> None:
+    """accepts one connection, streams telemetry every 10 ms like the real
+    robot does, answers every command with its ID right away and notes the
+    time until the next command comes in; keeps the connection open until
+    done is set
+    """
+
+    conn, _ = srv.accept()
+    data = b''
+    last_reply = None
+    reply = rc.pack_telemetry(0.0, 0, du.Coordinate())
+    with conn:
+        conn.settimeout(0.01)
+        while not done.is_set():
+            try:
+                chunk = conn.recv(rc.COMMAND_SIZE * COMMANDS)
+            except TimeoutError:
+                conn.sendall(reply)
+                continue
+            except OSError:
+                break
+            if not chunk:
+                break
+            data += chunk
+            while len(data) >= rc.COMMAND_SIZE:
+                id = rc.unpack_command(data)[0]
+                data = data[rc.COMMAND_SIZE :]
+                if last_reply is not None:
+                    latencies.append(time.perf_counter() - last_reply)
+                reply = rc.pack_telemetry(1.0, id, du.Coordinate(x=id))
+                conn.sendall(reply)
+                last_reply = time.perf_counter()
+
+
+def measure(event_driven:bool) -> list[float]:
+    """runs RoboCommWorker against the simplified robot, returns the
+    latencies in seconds
+    """
+
+    latencies = []
+    srv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    srv.bind((HOST, 0))
+    srv.listen()
+    done = Event()
+    robot_thread = Thread(target=robot, args=(srv, latencies, done))
+    robot_thread.start()
+
+    # reset robot globals & queue up the commands
+    du.ROBTcp = du.RobConnection(
+        ip=HOST,
+        port=srv.getsockname()[1],
+        c_tout=1.0,
+        rw_tout=1.0,
+        r_bl=rc.TELEMETRY_SIZE,
+        w_bl=rc.COMMAND_SIZE,
+    )
+    du.ROBTcp.connect()
+    du.ROBTelem = du.RoboTelemetry()
+    du.ROBLastTelem = du.RoboTelemetry()
+    du.ROBCommQueue.clear()
+    du.ROB_send_list.clear()
+    du.ROB_comm_fr = 1
+    du.SC_curr_comm_id = 1
+    du.SCQueue.clear()
+    for _ in range(COMMANDS):
+        du.SCQueue.add(du.QEntry(id=0), thread_call=False)
+    du.SC_q_processing = True
+    du.SC_q_prep_end = False
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    comm_thread = QThread()
+    worker = workers.RoboCommWorker()
+    worker.event_driven = event_driven
+    worker.moveToThread(comm_thread)
+    comm_thread.started.connect(worker.run)
+    comm_thread.finished.connect(worker.stop)
+
+    def check_done():
+        if len(latencies) >= COMMANDS - 1:
+            app.quit()
+
+    watcher = QTimer()
+    watcher.timeout.connect(check_done)
+    watcher.start(50)
+    QTimer.singleShot(60000, app.quit)
+
+    # mute the per-command prints of the worker
+    with contextlib.redirect_stdout(io.StringIO()):
+        comm_thread.start()
+        app.exec_()
+        comm_thread.quit()
+        comm_thread.wait()
+
+    watcher.stop()
+    done.set()
+    du.SC_q_processing = False
+    du.ROBTcp.close(end=True)
+    srv.close()
+    robot_thread.join(1)
+    return latencies
+
+
+def histogram(name:str, latencies:list) -> None:
+    """prints a text histogram of the latencies"""
+
+    ms = sorted(x * 1000 for x in latencies)
+    if len(ms) == 0:
+        print(f"{name}: no data")
+        return
+
+    print(
+        f"{name}: {len(ms)} commands, median {ms[len(ms) // 2]:.2f} ms, "
+        f"max {ms[-1]:.2f} ms"
+    )
+    lower = 0
+    for upper in BINS + [None]:
+        if upper is None:
+            num = len([x for x in ms if x >= lower])
+            label = f"  >= {lower:>4} ms"
+        else:
+            num = len([x for x in ms if lower <= x < upper])
+            label = f"{lower:>4} - {upper:>4} ms"
+        print(f"  {label}  {num:>5}  {'#' * round(num * 50 / len(ms))}")
+        if upper is not None:
+            lower = upper
+    print()
+
+
+
+#############################     MAIN      #################################
+
+if __name__ == '__main__':
+    histogram('event-driven', measure(event_driven=True))
+    histogram('timer polling', measure(event_driven=False))
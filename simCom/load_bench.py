@@ -0,0 +1,91 @@
+#   This work is licensed under Creativ Commons Attribution-ShareAlike 4.0
+#   International (CC BY-SA 4.0).
+#   (https://creativecommons.org/licenses/by-sa/4.0/)
+#   Feel free to use, modify or distribute this code as far as you like, so
+#   long as you make anything based on it publicly avialable under the same
+#   license.
+
+# measures how the GCode conversion scales with the number of processes:
+# writes a sliced-like file (default 1M lines), loads it once serially and
+# then in parallel with 2 up to all cores, checks that every result is the
+# same as the serial one; usage: python load_bench.py [lines]
+
+
+############################     IMPORTS      ################################
+
+import gc
+import os
+import sys
+import time
+import random
+import tempfile
+
+# appending the parent directory path
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+# import my own libs
+import libs.code_parser as cp
+
+
+###########################     FUNCTIONS      ###############################
+
+def write_file(path:str, lines:int) -> None:
+    """layers of 1000 moves in a 3 x 2 m field, with comments & pump
+    commands in between like the Grasshopper scripts write them
+    """
+
+    random.seed(0)
+    with open(path, 'w') as file:
+        for i in range(lines):
+            if i % 1000 == 0:
+                file.write(f"; layer {i // 1000}\nG1 Z{i // 1000 * 10}\n")
+            elif i % 100 == 0:
+                file.write(f"G1 PMP{random.randint(0, 100)}\n")
+            else:
+                file.write(
+                    f"G1 X{random.uniform(0, 3000):.2f} "
+                    f"Y{random.uniform(0, 2000):.2f} "
+                    f"F{random.randint(500, 3000)}\n"
+                )
+
+
+def load(file:cp.MappedFile, processes:int) -> tuple[cp.LoadResult, float]:
+    """same as load_file, without its cache"""
+
+    gc.disable()
+    start = time.perf_counter()
+    if processes == 1:
+        Result = cp.load_gcode(file)
+    else:
+        Result = cp.load_gcode_parallel(file, processes=processes)
+    duration = time.perf_counter() - start
+    gc.enable()
+    return Result, duration
+
+
+
+#############################     MAIN      #################################
+
+if __name__ == '__main__':
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'bench.gcode')
+        write_file(path, lines)
+
+        with cp.MappedFile(path) as file:
+            print(f"{len(file)} rows, {os.cpu_count()} cores")
+            Serial, serial_time = load(file, 1)
+            print(f"  1 process:   {serial_time:6.2f} s")
+            for processes in range(2, (os.cpu_count() or 1) + 1):
+                Result, par_time = load(file, processes)
+                same = (
+                    Result.entries == Serial.entries
+                    and Result.pre_check() == Serial.pre_check()
+                )
+                print(
+                    f"{processes:3} processes: {par_time:6.2f} s   "
+                    f"x{serial_time / par_time:.2f}   "
+                    f"{'same result' if same else 'RESULTS DIFFER'}"
+                )
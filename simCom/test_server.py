@@ -13,7 +13,6 @@ import os
 import re
 import sys
 import socket
-import struct
 
 from inputimeout import inputimeout
 from threading import Thread
@@ -26,6 +25,7 @@ sys.path.append(parent_dir)
 
 # import my own libs
 import libs.data_utilities as du
+import libs.rob_codec as rc
 
 
 ############################     THREADS      ################################
@@ -81,17 +81,8 @@ def stt_update() -> None:
             reply.Coor.ext = NextComm.Coor1.ext - (MovementVector.ext * perc_to_do)
         # send reply
         try:
-            reply_packed = struct.pack(
-                "<fifffffff",
-                reply.t_speed,
-                reply.id,
-                reply.Coor.x,
-                reply.Coor.y,
-                reply.Coor.z,
-                reply.Coor.rx,
-                reply.Coor.ry,
-                reply.Coor.rz,
-                reply.Coor.ext,
+            reply_packed = rc.pack_telemetry(
+                reply.t_speed, reply.id, reply.Coor
             )
             conn.sendall(reply_packed)
         except:
@@ -174,7 +165,7 @@ while toggle:
             stt_thread = Thread(target=stt_update)
             stt_thread.start()
             while True:
-                data = conn.recv(151)
+                data = conn.recv(rc.COMMAND_SIZE)
                 if not data:
                     toggle = 0
                     print("Client disconnected...\nWaiting for stt_update...")
@@ -182,47 +173,39 @@ while toggle:
                     usr_thread.join()
                     break
                 
-                RecvEntry = du.QEntry()
-                RecvEntry.id = struct.unpack("<i", data[0:4])[0]
-                RecvEntry.mt = struct.unpack("c", data[4:5])[0]
-                RecvEntry.pt = struct.unpack("c", data[5:6])[0]
-                RecvEntry.Coor1.x = struct.unpack("<f", data[6:10])[0]
-                RecvEntry.Coor1.y = struct.unpack("<f", data[10:14])[0]
-                RecvEntry.Coor1.z = struct.unpack("<f", data[14:18])[0]
-                RecvEntry.Coor1.rx = struct.unpack("<f", data[18:22])[0]
-                RecvEntry.Coor1.ry = struct.unpack("<f", data[22:26])[0]
-                RecvEntry.Coor1.rz = struct.unpack("<f", data[26:30])[0]
-                RecvEntry.Coor1.q = struct.unpack("<f", data[30:34])[0]
-                RecvEntry.Coor1.ext = struct.unpack("<f", data[34:38])[0]
-                RecvEntry.Coor2.x = struct.unpack("<f", data[38:42])[0]
-                RecvEntry.Coor2.y = struct.unpack("<f", data[42:46])[0]
-                RecvEntry.Coor2.z = struct.unpack("<f", data[46:50])[0]
-                RecvEntry.Coor2.rx = struct.unpack("<f", data[50:54])[0]
-                RecvEntry.Coor2.ry = struct.unpack("<f", data[54:58])[0]
-                RecvEntry.Coor2.rz = struct.unpack("<f", data[58:62])[0]
-                RecvEntry.Coor2.q = struct.unpack("<f", data[62:66])[0]
-                RecvEntry.Coor2.ext = struct.unpack("<f", data[66:70])[0]
-                RecvEntry.Speed.acr = struct.unpack("<i", data[70:74])[0]
-                RecvEntry.Speed.dcr = struct.unpack("<i", data[74:78])[0]
-                RecvEntry.Speed.ts = struct.unpack("<i", data[78:82])[0]
-                RecvEntry.Speed.ors = struct.unpack("<i", data[82:86])[0]
-                RecvEntry.Speed.t = struct.unpack("<i", data[86:90])[0]
-                RecvEntry.sc = struct.unpack("c", data[90:91])[0]
-                RecvEntry.z = struct.unpack("<i", data[91:95])[0]
-                troll_id = struct.unpack("<i", data[95:99])[0]
-                RecvEntry.Tool.trolley_steps = struct.unpack("<i", data[99:103])[0]
-                cutter_id = struct.unpack("<i", data[103:107])[0]
-                cutter = struct.unpack("<i", data[107:111])[0]
-                cut_id = struct.unpack("<i", data[111:115])[0]
-                cut = struct.unpack("<i", data[115:119])[0]
-                ls_id = struct.unpack("<i", data[119:123])[0]
-                RecvEntry.Tool.load_spring = struct.unpack("<i", data[123:127])[0]
-                ps_id = struct.unpack("<i", data[127:131])[0]
-                RecvEntry.Tool.place_spring = struct.unpack("<i", data[131:135])[0]
-                clamp_id = struct.unpack("<i", data[135:139])[0]
-                RecvEntry.Tool.clamp = struct.unpack("<i", data[139:143])[0]
-                wait_id = struct.unpack("<i", data[143:147])[0]
-                RecvEntry.Tool.wait = struct.unpack("<i", data[147:151])[0]
+                (
+                    id, mt, pt,
+                    x1, y1, z1, rx1, ry1, rz1, q1, ext1,
+                    x2, y2, z2, rx2, ry2, rz2, q2, ext2,
+                    acr, dcr, ts, ors,
+                    sbt, sc, z,
+                    troll_id, trolley_steps,
+                    cutter_id, cutter,
+                    cut_id, cut,
+                    ls_id, load_spring,
+                    ps_id, place_spring,
+                    clamp_id, clamp,
+                    wait_id, wait,
+                ) = rc.unpack_command(data)
+                RecvEntry = du.QEntry(
+                    id=id,
+                    mt=mt.decode(),
+                    pt=pt.decode(),
+                    Coor1=du.Coordinate(x1, y1, z1, rx1, ry1, rz1, q1, ext1),
+                    Coor2=du.Coordinate(x2, y2, z2, rx2, ry2, rz2, q2, ext2),
+                    Speed=du.SpeedVector(acr, dcr, ts, ors),
+                    sbt=sbt,
+                    sc=sc.decode(),
+                    z=z,
+                    Tool=du.ToolCommand(
+                        trolley_steps=trolley_steps,
+                        clamp=clamp,
+                        cut=cut,
+                        place_spring=place_spring,
+                        load_spring=load_spring,
+                        wait=wait,
+                    ),
+                )
 
                 print(
                     f"received:\n{RecvEntry}\n"
@@ -18,6 +18,10 @@ from tests.func_utilities_test import FuncLibTest
 from tests.win_mainframe_test import MainframeWinTest
 from tests.pump_utilities_test import PumpLibTest
 from tests.threads_test import ThreadsTest
+from tests.rob_codec_test import RobCodecTest
+from tests.mtec_mod_test import MtecModTest
+from tests.code_parser_test import CodeParserTest
+from tests.sensor_comm_test import SensorCommTest
 
 
 #############################     MAIN      #################################
@@ -27,6 +31,9 @@ import libs.data_utilities
 import libs.func_utilities
 import libs.pump_utilities
 import libs.threads
+import libs.rob_codec
+import libs.code_parser
+import libs.sensor_comm
 import libs.win_daq
 import libs.win_dialogs
 import libs.win_mainframe
@@ -39,6 +46,10 @@ def run_all() -> None:
     suite.addTest(unittest.TestLoader().loadTestsFromTestCase(MainframeWinTest))
     suite.addTest(unittest.TestLoader().loadTestsFromTestCase(PumpLibTest))
     suite.addTest(unittest.TestLoader().loadTestsFromTestCase(ThreadsTest))
+    suite.addTest(unittest.TestLoader().loadTestsFromTestCase(RobCodecTest))
+    suite.addTest(unittest.TestLoader().loadTestsFromTestCase(MtecModTest))
+    suite.addTest(unittest.TestLoader().loadTestsFromTestCase(CodeParserTest))
+    suite.addTest(unittest.TestLoader().loadTestsFromTestCase(SensorCommTest))
     runner = unittest.TextTestRunner(verbosity=2)
     runner.run(suite)
 
@@ -0,0 +1,500 @@
+# test code_parser
+
+################################## IMPORTS ###################################
+
+import io
+import os
+import sys
+import random
+import tempfile
+import unittest
+
+# appending the parent directory path
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+import libs.data_utilities as du
+import libs.func_utilities as fu
+import libs.code_parser as cp
+
+from array import array
+
+
+################################### TESTS ####################################
+
+GCODE_TXT = (
+    "; header comment G1 X100\n"
+    "G1 X1.25 Y-2,5 Z3 F1200 EXT7\n"
+    "  ; indented comment\n"
+    "G1 X5 XR10 YR-20 ZR30.5 PMP50 PR0.5 PIN1\n"
+    "G1 Y10 TRL0.1 TCL1 TCU1 TPS0 TLS1 ; Y99\n"
+    "M104 S200\n"
+    "G92 X0 Y0\n"
+    "G1 X-3 EXTX4 PMP1002 PR3\n"
+    "G1 Z1 X2 X3 PMP500\n"
+    "G28 X0 Z0 EXT0 TCL1\n"
+    "G0 X1\n"
+    "G1 F80,5\n"
+    "\n"
+    "G1 X12 EXT1 X13 F100.0"
+)
+
+RAPID_TXT = (
+    "!comment\n"
+    "MoveJ pHome,v200,fine,tool0;\n"
+    "MoveJ [[1.1,2.2,3.3],[4.4,5.5,6.6,7.7],[0,0,0,0],"
+    "[0,0,0,0,0,0]],[8,9,10,11],z12,tool0 EXT13 TRL0.1 TCL1 TCU1 TLS1\n"
+    "   ! indented comment\n"
+    "MoveL Offs(pHome,1.1,2.2,3.3),[8,9,10,11],z12,tool0 EXT13\n"
+    "MoveL Offs(pHome,0.0,2000.0,1000.0),[200,50,50,50],z10,tool0;\n"
+    "MoveC Offs(pHome,1,2,3),[200,50,50,50],zfine,tool0;\n"
+    "MoveL Offs(pHome,1,2,3),v200,z10,tool0;\n"
+    "MoveL [[1,2,3],[4,5]],[1,2,3,4],z1,tool0 PMP20\n"
+    "MoveL Offs(pHome,1,2,3),[1,2,3,4],z5,tool0 PMP-20 PIN1\n"
+)
+
+
+def gcode_reference(rows:list, ext_trail=True) -> list:
+    """conversion loop as LoadFileWorker did it before code_parser"""
+
+    results = []
+    Speed = du.PRINSpeed.copy()
+    LastPos = du.DCCurrZero
+    for row in rows:
+        Entry, command = fu.gcode_to_qentry(
+            LastPos, Speed, du.IO_zone, row, ext_trail
+        )
+        if Entry is not None:
+            LastPos = Entry.Coor1
+        results.append((Entry, command))
+    return results
+
+
+class CodeParserTest(unittest.TestCase):
+
+    def setUp(self):
+        du.DCCurrZero = du.Coordinate(1, 2, 3, 4, 5, 6, 7, 8)
+
+
+    def tearDown(self):
+        du.DCCurrZero = du.Coordinate()
+
+
+    def test_rows(self):
+        """test rows against str.split"""
+
+        for txt in ["", "\n", "a", "a\nb", "a\nb\n", "a\n\nb\n\n"]:
+            self.assertEqual(list(cp.rows(io.StringIO(txt))), txt.split('\n'))
+        self.assertEqual(list(cp.rows(['a', 'b'])), ['a', 'b'])
+
+
+    def test_words(self):
+        """test single scan word extraction against re_short"""
+
+        for row in GCODE_TXT.split('\n') + RAPID_TXT.split('\n'):
+            found = cp.words(row)
+            for key in [
+                'X', 'Y', 'Z', 'XR', 'YR', 'ZR', 'F', 'EXT', 'PMP', 'PR',
+                'PIN', 'TRL', 'TCL', 'TCU', 'TPS', 'TLS',
+            ]:
+                self.assertEqual(
+                    found.get(key),
+                    fu.re_short(None, row, None, find_coor=key),
+                    f"{key} in '{row}'",
+                )
+
+
+    def test_parse_gcode(self):
+        """golden test: same QEntries as gcode_to_qentry"""
+
+        for ext_trail in [True, False]:
+            du.DCCurrZero = du.Coordinate(1, 2, 3, 4, 5, 6, 7, 8)
+            expected = gcode_reference(GCODE_TXT.split('\n'), ext_trail)
+            du.DCCurrZero = du.Coordinate(1, 2, 3, 4, 5, 6, 7, 8)
+            result = list(cp.parse_gcode(io.StringIO(GCODE_TXT), ext_trail))
+
+            self.assertEqual(len(result), len(expected))
+            for (Entry, command), (ExpEntry, exp_command) in zip(
+                    result, expected
+            ):
+                self.assertEqual(command, exp_command)
+                self.assertEqual(Entry, ExpEntry)
+                if Entry is not None:
+                    self.assertEqual(Entry.p_mode, ExpEntry.p_mode)
+                    self.assertEqual(Entry.p_ratio, ExpEntry.p_ratio)
+                    self.assertEqual(Entry.pinch, ExpEntry.pinch)
+
+        # broken values raise like before
+        with self.assertRaises(ValueError):
+            list(cp.parse_gcode(["G1 X1 PMP1,5"]))
+
+
+    def test_parse_rapid(self):
+        """golden test: same QEntries (or errors) as rapid_to_qentry"""
+
+        for ext_trail in [True, False]:
+            result = list(cp.parse_rapid(io.StringIO(RAPID_TXT), ext_trail))
+            expected = [
+                fu.rapid_to_qentry(row, ext_trail)
+                for row in RAPID_TXT.split('\n')
+            ]
+
+            self.assertEqual(len(result), len(expected))
+            for Entry, ExpEntry in zip(result, expected):
+                if isinstance(ExpEntry, Exception):
+                    self.assertIs(type(Entry), type(ExpEntry))
+                    self.assertEqual(str(Entry), str(ExpEntry))
+                else:
+                    self.assertEqual(Entry, ExpEntry)
+                    if Entry is not None:
+                        self.assertEqual(Entry.p_mode, ExpEntry.p_mode)
+                        self.assertEqual(Entry.pinch, ExpEntry.pinch)
+
+
+    def test_pre_check(self):
+        """test streamed pre-checks against the whole-text versions"""
+
+        for txt in [
+                GCODE_TXT,
+                GCODE_TXT.replace(',', '.') + '\n',
+                '',
+                '\n',
+                'G1 X1,5',
+        ]:
+            expected = fu.pre_check_gcode_file(txt)
+            result = cp.pre_check_gcode(io.StringIO(txt))
+            if isinstance(expected[0], Exception):
+                self.assertIs(type(result[0]), type(expected[0]))
+                self.assertEqual(result[1:], expected[1:])
+            else:
+                self.assertEqual(result, expected)
+
+        for txt in [RAPID_TXT, '', 'MoveL [1],[1,2,3,4]']:
+            expected = fu.pre_check_rapid_file(txt)
+            result = cp.pre_check_rapid(io.StringIO(txt))
+            if isinstance(expected[0], Exception):
+                self.assertIs(type(result[0]), type(expected[0]))
+                self.assertEqual(result[1:], expected[1:])
+            else:
+                self.assertEqual(result, expected)
+
+
+    def test_MappedFile(self):
+        """test mapped lines against open(), line index & its cache"""
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'test.gcode')
+            for txt in [
+                    '', '\n', 'a', 'a\nb\n', 'a\r\nb\r\n\r\n', GCODE_TXT
+            ]:
+                with open(path, 'w', newline='') as file:
+                    file.write(txt)
+                with open(path, 'r') as file:
+                    expected = list(file)
+                with cp.MappedFile(path) as Mapped:
+                    self.assertEqual(list(Mapped.lines()), expected)
+                    self.assertEqual(len(Mapped), len(txt.split('\n')))
+                    self.assertEqual(list(Mapped.lines(1)), expected[1:])
+
+            # partial reads & the same results as from the open file
+            with cp.MappedFile(path) as Mapped:
+                offsets = Mapped.offsets
+                self.assertEqual(
+                    list(Mapped.lines(3, 5)), GCODE_TXT.splitlines(True)[3:5]
+                )
+                self.assertEqual(
+                    str(cp.pre_check_gcode(Mapped)),
+                    str(fu.pre_check_gcode_file(GCODE_TXT)),
+                )
+
+            # index is reused until the file changes
+            with cp.MappedFile(path) as Mapped:
+                self.assertIs(Mapped.offsets, offsets)
+            with open(path, 'a') as file:
+                file.write('\nG1 X1')
+            with cp.MappedFile(path) as Mapped:
+                self.assertIsNot(Mapped.offsets, offsets)
+                self.assertEqual(list(Mapped)[-1], 'G1 X1')
+
+
+    def test_load(self):
+        """test the single pass load against conversion, pre-check & the
+        check functions run separately
+        """
+
+        txt = GCODE_TXT.replace(',', '.')
+        Result = cp.load_gcode(io.StringIO(txt))
+        # G92 only moves the zero of the result
+        self.assertEqual(du.DCCurrZero, du.Coordinate(1, 2, 3, 4, 5, 6, 7, 8))
+        self.assertEqual(Result.zero.x, 6.0)
+        expected = [E for E, _ in cp.parse_gcode(io.StringIO(txt)) if E]
+        self.assertEqual(Result.entries, expected)
+        self.assertEqual(Result.pre_check(), fu.pre_check_gcode_file(txt))
+        self.assertEqual(Result.error, '')
+        # the comment in row 0 holds a G1 & is converted
+        self.assertEqual(Result.rows[:3], array('L', [0, 1, 3]))
+        self.assertEqual(Result.conv_skips(), 14 - len(expected))
+        for failed, check in [
+                (Result.out_of_range, fu.range_check),
+                (Result.base_dist, fu.base_dist_check),
+        ]:
+            self.assertEqual(
+                list(failed),
+                [
+                    i for i, E in enumerate(expected)
+                    if not check(E.copy())[0]
+                ],
+            )
+        self.assertEqual(
+            Result.range_summary,
+            fu.range_check_all(du.CoordinateArray.from_queue(expected))[1],
+        )
+        self.assertTrue(Result.range_summary.startswith(
+            f"{len(Result.out_of_range)} of {len(expected)} targets"
+        ))
+        self.assertEqual(
+            Result.coors, du.CoordinateArray.from_queue(expected)
+        )
+        Min, Max = Result.bounds
+        self.assertEqual(Min.x, min(E.Coor1.x for E in expected))
+        self.assertEqual(Max.ext, max(E.Coor1.ext for E in expected))
+
+        Result = cp.load_rapid(io.StringIO(RAPID_TXT))
+        err = next(
+            E for E in cp.parse_rapid(io.StringIO(RAPID_TXT))
+            if isinstance(E, Exception)
+        )
+        self.assertEqual(Result.error, f"ERROR: {err}")
+        self.assertEqual(
+            str(Result.pre_check()), str(fu.pre_check_rapid_file(RAPID_TXT))
+        )
+        self.assertEqual(cp.load_gcode(['']).res, 'empty')
+        self.assertEqual(
+            cp.load_gcode(['G1 X1 PMP1.5\n', 'G1 PMP1,5']).error,
+            "VALUE ERROR: G1!",
+        )
+
+        # same results as the check functions, but Coor stays as it is
+        random.seed(0)
+        Min, Max = du.RC_area
+        for _ in range(1000):
+            Coor = du.Coordinate(*(
+                random.uniform(low - 100, high + 100)
+                for low, high in zip(Min, Max)
+            ))
+            Copy = Coor.copy()
+            self.assertEqual(
+                cp.in_range(Coor, tuple(Min), tuple(Max)),
+                fu.range_check(du.QEntry(Coor1=Copy))[0],
+            )
+            self.assertEqual(
+                cp.in_base_dist(Coor),
+                fu.base_dist_check(du.QEntry(Coor1=Coor))[0],
+            )
+
+
+    def test_load_file(self):
+        """test the load cache & that DCCurrZero is left alone"""
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'test.gcode')
+            with open(path, 'w') as file:
+                file.write(GCODE_TXT.replace(',', '.'))
+
+            Zero = du.DCCurrZero
+            Result = cp.load_file(path)
+            self.assertIs(du.DCCurrZero, Zero)
+            self.assertEqual(Zero, du.Coordinate(1, 2, 3, 4, 5, 6, 7, 8))
+            # G92 X0 Y0 after X5 (+1 from zero)
+            self.assertEqual(Result.zero.x, 6.0)
+            self.assertIs(cp.load_file(path), Result)
+
+            # other settings, other file version
+            self.assertIsNot(cp.load_file(path, ext_trail=False), Result)
+            Result = cp.load_file(path)
+            du.IO_zone = 3
+            try:
+                self.assertIsNot(cp.load_file(path), Result)
+            finally:
+                du.IO_zone = du.DEF_IO_ZONE
+            Result = cp.load_file(path)
+            with open(path, 'a') as file:
+                file.write('\nG1 X1')
+            self.assertEqual(
+                len(cp.load_file(path).entries), len(Result.entries) + 1
+            )
+
+
+    def test_load_result_paths(self):
+        """test the path checks of LoadResult, paths next to entries that
+        fail a check are not reported again"""
+
+        Result = cp.LoadResult()
+        for row, (x, y, ext, mt) in enumerate([
+                (0, 1200, 100, 'L'),
+                (2900, 1200, 2900, 'L'),
+                (2900, 1200, 100, 'L'),
+                (2900, 1400, 100, 'L'),
+                (0, 1400, 100, 'L'),
+                (200, 1400, 100, 'C'),
+        ]):
+            entry = du.QEntry(
+                mt=mt, Coor1=du.Coordinate(x, y, 0, 180, 0, 0, 0, ext)
+            )
+            Result.add(entry, row)
+        # MoveC through Y 2800
+        Result.entries[5].Coor2 = du.Coordinate(100, 2800, 0, 180, ext=100)
+        Result.finish()
+
+        self.assertEqual(list(Result.out_of_range), [])
+        self.assertEqual(list(Result.base_dist), [2, 3])
+        self.assertEqual(list(Result.path_base_dist), [1])
+        self.assertEqual(list(Result.path_range), [5])
+        self.assertTrue(Result.path_base_summary.startswith("1 of 2 paths"))
+        self.assertTrue(Result.path_range_summary.startswith("1 of 5 paths"))
+
+        Result = cp.LoadResult().finish()
+        self.assertEqual(Result.path_range_summary, '')
+        self.assertEqual(len(Result.coors), 0)
+
+
+    def test_job_file(self):
+        """test writing, reading & invalidation of compiled job files"""
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for name, txt in [
+                    ('test.gcode', GCODE_TXT.replace(',', '.')),
+                    ('test.mod', "\n".join(RAPID_TXT.split("\n")[:6])),
+                    ('empty.gcode', ''),
+            ]:
+                path = os.path.join(tmp_dir, name)
+                with open(path, 'w') as file:
+                    file.write(txt)
+
+                Expected = cp.load_file(path, job=True)
+                job_path = cp.job_path(path)
+                self.assertEqual(job_path.name, name + '.pjob')
+                self.assertTrue(job_path.exists())
+
+                cp._last_load = None
+                Result = cp.load_file(path, job=True)
+                self.assertIsNot(Result, Expected)
+                self.assertEqual(Result.entries, Expected.entries)
+                self.assertEqual(
+                    [str(entry) for entry in Result.entries],
+                    [str(entry) for entry in Expected.entries],
+                )
+                for attr in [
+                        'rows', 'row_num', 'error', 'out_of_range',
+                        'base_dist',
+                ]:
+                    self.assertEqual(
+                        getattr(Result, attr), getattr(Expected, attr)
+                    )
+                self.assertEqual(Result.pre_check(), Expected.pre_check())
+                self.assertEqual(Result.zero, Expected.zero)
+                self.assertEqual(Result.bounds, Expected.bounds)
+
+            # invalid for other settings or another file version
+            path = os.path.join(tmp_dir, 'test.gcode')
+            stat = os.stat(path)
+            key = (stat.st_mtime_ns, stat.st_size, True, cp._load_settings())
+            job_path = cp.job_path(path)
+            self.assertIsNotNone(cp.read_job(job_path, key))
+            self.assertIsNone(
+                cp.read_job(job_path, key[:2] + (False,) + key[3:])
+            )
+            du.IO_zone = 3
+            try:
+                self.assertIsNone(
+                    cp.read_job(job_path, key[:3] + (cp._load_settings(),))
+                )
+            finally:
+                du.IO_zone = du.DEF_IO_ZONE
+            entry_num = len(cp.read_job(job_path, key).entries)
+            with open(path, 'a') as file:
+                file.write('\nG1 X1')
+            cp._last_load = None
+            Result = cp.load_file(path, job=True)
+            self.assertEqual(len(Result.entries), entry_num + 1)
+            self.assertIsNone(cp.read_job(job_path, key))
+
+            # results holding an exception are not written
+            path = os.path.join(tmp_dir, 'broken.mod')
+            with open(path, 'w') as file:
+                file.write(RAPID_TXT)
+            self.assertIsInstance(
+                cp.load_file(path, job=True).comm_num, Exception
+            )
+            self.assertFalse(cp.job_path(path).exists())
+
+            # broken files are ignored
+            with open(job_path, 'r+b') as file:
+                file.truncate(40)
+            self.assertIsNone(cp.read_job(job_path, key))
+            with open(job_path, 'wb') as file:
+                file.write(b'PJOB')
+            self.assertIsNone(cp.read_job(job_path, key))
+            self.assertIsNone(cp.read_job(job_path.with_name('none'), key))
+
+
+    def test_load_gcode_parallel(self):
+        """test the chunked conversion against the serial one"""
+
+        random.seed(1)
+        rows = [
+            row for row in GCODE_TXT.replace(',', '.').split('\n')
+            if 'G92' not in row
+        ]
+        rows = [rows[random.randrange(len(rows))] for _ in range(300)]
+        rows += ['G1 X5000 Y-10 XR-5']
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'test.gcode')
+            for txt in [
+                    '\n'.join(rows),
+                    '\n'.join(rows) + '\n',
+                    '\n'.join(rows[:150] + ['G1 X1 PMP1,5', 'G1 X1,5']),
+            ]:
+                with open(path, 'w') as file:
+                    file.write(txt)
+
+                done = []
+                with cp.MappedFile(path) as Mapped:
+                    Expected = cp.load_gcode(Mapped)
+                    Result = cp.load_gcode_parallel(
+                        Mapped,
+                        processes=2,
+                        progress=lambda *args: done.append(args),
+                        chunks=7,
+                    )
+
+                self.assertEqual(len(done), 7)
+                self.assertEqual(done[-1], (7, 7))
+                self.assertEqual(Result.entries, Expected.entries)
+                for Entry, ExpEntry in zip(Result.entries, Expected.entries):
+                    self.assertEqual(
+                        [type(v) for v in Entry.Coor1],
+                        [type(v) for v in ExpEntry.Coor1],
+                    )
+                    self.assertEqual(Entry.p_mode, ExpEntry.p_mode)
+                    self.assertEqual(Entry.p_ratio, ExpEntry.p_ratio)
+                    self.assertIs(Entry.pinch, ExpEntry.pinch)
+                    self.assertEqual(Entry.Tool, ExpEntry.Tool)
+                self.assertEqual(
+                    str(Result.pre_check()), str(Expected.pre_check())
+                )
+                self.assertEqual(Result.error, Expected.error)
+                self.assertEqual(Result.rows, Expected.rows)
+                self.assertEqual(Result.out_of_range, Expected.out_of_range)
+                self.assertEqual(Result.base_dist, Expected.base_dist)
+                self.assertEqual(Result.conv_skips(), Expected.conv_skips())
+                self.assertEqual(Result.bounds, Expected.bounds)
+
+
+
+#################################  MAIN  #####################################
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,6 +5,7 @@
 import os
 import sys
 import time
+import socket
 import unittest
 
 # appending the parent directory path
@@ -14,6 +15,7 @@ sys.path.append(parent_dir)
 
 import libs.data_utilities as du
 import libs.func_utilities as fu
+import libs.rob_codec as rc
 
 from datetime import timedelta
 
@@ -79,6 +81,107 @@ class DataLibTest(unittest.TestCase):
         ResCoor = du.Coordinate(1.1, 2.2, 3.3, 4.4, 5.6, 6.7, 7.8, 8.9)
         self.assertEqual(round(TestCoor, 1), ResCoor)
 
+        # __iter__ (re-entrant)
+        TestCoor = du.Coordinate(1, 2, 3, 4, 5, 6, 7, 8)
+        self.assertEqual(list(TestCoor), [1, 2, 3, 4, 5, 6, 7, 8])
+        self.assertEqual(
+            [(a, b) for a in TestCoor for b in TestCoor][-1], (8, 8)
+        )
+
+        # mutable, so not hashable; __slots__ & _replace
+        self.assertRaises(TypeError, hash, TestCoor)
+        self.assertFalse(hasattr(TestCoor, '__dict__'))
+        self.assertEqual(
+            TestCoor._replace(z=10, ext=0),
+            du.Coordinate(1, 2, 10, 4, 5, 6, 7, 0),
+        )
+        self.assertEqual(TestCoor.z, 3)
+        with self.assertRaises(ValueError):
+            TestCoor._replace(a=1)
+
+
+    def test_CoordinateArray_class(self):
+        """test CoordinateArray class, columnar store for whole jobs"""
+
+        # __init__ & __len__ & __str__
+        TestCoor1 = du.Coordinate(1.1, 2.2, 3.3, 4.4, 5.5, 6.6, 7.7, 8.8)
+        TestCoor2 = du.Coordinate(4.1, 6.2, 3.3, 0, 0, 0, 0, 1)
+        TestArr = du.CoordinateArray([TestCoor1, TestCoor2])
+        self.assertEqual(len(TestArr), 2)
+        self.assertEqual(len(du.CoordinateArray()), 0)
+        self.assertEqual(len(du.CoordinateArray(3)), 3)
+        self.assertEqual(str(TestArr), f"{TestCoor1}\n{TestCoor2}")
+        self.assertEqual(str(du.CoordinateArray()), 'CoordinateArray is empty!')
+        with self.assertRaises(ValueError):
+            du.CoordinateArray(du.np.zeros((2, 7)))
+
+        # __getitem__ (zero-copy view) & __setitem__
+        self.assertIsInstance(TestArr[0], du.Coordinate)
+        self.assertEqual(TestArr[1], TestCoor2)
+        TestView = TestArr[1]
+        TestView.z = 4.4
+        self.assertEqual(TestArr.z[1], 4.4)
+        TestArr[1] = TestCoor2
+        self.assertEqual(TestView.z, 3.3)
+        self.assertEqual(TestArr[1:], du.CoordinateArray([TestCoor2]))
+
+        # __iter__
+        self.assertEqual(list(TestArr), [TestCoor1, TestCoor2])
+
+        # __add__, __sub__ & __round__
+        self.assertEqual(
+            TestArr + TestCoor1,
+            du.CoordinateArray([TestCoor1 + TestCoor1, TestCoor2 + TestCoor1]),
+        )
+        self.assertEqual(
+            TestArr - 1.1,
+            du.CoordinateArray([TestCoor1 - 1.1, TestCoor2 - 1.1]),
+        )
+        self.assertEqual(TestArr - TestArr, du.CoordinateArray(2))
+        with self.assertRaises(ValueError):
+            TestArr + du.CoordinateArray(3)
+        self.assertEqual(
+            round(du.CoordinateArray([du.Coordinate(1.234, 5.678)]), 1),
+            du.CoordinateArray([du.Coordinate(1.2, 5.7)]),
+        )
+
+        # __eq__ & __ne__
+        self.assertTrue(TestArr == TestArr)
+        self.assertFalse(TestArr == None)
+        self.assertTrue(TestArr != du.CoordinateArray(2))
+        with self.assertRaises(TypeError):
+            TestArr == 5
+
+        # distance & segment_lengths
+        self.assertEqual(
+            list(TestArr.distance(TestCoor1)),
+            [0.0, TestCoor1.distance(TestCoor2)],
+        )
+        self.assertEqual(
+            list(TestArr.segment_lengths()),
+            [TestCoor1.distance(TestCoor2)],
+        )
+
+        # from_queue & to_list
+        TestQueue = du.Queue()
+        TestQueue.add(du.QEntry(Coor1=TestCoor1), thread_call=True)
+        TestQueue.add(du.QEntry(Coor1=TestCoor2, Coor2=TestCoor1))
+        self.assertEqual(du.CoordinateArray.from_queue(TestQueue), TestArr)
+        self.assertEqual(
+            du.CoordinateArray.from_queue(TestQueue, 'Coor2').to_list(),
+            [du.Coordinate(), TestCoor1],
+        )
+        with self.assertRaises(ValueError):
+            du.CoordinateArray.from_queue(TestQueue, 'Speed')
+
+        # Queue.coordinates
+        self.assertEqual(TestQueue.coordinates(), TestArr)
+        self.assertEqual(TestQueue.coordinates(num=1).to_list(), [TestCoor1])
+        self.assertEqual(
+            TestQueue.coordinates('Coor2', num=5).to_list(),
+            [du.Coordinate(), TestCoor1],
+        )
+
 
     def test_Speed_class(self):
         """test Speed class, used to store acceleration and travel speed 
@@ -191,6 +294,29 @@ class DataLibTest(unittest.TestCase):
             f"PM/PR,PIN:  1001/0.2, True",
         )
 
+        # not hashable & _replace
+        self.assertRaises(TypeError, hash, TestEntry)
+        NewEntry = TestEntry._replace(id=5, mt='J')
+        self.assertEqual((NewEntry.id, NewEntry.mt), (5, 'J'))
+        self.assertEqual((TestEntry.id, TestEntry.mt), (1, 'A'))
+        self.assertIsNot(NewEntry.Coor1, TestEntry.Coor1)
+        with self.assertRaises(ValueError):
+            TestEntry._replace(Coor3=TestCoor1)
+
+        # copy
+        CopyEntry = TestEntry.copy()
+        self.assertEqual(CopyEntry, TestEntry)
+        self.assertIsNot(CopyEntry.Coor1, TestEntry.Coor1)
+        self.assertIsNot(CopyEntry.Coor2, TestEntry.Coor2)
+        self.assertIsNot(CopyEntry.Speed, TestEntry.Speed)
+        self.assertIsNot(CopyEntry.Tool, TestEntry.Tool)
+        CopyEntry.Coor1.x = 100
+        CopyEntry.Speed.ts = 100
+        CopyEntry.Tool.wait = 100
+        self.assertEqual(TestCoor1.x, 4)
+        self.assertEqual(TestVector.ts, 6)
+        self.assertEqual(TestTool.wait, 9)
+
 
     def test_Queue_class(self):
         """test Queue class, organizes QEntry list"""
@@ -479,6 +605,40 @@ class DataLibTest(unittest.TestCase):
             ],
         )
 
+        # ID shifts spanning multiple chunks
+        TestQueue = du.Queue()
+        TestQueue._chunk_size = 2
+        du.SC_curr_comm_id = 1
+        for i in range(7):
+            TestQueue.add(du.QEntry(Coor1=du.Coordinate(x=i)))
+        TestQueue.add(du.QEntry(id=2, Coor1=TestCoor))
+        TestQueue.increment(10)
+        self.assertEqual([e.id for e in TestQueue], list(range(11, 19)))
+        self.assertEqual(TestQueue[2].Coor1, du.Coordinate(x=1))
+        self.assertEqual(TestQueue.id_pos(12), 1)
+        self.assertEqual(TestQueue.id_pos(18), 7)
+        TestQueue.clear(all=False, id='12..14')
+        self.assertEqual([e.id for e in TestQueue], list(range(11, 16)))
+        self.assertEqual(TestQueue[1].Coor1, du.Coordinate(x=3))
+        self.assertEqual(TestQueue.entry_before_id(15).Coor1.x, 5)
+
+        # copy=False hands entries over instead of copying them
+        TestEntry = du.QEntry(id=16, Coor1=TestCoor)
+        TestQueue.add(TestEntry, copy=False)
+        self.assertIs(TestQueue.last_entry(), TestEntry)
+        TestQueue.append(TestEntry)
+        self.assertIsNot(TestQueue.last_entry(), TestEntry)
+        self.assertEqual(TestQueue.last_entry(), TestEntry)
+        AddQueue = du.Queue()
+        AddQueue.add(du.QEntry(id=0, Coor1=TestCoor+1), thread_call=True)
+        AddEntry = AddQueue[0]
+        TestQueue.add_queue(AddQueue, copy=False)
+        self.assertIs(TestQueue.last_entry(), AddEntry)
+        self.assertEqual(AddEntry.id, 17)
+        TestEntry = du.QEntry(id=2)
+        TestQueue.append(TestEntry, copy=False)
+        self.assertIs(TestQueue.last_entry(), TestEntry)
+
         du.SC_curr_comm_id = 1
 
 
@@ -522,6 +682,13 @@ class DataLibTest(unittest.TestCase):
             du.RoboTelemetry(t_speed=1.1, id=2, Coor=RoundedCoor),
         )
 
+        # not hashable & _replace
+        self.assertRaises(TypeError, hash, TestTelem)
+        NewTelem = TestTelem._replace(Coor=du.Coordinate())
+        self.assertEqual(NewTelem.id, 2)
+        self.assertEqual(NewTelem.Coor, du.Coordinate())
+        self.assertEqual(TestTelem.Coor, TestCoor)
+
 
     def test_PumpTelemetry_class(self):
         """test RoboTelemetry class, used to store 36 TCP-response from robot"""
@@ -558,6 +725,14 @@ class DataLibTest(unittest.TestCase):
             du.PumpTelemetry(freq=1.1, volt=2.2, amps=3.3, torq=4.4),
         )
 
+        # not hashable & _replace
+        self.assertRaises(TypeError, hash, TestTelem)
+        self.assertEqual(
+            TestTelem._replace(freq=-1.1),
+            du.PumpTelemetry(freq=-1.1, volt=2.2, amps=3.3, torq=4.4),
+        )
+        self.assertEqual(TestTelem.freq, 1.1)
+
 
     def test_TSData_class(self):
         """test TSData class, a decriptor used in DataBlock class"""
@@ -679,12 +854,116 @@ class DataLibTest(unittest.TestCase):
         # just try one overwrite for example
         TestDqB.store((-1.1, 0), 'amb', 'temp')
         self.assertEqual(TestDqB.amb_temp, -1.1)
+        msp_temp = TestDqB.msp_temp
+        TestDqB.store_many([
+            ((-2.2, 0), 'amb', 'temp'),
+            ((-3.3, 0), 'rb', 'temp'),
+            ((-4.4, invalid_time), 'msp', 'temp'),
+        ])
+        self.assertEqual(TestDqB.amb_temp, -2.2)
+        self.assertEqual(TestDqB.rb_temp, -3.3)
+        self.assertEqual(TestDqB.msp_temp, msp_temp)
+        TestDqB.store_backlog(
+            [([(5.5, 7), (6.6, 2)], 'amb', 'temp'), ([(7.7, 0)], 'rb', 'temp')],
+            100.0,
+        )
+        self.assertEqual(TestDqB.amb_temp, 6.6)
+        self.assertEqual(TestDqB.rb_temp, 7.7)
+        t, vals = TestDqB.series['amb_temp'].window(10, 'val', now=100.0)
+        self.assertEqual((list(t), list(vals)), ([93.0, 98.0], [5.5, 6.6]))
+        TestDqB.store_backlog([([(8.8, 0)], 'amb', 'temp')], 101.0)
+        self.assertEqual(len(TestDqB.series['amb_temp']), 3)
+
+        # telemetry is recorded when set, staleness
+        self.assertTrue(TestDqB.is_stale('robo'))
+        TestDqB.Robo = du.RoboTelemetry(1.5, 7, du.Coordinate(x=2.5))
+        TestDqB.Pump1 = du.PumpTelemetry(10, 20, 30, 40)
+        self.assertFalse(TestDqB.is_stale('robo'))
+        self.assertEqual(TestDqB.Robo.id, 7)
+        self.assertEqual(
+            list(TestDqB.series['robo'].last()[1][:3]), [7.0, 1.5, 2.5]
+        )
+        self.assertEqual(
+            TestDqB.series['pump1'].stats(60, 'amps'), (30.0, 30.0, 30.0)
+        )
+        self.assertTrue(TestDqB.is_stale('pump1', max_age=-1))
+        self.assertNotIn('pump2', TestDqB.series)
+        self.assertEqual(du.DaqBlock(depth=5).depth, 5)
+
+        # values are kept per instance
+        OtherDqB = du.DaqBlock(amb_temp=9.9)
+        self.assertEqual(OtherDqB.amb_temp, 9.9)
+        self.assertEqual(TestDqB.amb_temp, 8.8)
+        self.assertIsInstance(du.DaqBlock.amb_temp, du.TSData)
+
+        # snapshot
+        snap = TestDqB.snapshot()
+        self.assertEqual(
+            set(snap), {*du.DaqBlock.TS_FIELDS, 'Robo', 'Pump1', 'Pump2'}
+        )
+        self.assertEqual(snap['amb_temp'], 8.8)
+        self.assertEqual(snap['phc_edist'], 33.33)
+        self.assertIs(snap['Robo'], TestDqB.Robo)
+        TestDqB.valid_time = 0
+        self.assertIsNone(TestDqB.snapshot()['amb_temp'])
+        self.assertIsNone(TestDqB.amb_temp)
+        self.assertEqual(OtherDqB.snapshot()['amb_temp'], 9.9)
 
         # valid_time setter
         TestDqB.valid_time = 6.54
         self.assertEqual(TestDqB.valid_time, timedelta(seconds=7))
 
 
+    def test_TimeSeries_class(self):
+        """test TimeSeries class, ring buffer behind DaqBlock"""
+
+        # __init__, append & wrap around
+        TestSeries = du.TimeSeries(('a', 'b'), depth=4)
+        self.assertEqual((len(TestSeries), TestSeries.depth), (0, 4))
+        self.assertIsNone(TestSeries.last())
+        self.assertTrue(TestSeries.is_stale(1e9))
+        with self.assertRaises(ValueError):
+            du.TimeSeries(depth=0)
+        for i in range(6):
+            TestSeries.append((i, -i), t=float(i))
+        self.assertEqual(len(TestSeries), 4)
+        t, vals = TestSeries.window(100, now=5.0)
+        self.assertEqual(list(t), [2.0, 3.0, 4.0, 5.0])
+        self.assertEqual(vals.tolist(), [[2, -2], [3, -3], [4, -4], [5, -5]])
+        self.assertEqual(
+            list(TestSeries.window(2, 'b', now=5.0)[1]), [-3, -4, -5]
+        )
+        self.assertEqual(TestSeries.last()[0], 5.0)
+
+        # timestamps do not go backwards
+        TestSeries.append((6, -6), t=1.0)
+        self.assertEqual(TestSeries.last()[0], 5.0)
+
+        # stats & staleness
+        mins, maxs, means = TestSeries.stats(100, now=5.0)
+        self.assertEqual((list(mins), list(maxs)), ([3, -6], [6, -3]))
+        self.assertEqual(TestSeries.stats(1, 'a', now=5.0), (4.0, 6.0, 5.0))
+        self.assertIsNone(TestSeries.stats(1, now=10.0))
+        self.assertEqual(TestSeries.age(now=7.0), 2.0)
+        self.assertTrue(TestSeries.is_stale(1.0, now=7.0))
+        self.assertFalse(TestSeries.is_stale(3.0, now=7.0))
+
+        # extend, also across the end & longer than depth
+        TestSeries = du.TimeSeries(depth=5)
+        TestSeries.extend([], [])
+        TestSeries.extend([1, 2, 3], [10, 20, 30])
+        TestSeries.extend([4, 5, 6, 7], [40, 50, 60, 70])
+        self.assertEqual(
+            list(TestSeries.window(100, now=7.0)[1][:, 0]),
+            [30, 40, 50, 60, 70],
+        )
+        TestSeries.extend(range(10, 18), range(8))
+        t, vals = TestSeries.window(100, 'val', now=17.0)
+        self.assertEqual(
+            (list(t), list(vals)), ([13, 14, 15, 16, 17], [3, 4, 5, 6, 7])
+        )
+
+
     def test_TCPIP_class(self):
         """test TCPIP class, handles connection data und functions"""
 
@@ -773,7 +1052,69 @@ class DataLibTest(unittest.TestCase):
         self.assertFalse(ans0)
         self.assertIsInstance(ans1, OSError)
 
-        # received (to do)
+        # receive
+        TestRobCon.close(end=True)
+        TestRobCon._Socket, Server = socket.socketpair()
+        TestRobCon.r_bl = du.DEF_ROB_TCP['r_bl']
+        TestCoor = du.Coordinate(1, 2, 3, 4, 5, 6, 0, 7)
+        Server.sendall(rc.pack_telemetry(8.0, 9, TestCoor))
+        Telem, data = TestRobCon.receive()
+        self.assertEqual(Telem, du.RoboTelemetry(8.0, 9, TestCoor))
+        self.assertEqual(len(data), du.DEF_ROB_TCP['r_bl'])
+        self.assertEqual(TestRobCon.last_skipped, 0)
+
+        # receive coalesced & partial blocks, only the newest is returned
+        Blocks = [rc.pack_telemetry(1.0, i, TestCoor) for i in range(4)]
+        Server.sendall(Blocks[0] + Blocks[1] + Blocks[2] + Blocks[3][:10])
+        time.sleep(0.05)
+        Telem, data = TestRobCon.receive()
+        self.assertEqual(Telem.id, 2)
+        self.assertEqual(TestRobCon.last_skipped, 2)
+        Server.sendall(Blocks[3][10:])
+        Telem, data = TestRobCon.receive()
+        self.assertEqual(Telem.id, 3)
+        self.assertEqual(TestRobCon.last_skipped, 0)
+        Server.sendall(b''.join(Blocks * 50))
+        time.sleep(0.05)
+        Telem, data = TestRobCon.receive()
+        self.assertEqual(Telem.id, 3)
+        self.assertEqual(TestRobCon.last_skipped, 199)
+
+        # send_many
+        TestRobCon.connected = True
+        Entries = [du.QEntry(id=i) for i in range(1, 4)]
+        self.assertEqual(TestRobCon.send_many(Entries), (3, None))
+        data = Server.recv(4 * rc.COMMAND_SIZE)
+        self.assertEqual(data, rc.pack_many(Entries))
+        ans0, ans1 = TestRobCon.send_many([Entries[0], None, Entries[2]])
+        self.assertEqual(ans0, 1)
+        self.assertIsInstance(ans1, ValueError)
+        self.assertEqual(
+            Server.recv(4 * rc.COMMAND_SIZE), data[: rc.COMMAND_SIZE]
+        )
+        TestRobCon.connected = False
+        ans0, ans1 = TestRobCon.send_many(Entries)
+        self.assertEqual(ans0, 0)
+        self.assertIsInstance(ans1, ConnectionError)
+        Server.close()
+
+        # a partly written command closes the connection
+        class HalfSocket:
+            written = False
+            def send(self, data):
+                if self.written:
+                    raise OSError('broken pipe')
+                self.written = True
+                return rc.COMMAND_SIZE + 10
+            def close(self):
+                pass
+
+        TestRobCon._Socket = HalfSocket()
+        TestRobCon.connected = True
+        ans0, ans1 = TestRobCon.send_many(Entries)
+        self.assertEqual(ans0, 1)
+        self.assertIsInstance(ans1, ConnectionError)
+        self.assertFalse(TestRobCon.connected)
 
         TestRobCon.close(end=True)
 
@@ -5,6 +5,7 @@
 import os
 import sys
 import unittest
+import numpy as np
 
 # appending the parent directory path
 current_dir = os.path.dirname(os.path.realpath(__file__))
@@ -147,6 +148,121 @@ class FuncLibTest(unittest.TestCase):
         du.DCCurrZero = du.Coordinate()
 
 
+    def test_check_all_functions(self):
+        """test range_check_all & base_dist_check_all against the checks
+        per entry"""
+
+        Coors = du.CoordinateArray([
+            du.Coordinate(0, 1200, 0, 180, 0, 0, 0, 100),
+            du.Coordinate(0, 1200, 0, -180, 0, 0, 0, 100),
+            du.Coordinate(-2000, 1200, 0, 100, 0, 0, 0, 100),
+            du.Coordinate(0, 200, 0, 180, 0, 0, 0, 3000),
+            du.Coordinate(0, 1200, 2000, 180, 0, 0, 0, 100),
+            du.Coordinate(0, 1200, 0, 180, 0, 0, 0, float('nan')),
+        ])
+        expected = {'range': [], 'base': []}
+        for i, Coor in enumerate(Coors.to_list()):
+            if not fu.range_check(du.QEntry(Coor1=Coor))[0]:
+                expected['range'].append(i)
+            if not fu.base_dist_check(du.QEntry(Coor1=Coor))[0]:
+                expected['base'].append(i)
+
+        failed, msg = fu.range_check_all(Coors)
+        self.assertEqual(failed.tolist(), expected['range'])
+        self.assertEqual(failed.tolist(), [2, 4, 5])
+        self.assertEqual(
+            msg, "3 of 6 targets out of range (X: 1, Z: 1, RX: 1, EXT: 1)"
+        )
+        self.assertEqual(Coors.rx[1], -180.0)
+
+        # NaN passes base_dist_check, but not base_dist_check_all
+        failed, msg = fu.base_dist_check_all(Coors)
+        self.assertEqual(failed.tolist(), expected['base'] + [5])
+        self.assertEqual(failed.tolist(), [2, 3, 5])
+        self.assertEqual(
+            msg,
+            "3 of 6 targets beyond base distance (up to 4920.37mm > 3000mm)"
+        )
+
+        Coors = du.CoordinateArray(Coors.data[:2])
+        self.assertEqual(fu.range_check_all(Coors)[1], '')
+        self.assertEqual(fu.base_dist_check_all(Coors)[1], '')
+        self.assertEqual(len(fu.range_check_all(du.CoordinateArray())[0]), 0)
+
+
+    def test_path_check_all_functions(self):
+        """test path_range_check_all & path_base_dist_check_all"""
+
+        Coors = du.CoordinateArray([
+            du.Coordinate(0, 1200, 0, 180, 0, 0, 0, 100),
+            # EXT jumps, X - EXT gets to -2800 on the way
+            du.Coordinate(2900, 1200, 0, 180, 0, 0, 0, 2900),
+            # arc dips below Y = 0
+            du.Coordinate(2750, 140, 0, 180, 0, 0, 0, 2900),
+            du.Coordinate(3050, 140, 0, 180, 0, 0, 0, 2900),
+            # collinear, stays linear
+            du.Coordinate(3150, 140, 0, 180, 0, 0, 0, 2900),
+        ])
+        Vias = du.CoordinateArray(len(Coors))
+        Vias[3] = du.Coordinate(2975, 10.1, 0, 180, 0, 0, 0, 2900)
+        Vias[4] = du.Coordinate(3100, 140, 0, 180, 0, 0, 0, 2900)
+        circular = [False, False, False, True, True]
+
+        failed, msg = fu.path_range_check_all(Coors, Vias, circular)
+        self.assertEqual(failed.tolist(), [3])
+        self.assertEqual(msg, "1 of 4 paths leave the range (Y: 1)")
+        self.assertEqual(len(fu.range_check_all(Coors)[0]), 0)
+        self.assertEqual(
+            fu.path_range_check_all(Coors, Vias, [False] * 5)[1], ''
+        )
+
+        # targets 2 - 4 are beyond base distance themselves
+        failed, msg = fu.path_base_dist_check_all(
+            Coors, Vias, circular, [0, 1]
+        )
+        self.assertEqual(failed.tolist(), [1])
+        self.assertEqual(
+            msg,
+            "1 of 1 paths beyond base distance (up to 4101.22mm > 3000mm)"
+        )
+        Coors.x[1] = 500
+        Coors.ext[1] = 100
+        self.assertEqual(
+            fu.path_base_dist_check_all(Coors, Vias, circular, [1])[1], ''
+        )
+
+        # no path leaving is missed, compared to densely sampled arcs
+        rng = np.random.default_rng(0)
+        data = rng.uniform(-200, 3200, (400, 8))
+        data[:, 1] = rng.uniform(1000, 1400, 400)
+        data[:, 3] = 180
+        data[:, 7] = rng.uniform(0, 500, 400)
+        Coors = du.CoordinateArray(data)
+        Vias = du.CoordinateArray(np.roll(data, 1, axis=0) / 2 + data / 2)
+        Vias.y[:] += rng.uniform(-300, 300, 400)
+        circular = np.ones(400, dtype=bool)
+        for samples in [4, 32]:
+            failed, _ = fu.path_base_dist_check_all(
+                Coors, Vias, circular, samples=samples
+            )
+            dense = set()
+            for points, lo, hi, _, owner in fu._path_samples(
+                    Coors, Vias, circular, np.arange(1, 400), 2000
+            ):
+                dist = np.sqrt(
+                    np.maximum(
+                        np.square(points[0] - lo[:, None]),
+                        np.square(points[0] - hi[:, None]),
+                    )
+                    + np.square(du.RC_y_base_pos - points[1])
+                )
+                dense |= set(
+                    owner[(dist > du.RC_max_base_dist).any(axis=1)].tolist()
+                )
+            self.assertTrue(dense <= set(failed.tolist()))
+            self.assertGreater(len(dense), 0)
+
+
     def test_show_on_terminal_function(self):
         """see showOnTerminal in libs/PRINT_data_utilities"""
 
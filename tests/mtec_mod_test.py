@@ -0,0 +1,244 @@
+# test mtec_mod
+
+################################## IMPORTS ###################################
+
+import os
+import sys
+import time
+import serial
+import unittest
+
+# appending the parent directory path
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from mtec.mtec_mod import (
+    MtecMod,
+    MtecBus,
+    MtecScheduler,
+    crc16,
+    build_frame,
+    hex_frame,
+    command_frame,
+)
+
+try:
+    from simCom.fake_inverter import FakeInverter
+except ImportError:  # no pty on windows
+    FakeInverter = None
+
+
+################################### TESTS ####################################
+
+class MtecModTest(unittest.TestCase):
+
+    def test_crc(self):
+        """test modbus CRC against a known frame"""
+
+        # read 1 register at FD00 from inverter 01
+        self.assertEqual(crc16(bytes.fromhex("0103FD000001")), b"\xB5\xA6")
+        Pump = MtecMod(None, "01")
+        self.assertEqual(Pump.calcCRC("0103FD000001"), "B5A6")
+        self.assertEqual(crc16(bytes.fromhex("0103FD000001B5A6")), b"\0\0")
+
+        # table against the bitwise original
+        def crc_bitwise(data):
+            crc = 0xFFFF
+            for byte in data:
+                crc ^= byte
+                for _ in range(8):
+                    if crc & 1:
+                        crc = (crc >> 1) ^ 0xA001
+                    else:
+                        crc >>= 1
+            return crc.to_bytes(2, 'little')
+
+        for data in [b"", bytes(range(256)), b"\xFF" * 7, b"\x01\x06\xFA"]:
+            self.assertEqual(crc16(data), crc_bitwise(data))
+
+
+    def test_frames(self):
+        """test binary frame building and the hex wrappers"""
+
+        frame = build_frame(1, 6, 0xFA01, 5000)
+        self.assertEqual(frame, bytes.fromhex("0106FA011388E584"))
+        self.assertIs(build_frame(1, 6, 0xFA01, 5000), frame)
+        self.assertEqual(
+            hex_frame("0106FA011388"), (frame, "0106FA011388E584")
+        )
+        self.assertEqual(
+            command_frame("01", "06FA01", 5000), (frame, "0106FA011388E584")
+        )
+        self.assertEqual(hex_frame("0103"), (b"\1\3\x40\x21", "01034021"))
+
+        Pump = MtecMod(None, "01")
+        self.assertEqual(Pump.int2hex(10, 4), "000A")
+        self.assertEqual(Pump.int2hex(0x12345, 4), "12345")
+        self.assertEqual(Pump.sendCommand("03FD00", 1), (None, None))
+        self.assertIsNone(Pump.submitFrame(3, 0xFD00, 1))
+
+
+    def test_planBlocks(self):
+        """test grouping of registers into block reads"""
+
+        Pump = MtecMod(None, "01")
+        self.assertEqual(
+            Pump.planBlocks([0xFD05, 0xFD00, 0xFD03, 0xFD18]),
+            [(0xFD00, 6), (0xFD18, 1)],
+        )
+        self.assertEqual(Pump.planBlocks([]), [])
+        Pump.settings_block_max_regs = 4
+        self.assertEqual(
+            Pump.planBlocks([0xFD00, 0xFD03, 0xFD05]),
+            [(0xFD00, 4), (0xFD05, 1)],
+        )
+        Pump.settings_block_max_gap = 0
+        self.assertEqual(
+            Pump.planBlocks([0xFD00, 0xFD01, 0xFD03]),
+            [(0xFD00, 2), (0xFD03, 1)],
+        )
+
+
+    @unittest.skipIf(FakeInverter is None, "needs a pty")
+    def test_fake_inverter(self):
+        """test requests against a fake inverter on a pty, two inverters
+        sharing one bus like the pumps do
+        """
+
+        Inverter = FakeInverter(ids=(1, 2)).start()
+        Bus = serial.Serial(port=Inverter.port, baudrate=19200)
+        Pump1 = MtecMod(Bus, "01")
+        Pump2 = MtecMod(Bus, "02")
+        try:
+            # connect & single requests
+            self.assertEqual(Pump1.sendCommand("03FD00", 1), (None, None))
+            self.assertTrue(Pump1.connect())
+            self.assertTrue(Pump2.connect())
+            self.assertIs(Pump1.bus, Pump2.bus)
+            self.assertEqual(Pump1.voltage, 230.0)
+            self.assertEqual(Pump1.set_speed(50), ("0106FA011388E584", 5000))
+            self.assertEqual(Pump1.frequency, 50.0)
+            self.assertEqual(Pump2.frequency, 0.0)
+            self.assertEqual(Pump1.keepAlive()[1], 5000)
+
+            # pipelining: queue everything first, then collect; FD00-FD05
+            # come in one block read, FD18 in a second one
+            Inverter.registers[1][0xFD18] = 1234
+            Inverter.requests = 0
+            pending = [Pump1.requestTelemetry(), Pump2.requestTelemetry()]
+            self.assertEqual(
+                Pump1.collectTelemetry(pending[0]), (50.0, 230.0, 0.0, 12.34)
+            )
+            self.assertEqual(
+                Pump2.collectTelemetry(pending[1]), (0.0, 230.0, 0.0, 0.0)
+            )
+            self.assertEqual(Inverter.requests, 4)
+
+            # slow values are kept until due again
+            Inverter.requests = 0
+            Inverter.registers[1][0xFD03] = 250
+            Inverter.registers[1][0xFD05] = 22000
+            self.assertEqual(Pump1.read_telemetry(), (50.0, 230.0, 2.5, 12.34))
+            self.assertEqual(Inverter.requests, 1)
+            Pump1.temp_telemSlowDue = 0.0
+            self.assertEqual(Pump1.read_telemetry(), (50.0, 220.0, 2.5, 12.34))
+            self.assertEqual(Inverter.requests, 3)
+            self.assertGreater(Pump1.bus.utilisation(), 0.0)
+
+            # error reply & unknown ID
+            self.assertEqual(Pump1.sendCommand("10FD00", 1)[1], None)
+            Pump3 = MtecMod(Bus, "03")
+            self.assertFalse(Pump3.connect())
+
+            # timeout waits on the port, does not spin
+            Inverter.silent = True
+            cpu_start = time.process_time()
+            wall_start = time.perf_counter()
+            self.assertIsNone(Pump1.frequency)
+            self.assertLess(
+                time.process_time() - cpu_start,
+                (time.perf_counter() - wall_start) / 2,
+            )
+
+            # the bus recovers from late replies
+            Inverter.silent = False
+            self.assertEqual(Pump1.frequency, 50.0)
+        finally:
+            Pump1.bus.close()
+            Bus.close()
+            Inverter.stop()
+
+
+    @unittest.skipIf(FakeInverter is None, "needs a pty")
+    def test_scheduler(self):
+        """test merging, stop priority and bus budget of MtecScheduler"""
+
+        Inverter = FakeInverter(ids=(1, 2)).start()
+        Bus = serial.Serial(port=Inverter.port, baudrate=19200)
+        Pump1 = MtecMod(Bus, "01")
+        Pump2 = MtecMod(Bus, "02")
+        Sched = MtecScheduler(budget=0.2)
+        try:
+            Pump1.connect()
+            Pump2.connect()
+
+            # only the latest speed is written, keepAlive is merged into it
+            Inverter.requests = 0
+            Sched.set_speed(Pump1, 10)
+            Sched.set_speed(Pump1, 20)
+            Sched.keep_alive(Pump1)
+            Sched.keep_alive(Pump2)
+            self.assertEqual(Sched.queue_depth, 3)
+            written, pending = Sched.run()
+            self.assertEqual(written, {Pump1: (20, "0106FA0107D0EB7E", 2000)})
+            self.assertEqual(pending, {})
+            self.assertEqual(Pump1.temp_lastSpeed, 20)
+            self.assertEqual(Inverter.registers[1][0xFA00], 0xC400)
+            self.assertEqual(Sched.metrics['merged'], 2)
+            self.assertEqual(Sched.metrics['sent'], 3)
+            time.sleep(0.05)
+            self.assertEqual(Inverter.requests, 3)
+
+            # unchanged speed sends nothing, telemetry counts as keepAlive
+            Sched.set_speed(Pump1, 20)
+            Sched.keep_alive(Pump1)
+            written, pending = Sched.run(telemetry=[Pump1])
+            self.assertEqual(written, {})
+            self.assertEqual(
+                Pump1.collectTelemetry(pending[Pump1]), (20.0, 230.0, 0, 0)
+            )
+            self.assertEqual(Sched.metrics['merged'], 3)
+
+            # a stop drops the pending speed & ignores the budget
+            Sched.budget = 0.0
+            Sched.set_speed(Pump1, 30)
+            Sched.set_speed(Pump2, 40)
+            Sched.set_speed(Pump1, 0)
+            Sched.set_speed(Pump1, 0)
+            written, _ = Sched.run()
+            self.assertEqual(written, {Pump1: (0, "0106FA010000E8D2", 0)})
+            self.assertEqual(Inverter.registers[1][0xFA00], 0)
+            self.assertEqual(Sched.metrics['dropped'], 1)
+            self.assertEqual(Sched.metrics['merged'], 4)
+            self.assertEqual(Sched.metrics['deferred'], 1)
+            self.assertEqual(Sched.metrics['queue_depth'], 1)
+
+            # deferred speed goes out once the budget allows
+            Sched.budget = 0.2
+            written, _ = Sched.run()
+            self.assertEqual(written[Pump2][0], 40)
+            self.assertEqual(Sched.metrics['queue_depth'], 0)
+            self.assertGreater(Sched.metrics['worst_latency'], 0.0)
+            self.assertAlmostEqual(Sched.frame_time(), 16 * 11 / 19200 + 0.005)
+        finally:
+            Pump1.bus.close()
+            Bus.close()
+            Inverter.stop()
+
+
+
+#################################  MAIN  #####################################
+
+if __name__ == "__main__":
+    unittest.main()
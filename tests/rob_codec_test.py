@@ -0,0 +1,101 @@
+# test rob_codec
+
+################################## IMPORTS ###################################
+
+import os
+import sys
+import struct
+import unittest
+
+# appending the parent directory path
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+import libs.data_utilities as du
+import libs.rob_codec as rc
+
+
+################################### TESTS ####################################
+
+class RobCodecTest(unittest.TestCase):
+
+    def test_command_codec(self):
+        """test packing and unpacking of the 151-byte robot commands"""
+
+        TestEntry = du.QEntry(
+            id=7,
+            mt='J',
+            pt='Q',
+            Coor1=du.Coordinate(1, 2, 3, 4, 5, 6, 7, 8),
+            Coor2=du.Coordinate(9, 10, 11, 12, 13, 14, 15, 16),
+            Speed=du.SpeedVector(17, 18, 19, 20),
+            sbt=21,
+            sc='T',
+            z=22,
+            Tool=du.ToolCommand(23, True, True, False, True, 24),
+        )
+
+        # layout
+        self.assertEqual(rc.COMMAND_SIZE, du.DEF_ROB_TCP['w_bl'])
+        self.assertEqual(rc.TELEMETRY_SIZE, du.DEF_ROB_TCP['r_bl'])
+
+        # pack_command & unpack_command
+        packed = rc.pack_command(TestEntry)
+        self.assertEqual(
+            packed,
+            struct.pack(
+                '<iccffffffffffffffffiiiiiciiiiiiiiiiiiiii',
+                7, b'J', b'Q', 1, 2, 3, 4, 5, 6, 7, 8,
+                9, 10, 11, 12, 13, 14, 15, 16,
+                17, 18, 19, 20, 21, b'T', 22,
+                0, 23, 0, 1, 0, 1, 0, 1, 0, 0, 0, 1, 0, 24,
+            ),
+        )
+        values = rc.unpack_command(packed)
+        self.assertEqual(values[:3], (7, b'J', b'Q'))
+        self.assertEqual(values[3:11], (1, 2, 3, 4, 5, 6, 7, 8))
+        self.assertEqual(values[-1], 24)
+
+        # pack_command_into
+        buffer = bytearray(rc.COMMAND_SIZE + 3)
+        rc.pack_command_into(buffer, 3, TestEntry)
+        self.assertEqual(bytes(buffer[3:]), packed)
+
+        # pack_many
+        Entries = [TestEntry._replace(id=i) for i in range(5)]
+        buffer = rc.pack_many(Entries)
+        self.assertEqual(len(buffer), 5 * rc.COMMAND_SIZE)
+        self.assertEqual(
+            bytes(buffer), b''.join(rc.pack_command(e) for e in Entries)
+        )
+        view = memoryview(buffer)
+        self.assertEqual(rc.unpack_command(view, 4 * rc.COMMAND_SIZE)[0], 4)
+        self.assertIs(rc.pack_many(Entries[:2], buffer), buffer)
+        self.assertEqual(len(rc.pack_many([])), 0)
+
+
+    def test_telemetry_codec(self):
+        """test packing and unpacking of the 36-byte robot telemetry"""
+
+        TestCoor = du.Coordinate(1.5, 2.5, 3.5, 4.5, 5.5, 6.5, 0, 7.5)
+        packed = rc.pack_telemetry(9.5, 42, TestCoor)
+        self.assertEqual(
+            packed,
+            struct.pack(
+                '<fifffffff', 9.5, 42, 1.5, 2.5, 3.5, 4.5, 5.5, 6.5, 7.5
+            ),
+        )
+
+        buffer = memoryview(bytearray(4) + packed)
+        self.assertEqual(
+            rc.unpack_telemetry(buffer, 4),
+            (9.5, 42, 1.5, 2.5, 3.5, 4.5, 5.5, 6.5, 7.5),
+        )
+
+
+
+#################################  MAIN  #####################################
+
+if __name__ == "__main__":
+    unittest.main()
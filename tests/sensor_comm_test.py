@@ -0,0 +1,230 @@
+# test sensor_comm
+
+################################## IMPORTS ###################################
+
+import os
+import sys
+import time
+import socket
+import unittest
+
+# appending the parent directory path
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+import libs.func_utilities as fu
+from libs.sensor_comm import CircuitBreaker, SensorPoller
+from simCom.fake_sensor_ap import FakeSensorAP
+
+
+################################### TESTS ####################################
+
+class SensorCommTest(unittest.TestCase):
+
+    def test_sensor_decode(self):
+        """test decoding of the access point answers"""
+
+        self.assertEqual(
+            fu.sensor_decode("DL=false&T23.40/U3;T23.50/U1;"),
+            [(23.4, 3), (23.5, 1)],
+        )
+        self.assertIsNone(fu.sensor_decode("no data available"))
+        self.assertIsInstance(fu.sensor_decode("garbage"), ValueError)
+        self.assertIsInstance(
+            fu.sensor_decode("DL=false&T23.40/U3;T2x.50/U1;"), ValueError
+        )
+        self.assertIsInstance(fu.sensor_decode("DL=false&"), ValueError)
+        # newline-terminated firmware answers
+        self.assertEqual(
+            fu.sensor_decode("DL=false&T23.40/U3;T23.50/U1;\r\n"),
+            [(23.4, 3), (23.5, 1)],
+        )
+        self.assertEqual(
+            fu.sensor_decode("DL=false&T23.40/U3;&\n"), [(23.4, 3)]
+        )
+        self.assertIsInstance(
+            fu.sensor_decode("DL=false&T23.40/U3;x\n"), ValueError
+        )
+
+        # a full firmware backlog, every entry is kept
+        backlog = [(20 + i % 7 * 0.25, 1000 - i) for i in range(1000)]
+        self.assertEqual(
+            fu.sensor_decode(
+                "DL=true&" + ''.join(f"T{v:.2f}/U{a};" for v, a in backlog)
+            ),
+            backlog,
+        )
+
+        self.assertEqual(
+            fu.sensor_decode_batch(
+                "DL=false&temp:T23.40/U3;T-274.00/U1;&humid:&rpm:T0.00/U0;&"
+            ),
+            {'temp': [(23.4, 3), (-274.0, 1)], 'humid': None,
+             'rpm': [(0.0, 0)]},
+        )
+        self.assertEqual(fu.sensor_decode_batch("DL=true&"), {})
+        self.assertEqual(
+            fu.sensor_decode_batch("DL=false&temp:T23.40/U3;&\n\x00"),
+            {'temp': [(23.4, 3)]},
+        )
+        self.assertIsInstance(
+            fu.sensor_decode_batch("DL=false&temp:T23.40/U3;\n"), ValueError
+        )
+        self.assertIsInstance(fu.sensor_decode_batch("ack"), ValueError)
+        self.assertIsInstance(
+            fu.sensor_decode_batch("DL=false&temp:T2x/U1;&"), ValueError
+        )
+        self.assertIsInstance(
+            fu.sensor_decode_batch("DL=false&T2.0/U1;&"), ValueError
+        )
+        self.assertIsInstance(
+            fu.sensor_decode_batch("DL=false&temp:T2.0/U1;"), ValueError
+        )
+
+
+    def test_circuit_breaker(self):
+        """test opening, backoff and closing of CircuitBreaker"""
+
+        Breaker = CircuitBreaker(threshold=2, backoff=1.0, max_backoff=3.0)
+        Breaker.failure(now=0.0)
+        self.assertTrue(Breaker.allow(now=0.0))
+        Breaker.failure(now=0.0)
+        self.assertFalse(Breaker.allow(now=0.5))
+        self.assertTrue(Breaker.allow(now=1.0))
+
+        # failed trials double the backoff up to its max
+        Breaker.failure(now=1.0)
+        self.assertEqual(Breaker.open_until, 3.0)
+        Breaker.failure(now=3.0)
+        self.assertEqual(Breaker.open_until, 6.0)
+        Breaker.failure(now=6.0)
+        self.assertEqual(Breaker.backoff, 3.0)
+
+        Breaker.success()
+        self.assertTrue(Breaker.allow(now=6.0))
+        self.assertEqual(Breaker.backoff, 1.0)
+
+
+    def test_sensor_poller(self):
+        """test concurrent polling over kept-alive connections against two
+        fake access points, a dead and a silent one
+        """
+
+        # a port nothing listens on
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            dead = f"127.0.0.1:{sock.getsockname()[1]}"
+
+        AP1 = FakeSensorAP({'temp': [], 'humid': []}, delay=0.2).start()
+        AP2 = FakeSensorAP({'temp': []}, delay=0.2).start()
+        AP3 = FakeSensorAP({'temp': []}).start()
+        sen_dict = {
+            'amb': {'ip': AP1.address, 'err': False, 'temp': True,
+                    'humid': True},
+            'msp': {'ip': AP1.address, 'err': False, 'temp': False,
+                    'pressure': False},
+            'rb': {'ip': AP2.address, 'err': False, 'temp': True},
+            'phc': {'ip': '', 'err': False, 'aircon': True},
+        }
+        Poller = SensorPoller(timeout=0.5, threshold=2, backoff=60.0)
+        try:
+            # AP1 & AP2 are polled at the same time, one request each
+            AP1.channels['temp'].extend([(23.4, 3), (23.5, 1)])
+            AP2.channels['temp'].append((18.0, 0))
+            start = time.monotonic()
+            answers = Poller.poll(sen_dict)
+            self.assertLess(time.monotonic() - start, 0.55)
+            self.assertEqual(answers, [
+                ('amb', 'temp', [(23.4, 3), (23.5, 1)]),
+                ('amb', 'humid', None),
+                ('rb', 'temp', [(18.0, 0)]),
+            ])
+
+            # one request & connection per access point for all polls
+            AP1.delay = AP2.delay = 0.0
+            Poller.poll(sen_dict)
+            Poller.poll(sen_dict)
+            self.assertEqual(AP1.requests, 3)
+            self.assertEqual(AP1.connections, 1)
+            self.assertEqual(AP2.connections, 1)
+            self.assertEqual(Poller.metrics['polls'], 3)
+            self.assertEqual(Poller.metrics['requests'], 6)
+            self.assertEqual(Poller.metrics['failed'], 0)
+            self.assertGreaterEqual(
+                Poller.metrics['worst_cycle_time'],
+                Poller.metrics['cycle_time'],
+            )
+
+            # unknown channel fails alone, in the same request
+            sen_dict['rb']['humid'] = True
+            AP2.channels['temp'].append((18.5, 0))
+            answers = Poller.poll(sen_dict)
+            self.assertEqual(answers[-2], ('rb', 'temp', [(18.5, 0)]))
+            self.assertIsInstance(answers[-1][2], ValueError)
+            self.assertEqual(AP2.requests, 4)
+            del sen_dict['rb']['humid']
+
+            # dead AP: all its sensors fail, left out once open
+            sen_dict['asp'] = {'ip': dead, 'err': False, 'freq': True,
+                               'amps': True}
+            answers = Poller.poll(sen_dict)
+            self.assertEqual(
+                [a[:2] for a in answers[-2:]],
+                [('asp', 'freq'), ('asp', 'amps')],
+            )
+            self.assertIsInstance(answers[-1][2], ValueError)
+            Poller.poll(sen_dict)
+            self.assertTrue(Poller.breakers[dead].is_open)
+            answers = Poller.poll(sen_dict)
+            self.assertNotIn('asp', [a[0] for a in answers])
+            self.assertEqual(Poller.metrics['skipped'], 2)
+
+            # silent AP times out without holding up the others
+            sen_dict['imp'] = {'ip': AP3.address, 'err': False, 'temp': True}
+            AP3.silent = True
+            start = time.monotonic()
+            answers = Poller.poll(sen_dict)
+            self.assertLess(time.monotonic() - start, 0.9)
+            self.assertIsInstance(answers[-1][2], ValueError)
+            self.assertEqual(answers[0][:2], ('amb', 'temp'))
+        finally:
+            Poller.close()
+            AP1.stop()
+            AP2.stop()
+            AP3.stop()
+
+
+    def test_sensor_poller_legacy(self):
+        """test falling back to one request per channel for access points
+        without '/batch'
+        """
+
+        AP = FakeSensorAP({'temp': [(20.0, 1)], 'humid': []}).start()
+        AP.batch = False
+        sen_dict = {
+            'amb': {'ip': AP.address, 'err': False, 'temp': True,
+                    'humid': True},
+        }
+        Poller = SensorPoller(timeout=0.5)
+        try:
+            self.assertEqual(Poller.poll(sen_dict), [
+                ('amb', 'temp', [(20.0, 1)]),
+                ('amb', 'humid', None),
+            ])
+            self.assertEqual(AP.requests, 3)
+            self.assertFalse(Poller.batched[AP.address])
+            Poller.poll(sen_dict)
+            self.assertEqual(AP.requests, 5)
+            self.assertEqual(Poller.metrics['requests'], 5)
+            self.assertEqual(Poller.metrics['failed'], 0)
+        finally:
+            Poller.close()
+            AP.stop()
+
+
+
+#################################  MAIN  #####################################
+
+if __name__ == "__main__":
+    unittest.main()
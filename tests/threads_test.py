@@ -4,7 +4,10 @@
 
 import os
 import sys
+import time
+import socket
 import unittest
+import threading
 import pathlib as pl
 
 # appending the parent directory path
@@ -12,7 +15,10 @@ current_dir = os.path.dirname(os.path.realpath(__file__))
 parent_dir = os.path.dirname(current_dir)
 sys.path.append(parent_dir)
 
+from PyQt5.QtCore import Qt
+
 import libs.data_utilities as du
+import libs.rob_codec as rc
 import libs.threads as T
 
 
@@ -95,6 +101,134 @@ class ThreadsTest(unittest.TestCase):
         du.SCQueue.clear()
         du.SC_curr_comm_id = 1
 
+        # path warnings name the IDs of start & end entry
+        warnings = []
+        LFWorker.rangeChkWarning.connect(
+            warnings.append, Qt.ConnectionType.DirectConnection
+        )
+        LFWorker._CommList = du.Queue(
+            [du.QEntry(id=i) for i in range(5, 9)]
+        )
+        LFWorker.path_warnings([2], 1, "leaves the range", "1 of 3 paths")
+        LFWorker.path_warnings([], 1, "leaves the range")
+        LFWorker.rangeChkWarning.disconnect(warnings.append)
+        LFWorker._CommList.clear()
+        self.assertEqual(
+            warnings,
+            ["Path ID 7 to 8: leaves the range\nIn total: 1 of 3 paths"],
+        )
+
+
+    def test_loadFileWorker_stream(self):
+        global LFWorker
+        global gcode_test_path
+        global rapid_test_path
+
+        # streamed entries are the same as loaded ones, at end & at ID
+        T.lfw_p_ctrl = True
+        for path in [gcode_test_path, rapid_test_path]:
+            results = []
+            for stream in [False, True]:
+                du.SCQueue.clear()
+                du.SC_curr_comm_id = 1
+                du.DCCurrZero = du.Coordinate()
+                T.lfw_stream = stream
+                T.lfw_file_path = path
+                for line_id in [0, 2]:
+                    T.lfw_line_id = line_id
+                    LFWorker.run(testrun=True)
+                results.append([str(Entry) for Entry in du.SCQueue])
+            self.assertEqual(len(results[0]), 6)
+            self.assertEqual(results[1], results[0])
+        self.assertFalse(T.lfw_streaming)
+
+        # G92 changes DCCurrZero once the file is done, as run does
+        path = dir_path / pl.Path("0_UT_streamfile.gcode")
+        with open(path, "w") as file:
+            file.write("G1 X10\nG92 X0\nG1 X5\n")
+        du.SCQueue.clear()
+        du.DCCurrZero = du.Coordinate()
+        T.lfw_stream = True
+        T.lfw_p_ctrl = False
+        T.lfw_file_path = path
+        T.lfw_line_id = 0
+        LFWorker.run(testrun=True)
+        self.assertEqual([Entry.Coor1.x for Entry in du.SCQueue], [10.0, 15.0])
+        self.assertEqual(du.DCCurrZero.x, 10.0)
+        du.DCCurrZero = du.Coordinate()
+
+        # backpressure: the queue never grows beyond max + one batch
+        path = dir_path / pl.Path("0_UT_streamfile.gcode")
+        with open(path, "w") as file:
+            file.write("".join(f"G1 X{i}\n" for i in range(200)))
+        du.SCQueue.clear()
+        du.SC_curr_comm_id = 1
+        du.IO_stream_batch = 10
+        du.IO_stream_queue_max = 20
+        T.lfw_stream = True
+        T.lfw_p_ctrl = False
+        T.lfw_file_path = path
+        T.lfw_line_id = 0
+        added = []
+        LFWorker.streamProgress.connect(
+            lambda entries, rate: added.append(entries),
+            Qt.ConnectionType.DirectConnection,
+        )
+        Loader = threading.Thread(target=LFWorker.run, args=(True,))
+        Loader.start()
+        popped = []
+        longest = 0
+        while Loader.is_alive() or len(du.SCQueue):
+            longest = max(longest, len(du.SCQueue))
+            if len(du.SCQueue):
+                popped.append(du.SCQueue.pop_first_item().Coor1.x)
+            time.sleep(0.002)
+        Loader.join()
+        self.assertLessEqual(longest, 30)
+        self.assertEqual(popped, [float(i) for i in range(200)])
+        self.assertEqual(added, list(range(10, 210, 10)))
+
+        # the wait ends on timeout, cancel & stopped queue processing
+        failed = []
+        LFWorker.convFailed.connect(
+            failed.append, Qt.ConnectionType.DirectConnection
+        )
+        for _ in range(20):
+            du.SCQueue.add(du.QEntry())
+        du.IO_stream_timeout = 0.1
+        LFWorker.run(testrun=True)
+        self.assertIn("SCQueue full", failed[-1])
+        self.assertFalse(T.lfw_streaming)
+        self.assertFalse(T.lfw_running)
+        self.assertEqual(len(du.SCQueue), 20)
+
+        du.IO_stream_timeout = 10.0
+        for reason in ["Streaming cancelled!", "Queue processing stopped"]:
+            du.SC_q_processing = reason != "Streaming cancelled!"
+            Loader = threading.Thread(target=LFWorker.run, args=(True,))
+            Loader.start()
+            time.sleep(0.1)
+            if du.SC_q_processing:
+                du.SC_q_processing = False
+            else:
+                T.lfw_cancel = True
+            Loader.join(2.0)
+            self.assertFalse(Loader.is_alive())
+            self.assertTrue(failed[-1].startswith(reason))
+            self.assertFalse(T.lfw_streaming)
+            self.assertFalse(T.lfw_running)
+        self.assertEqual(len(failed), 3)
+
+        LFWorker.convFailed.disconnect()
+        LFWorker.streamProgress.disconnect()
+        du.IO_stream_batch = du.DEF_IO_STREAM_BATCH
+        du.IO_stream_queue_max = du.DEF_IO_STREAM_QUEUE_MAX
+        du.IO_stream_timeout = du.DEF_IO_STREAM_TIMEOUT
+        T.lfw_stream = False
+        du.SCQueue.clear()
+        du.SC_curr_comm_id = 1
+        du.DCCurrZero = du.Coordinate()
+
 
     def test_RoboCommWorker(self):
         global RCWorker
@@ -118,6 +252,107 @@ class ThreadsTest(unittest.TestCase):
         du.ROBCommQueue.clear()
         du.SCQueue.clear()
 
+        # send as one block, the rest fails with the first failed command
+        LastTcp = du.ROBTcp
+        du.ROBTcp = du.RobConnection(w_bl=rc.COMMAND_SIZE)
+        du.ROBTcp._Socket, Server = socket.socketpair()
+        du.ROBTcp.connected = True
+        du.ROB_live_ad = 0.5
+        speed = du.QEntry().Speed
+        Scaled = du.QEntry().Speed
+        Scaled.ts = int(speed.ts * 0.5)
+        Scaled.ors = int(speed.ors * 0.5)
+        failed = []
+
+        def send_elem(Comm, ok, res, dc):
+            if not ok:
+                failed.append(Comm.id)
+
+        RCWorker.sendElem.connect(
+            send_elem, Qt.ConnectionType.DirectConnection
+        )
+        du.ROB_send_list.extend([
+            (du.QEntry(id=1), False),
+            (du.QEntry(id=2), False),
+            (du.QEntry(id=3, mt="AB"), False),
+            (du.QEntry(id=4), False),
+        ])
+        RCWorker.send()
+        self.assertEqual([Comm.id for Comm in du.ROBCommQueue], [1, 2])
+        self.assertEqual(du.ROBCommQueue[0].Speed, Scaled)
+        self.assertEqual(len(du.ROB_send_list), 0)
+        self.assertEqual(failed, [3])
+        data = Server.recv(4 * rc.COMMAND_SIZE)
+        self.assertEqual(data, rc.pack_many([
+            du.QEntry(id=1, Speed=Scaled), du.QEntry(id=2, Speed=Scaled)
+        ]))
+        # a dead connection fails the whole block with one error
+        du.ROBTcp.connected = False
+        du.ROB_send_list.extend([
+            (du.QEntry(id=5), False), (du.QEntry(id=6), False)
+        ])
+        RCWorker.send()
+        self.assertEqual(failed, [3, 5])
+        self.assertEqual(len(du.ROB_send_list), 0)
+        self.assertEqual(len(du.ROBCommQueue), 2)
+        RCWorker.sendElem.disconnect(send_elem)
+        du.ROBTcp.connected = True
+        du.ROB_live_ad = 1.0
+
+        # wake, refill from SCQueue & send in one pass
+        du.ROBCommQueue.clear()
+        du.SCQueue.clear()
+        du.SC_curr_comm_id = 1
+        for _ in range(5):
+            du.SCQueue.add(du.QEntry())
+        LastTelem = du.ROBTelem
+        du.ROBTelem = du.RoboTelemetry(id=1)
+        du.ROB_comm_fr = 2
+        du.SC_q_processing = True
+        RCWorker.wake()
+        du.SC_q_processing = False
+        du.ROBTelem = LastTelem
+        du.ROB_comm_fr = du.DEF_ROB_COMM_FR
+        self.assertEqual([Comm.id for Comm in du.ROBCommQueue], [1, 2, 3])
+        self.assertEqual([Entry.id for Entry in du.SCQueue], [4, 5])
+        data = Server.recv(4 * rc.COMMAND_SIZE)
+        self.assertEqual(len(data), 3 * rc.COMMAND_SIZE)
+        du.SCQueue.clear()
+        du.SC_curr_comm_id = 1
+        du.ROBTcp.close(end=True)
+        Server.close()
+        du.ROBTcp = LastTcp
+        du.ROBCommQueue.clear()
+
+        # a failed socket disables the notifier, the fallback timer polls
+        # receive until the robot answers or re-arms on a new connection
+        LastTelem = du.ROBTelem
+        du.ROBTcp = du.RobConnection(r_bl=36, w_bl=rc.COMMAND_SIZE)
+        du.ROBTcp._Socket, Server = socket.socketpair()
+        du.ROBTcp.connected = True
+        RCWorker.arm_notifier()
+        FirstNotifier = RCWorker.SockNotifier
+        FirstNotifier.setEnabled(False)
+        Server.close()
+        du.ROBTcp._Socket.close()
+
+        du.ROBTcp._Socket, Server = socket.socketpair()
+        RCWorker.check_socket()
+        self.assertIsNot(RCWorker.SockNotifier, FirstNotifier)
+        self.assertTrue(RCWorker.SockNotifier.isEnabled())
+        RCWorker.SockNotifier.setEnabled(False)
+        Server.sendall(rc.pack_telemetry(10.0, 7, du.Coordinate()))
+        RCWorker.check_socket()
+        self.assertTrue(RCWorker.SockNotifier.isEnabled())
+        self.assertEqual(du.ROBTelem.id, 7)
+        RCWorker.SockNotifier.setEnabled(False)
+        RCWorker.SockNotifier = None
+        du.ROBTcp.close(end=True)
+        Server.close()
+        du.ROBTcp = LastTcp
+        du.ROBTelem = du.ROBLastTelem = LastTelem
+        du.ROBCommQueue.clear()
+
         # checkRobCommZeroDist
         du.ROBCommQueue.clear()
         self.assertTrue(RCWorker._check_target_reached())
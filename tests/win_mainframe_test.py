@@ -733,6 +733,17 @@ class MainframeWinTest(unittest.TestCase):
         self.assertEqual(TestFrame.IO_disp_commNum.text(), '2')
         self.assertEqual(TestFrame.IO_disp_estimLen.text(), '3.0 m')
         self.assertEqual(TestFrame.IO_disp_estimVol.text(), '0.3 L')
+        self.assertFalse(mf.workers.lfw_pre_check)
+        self.assertIsNone(mf.workers.lfw_file_path)
+
+        # the file is checked by the loadFileWorker, not while it loads
+        mf.workers.lfw_running = True
+        TestFrame.open_file(testrun=True, testpath=gcode_test_path)
+        self.assertEqual(
+            TestFrame.IO_disp_filename.text(), 'FILE LOADER BUSY!'
+        )
+        self.assertEqual(du.IO_curr_filepath, rapid_test_path)
+        mf.workers.lfw_running = False
 
         du.SC_vol_per_m = currSetting
 